@@ -0,0 +1 @@
+from . import basedatos  # noqa: F401  registra los ajustes de conexión de SQLite
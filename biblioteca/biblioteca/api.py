@@ -0,0 +1,199 @@
+"""
+Utilidades de la API JSON de solo lectura (/api/).
+
+api_vista() envuelve cada vista: verifica el método y la autenticación (sesión de
+personal o token en "Authorization: Bearer <token>", ver settings.API_TOKENS), arma la
+JsonResponse con el dict que retorna la vista, convierte ErrorAPI en una respuesta de
+error y cachea las respuestas con las etiquetas de biblioteca/cache.py (salvo las que
+tienen que reflejar el estado del momento, como el escaneo de ejemplares).
+
+Las vistas usan seleccionar_campos() para el parámetro campos (payloads chicos),
+paginar_por_cursor() para listados estables aunque se inserten filas y
+lista_parametro() para las consultas en lote.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from biblioteca import cache
+from gestion_personal.models import Personal
+
+logger = logging.getLogger('biblioteca')
+
+
+class ErrorAPI(Exception):
+    """Error que se responde al cliente como {"error": mensaje} con el status dado."""
+
+    def __init__(self, mensaje, status=400):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+        self.status = status
+
+
+def _autenticado(request):
+    """Personal activo con sesión (o staff), o un token de settings.API_TOKENS."""
+    autorizacion = request.headers.get('Authorization', '')
+    if autorizacion.startswith('Bearer '):
+        token = autorizacion[len('Bearer '):].strip()
+        return any(hmac.compare_digest(token, valido) for valido in settings.API_TOKENS)
+    if not request.user.is_authenticated:
+        return False
+    if request.user.is_staff:
+        return True
+    return Personal.objects.filter(user=request.user, activo=True).exists()
+
+
+def _cuerpo_json(request):
+    if request.method != 'POST':
+        return {}
+    try:
+        cuerpo = json.loads(request.body or b'{}')
+    except ValueError:
+        raise ErrorAPI('El cuerpo no es JSON válido.')
+    if not isinstance(cuerpo, dict):
+        raise ErrorAPI('El cuerpo debe ser un objeto JSON.')
+    return cuerpo
+
+
+def api_vista(metodos=('GET',), etiquetas=(), cachear=True):
+    """
+    Decorador de las vistas de la API.
+
+    La vista recibe request (con request.json si es POST) y los kwargs de la URL, y
+    retorna un dict serializable. La respuesta se cachea durante API_CACHE_SEGUNDOS bajo
+    la ruta, los parámetros y el cuerpo, con las etiquetas dadas.
+
+    Args:
+        metodos: Métodos HTTP aceptados (POST solo para consultas en lote)
+        etiquetas: Etiquetas fijas, o funciones (**kwargs de la URL) -> lista de etiquetas
+        cachear: False para respuestas que deben leerse siempre de la base (escaneo)
+    """
+    def decorador(vista):
+        @csrf_exempt
+        @wraps(vista)
+        def _vista(request, *args, **kwargs):
+            if request.method not in metodos:
+                return JsonResponse({'error': f'Método no permitido: {request.method}'}, status=405)
+            if not _autenticado(request):
+                return JsonResponse({'error': 'Autenticación requerida.'}, status=401)
+            try:
+                request.json = _cuerpo_json(request)
+                if cachear:
+                    nombres = []
+                    for etiqueta in etiquetas:
+                        nombres.extend(etiqueta(**kwargs) if callable(etiqueta) else [etiqueta])
+                    parametros = json.dumps(
+                        [request.path, sorted(request.GET.lists()), request.json], sort_keys=True
+                    )
+                    datos = cache.obtener_o_calcular(
+                        cache.clave('api', hashlib.sha1(parametros.encode('utf-8')).hexdigest()),
+                        lambda: vista(request, *args, **kwargs),
+                        etiquetas=nombres,
+                        timeout=settings.API_CACHE_SEGUNDOS
+                    )
+                else:
+                    datos = vista(request, *args, **kwargs)
+            except ErrorAPI as e:
+                return JsonResponse({'error': e.mensaje}, status=e.status)
+            return JsonResponse(datos, json_dumps_params={'ensure_ascii': False})
+        return _vista
+    return decorador
+
+
+def seleccionar_campos(request, disponibles):
+    """
+    Lee el parámetro campos (separados por coma) y lo valida.
+
+    Args:
+        disponibles: Campos que puede devolver la vista
+
+    Returns:
+        Lista de campos pedidos, o todos si no se indicó ninguno
+
+    Raises:
+        ErrorAPI: Si se pide un campo inexistente
+    """
+    pedidos = [c.strip() for c in request.GET.get('campos', '').split(',') if c.strip()]
+    desconocidos = [c for c in pedidos if c not in disponibles]
+    if desconocidos:
+        raise ErrorAPI(
+            f'Campos desconocidos: {", ".join(desconocidos)}. Disponibles: {", ".join(disponibles)}'
+        )
+    return pedidos or list(disponibles)
+
+
+def recortar(datos, campos):
+    """Deja en datos solo los campos pedidos, en ese orden."""
+    return {campo: datos[campo] for campo in campos}
+
+
+def lista_parametro(request, nombre):
+    """
+    Lee una lista para consultas en lote: del cuerpo JSON en POST (lista) o del
+    parámetro GET separado por comas. Se ignoran vacíos y repetidos.
+
+    Returns:
+        Lista de str, en el orden recibido
+
+    Raises:
+        ErrorAPI: Si falta o supera settings.API_MAXIMO_LOTE elementos
+    """
+    if request.method == 'POST':
+        valores = request.json.get(nombre)
+        if not isinstance(valores, list):
+            raise ErrorAPI(f'El cuerpo debe tener "{nombre}" con una lista.')
+    else:
+        valores = request.GET.get(nombre, '').split(',')
+    valores = list(dict.fromkeys(str(v).strip() for v in valores if str(v).strip()))
+    if not valores:
+        raise ErrorAPI(f'Indicá al menos un valor en "{nombre}".')
+    if len(valores) > settings.API_MAXIMO_LOTE:
+        raise ErrorAPI(f'Se admiten hasta {settings.API_MAXIMO_LOTE} valores por consulta.')
+    return valores
+
+
+def _codificar_cursor(ultimo_id):
+    return base64.urlsafe_b64encode(str(ultimo_id).encode('ascii')).decode('ascii').rstrip('=')
+
+
+def _decodificar_cursor(cursor):
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(cursor + relleno).decode('ascii'))
+    except (ValueError, UnicodeDecodeError):
+        raise ErrorAPI('Cursor inválido.')
+
+
+def paginar_por_cursor(request, queryset, limite_default=50):
+    """
+    Pagina por id con un cursor opaco (parámetros cursor y limite).
+
+    A diferencia de OFFSET, cada página es una búsqueda por índice desde el último id y
+    no se saltea ni repite filas si se insertan o borran otras mientras se recorre.
+
+    Returns:
+        Tuple (lista de objetos, cursor de la página siguiente o None)
+
+    Raises:
+        ErrorAPI: Si el cursor o el límite son inválidos
+    """
+    try:
+        limite = int(request.GET.get('limite', limite_default))
+    except ValueError:
+        raise ErrorAPI('El límite debe ser un número.')
+    if not 1 <= limite <= settings.API_MAXIMO_LOTE:
+        raise ErrorAPI(f'El límite debe estar entre 1 y {settings.API_MAXIMO_LOTE}.')
+
+    cursor = request.GET.get('cursor')
+    if cursor:
+        queryset = queryset.filter(id__gt=_decodificar_cursor(cursor))
+    objetos = list(queryset.order_by('id')[:limite + 1])
+    siguiente = _codificar_cursor(objetos[limite - 1].id) if len(objetos) > limite else None
+    return objetos[:limite], siguiente
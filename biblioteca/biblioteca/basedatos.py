@@ -0,0 +1,66 @@
+"""
+Ajustes de SQLite para despliegues con varios workers.
+
+Cada conexión nueva aplica settings.SQLITE_PRAGMAS (WAL, synchronous, busy_timeout,
+mmap y cache). transaccion_escritura() reemplaza a transaction.atomic en los servicios
+que escriben: en SQLite abre la transacción con BEGIN IMMEDIATE, de modo que el lock de
+escritura se toma (o se espera) al empezar y no al primer INSERT/UPDATE, cuando otra
+conexión ya puede tenerlo y SQLite responde "database is locked" sin esperar.
+En otros motores es simplemente transaction.atomic.
+"""
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('biblioteca')
+
+
+@receiver(connection_created, dispatch_uid='biblioteca.configurar_sqlite')
+def configurar_sqlite(sender, connection, **kwargs):
+    """Aplica SQLITE_PRAGMAS a cada conexión SQLite nueva."""
+    pragmas = settings.SQLITE_PRAGMAS
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    # Conexión sqlite3 directa: los pragmas no cuentan como consultas de la request
+    conexion = connection.connection
+    for pragma, valor in pragmas.items():
+        conexion.execute(f'PRAGMA {pragma} = {valor}')
+    if 'journal_mode' in pragmas:
+        modo = conexion.execute('PRAGMA journal_mode').fetchone()[0]
+        # Las bases en memoria (tests) no admiten WAL y quedan en modo 'memory'
+        if modo not in (str(pragmas['journal_mode']).lower(), 'memory'):
+            logger.warning(f'SQLite no aceptó journal_mode={pragmas["journal_mode"]}, quedó en {modo}')
+
+
+@contextmanager
+def transaccion_escritura(using=None):
+    """
+    transaction.atomic que en SQLite empieza con BEGIN IMMEDIATE.
+
+    Se usa igual que atomic, como decorador (@transaccion_escritura()) o como
+    context manager. Si ya hay una transacción abierta se comporta como un atomic
+    anidado (savepoint), porque el modo solo puede elegirse al abrir la externa.
+
+    Args:
+        using: Alias de la base de datos (default: 'default')
+    """
+    conexion = connections[using or DEFAULT_DB_ALIAS]
+    if conexion.vendor != 'sqlite' or conexion.in_atomic_block or not settings.SQLITE_ESCRITURA_INMEDIATA:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    # Conectar antes: al conectar Django vuelve a leer transaction_mode de OPTIONS
+    conexion.ensure_connection()
+    modo_anterior = conexion.transaction_mode
+    conexion.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using=using):
+            conexion.transaction_mode = modo_anterior
+            yield
+    finally:
+        conexion.transaction_mode = modo_anterior
@@ -0,0 +1,17 @@
+"""
+Suite de micro-benchmarks de los caminos críticos de la aplicación.
+
+Los casos se registran con el decorador benchmark() y se ejecutan con
+python manage.py benchmark, que crea una base de prueba, la puebla a cada
+escala con generar_datos y compara los resultados contra una línea base JSON.
+"""
+from .nucleo import (
+    BENCHMARKS,
+    ESCALAS,
+    benchmark,
+    comparar,
+    ejecutar_caso,
+)
+from . import servicios  # noqa: F401  registra los casos
+
+__all__ = ['BENCHMARKS', 'ESCALAS', 'benchmark', 'comparar', 'ejecutar_caso']
@@ -0,0 +1,65 @@
+"""
+Benchmark de arranque de un worker: tiempo hasta responder la primera request y
+memoria residente, medidos en un proceso Python nuevo como el de un worker de gunicorn.
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+
+# Se ejecuta en el proceso hijo: carga la aplicación WSGI y atiende GET /
+SCRIPT_WORKER = r'''
+import json, os, resource, sys, time
+inicio = time.perf_counter()
+for modulo in sys.argv[1:]:
+    __import__(modulo)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'biblioteca.settings')
+from biblioteca.wsgi import application
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': '/', 'REQUEST_METHOD': 'GET'}
+setup_testing_defaults(environ)
+estado = []
+cuerpo = application(environ, lambda status, headers, exc_info=None: estado.append(status))
+b''.join(cuerpo)
+duracion = time.perf_counter() - inicio
+print(json.dumps({
+    'segundos': duracion,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'estado': estado[0] if estado else None,
+    'modulos': len(sys.modules),
+    'pandas_cargado': 'pandas' in sys.modules,
+}))
+'''
+
+
+def medir_arranque(repeticiones=5, precargar=()):
+    """
+    Arranca repeticiones procesos nuevos y mide cada uno.
+
+    Args:
+        repeticiones: Cantidad de procesos a lanzar
+        precargar: Módulos a importar antes de Django (para comparar, ej. ['pandas'])
+
+    Returns:
+        dict con medianas de segundos y rss_mb, módulos cargados y si se cargó pandas
+    """
+    muestras = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, '-c', SCRIPT_WORKER, *precargar],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        muestras.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+
+    return {
+        'segundos': round(statistics.median(m['segundos'] for m in muestras), 3),
+        'rss_mb': round(statistics.median(m['rss_mb'] for m in muestras), 1),
+        'modulos': muestras[-1]['modulos'],
+        'pandas_cargado': muestras[-1]['pandas_cargado'],
+        'estado': muestras[-1]['estado'],
+    }
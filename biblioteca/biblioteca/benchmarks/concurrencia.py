@@ -0,0 +1,206 @@
+"""
+Benchmark de escrituras concurrentes sobre SQLite: varios procesos (como los workers
+de gunicorn) prestan y devuelven ejemplares a través de las vistas mientras otro mantiene abiertas
+transacciones largas de importación. Se cuentan las operaciones completadas y los
+errores "database is locked" con y sin los ajustes de biblioteca/basedatos.py.
+"""
+import json
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+VARIANTES = {
+    'anterior': {'SQLITE_AJUSTES': 'False', 'SQLITE_ESCRITURA_INMEDIATA': 'False'},
+    'pragmas': {'SQLITE_AJUSTES': 'True', 'SQLITE_ESCRITURA_INMEDIATA': 'False'},
+    'completo': {'SQLITE_AJUSTES': 'True', 'SQLITE_ESCRITURA_INMEDIATA': 'True'},
+}
+
+_PREAMBULO = r'''
+import json, os, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'biblioteca.settings')
+import django
+django.setup()
+from django.db import OperationalError, connection
+indice, procesos, cantidad, inicio = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4])
+connection.ensure_connection()
+'''
+
+# Cada proceso pide préstamos como socio (socios:solicitar_prestamo) y los devuelve como
+# personal (devolver_prestamo), a través de las vistas y sus transacciones, sobre sus
+# propios libros
+SCRIPT_PRESTAMOS = _PREAMBULO + r'''
+import logging
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from gestion_libros.models import Libro
+from gestion_prestamos.models import Prestamo
+from gestion_socios.models import Socio
+
+
+class Errores(logging.Handler):
+    # Las vistas atrapan la excepción y la registran: se recupera del log
+    def emit(self, record):
+        self.ultimo = record.exc_info[1] if record.exc_info else None
+
+
+errores = Errores()
+logging.getLogger('gestion_prestamos').addHandler(errores)
+
+socio = Socio.objects.select_related('user').order_by('id')[indice]
+ids = list(Libro.objects.filter(ejemplares__estado='DISPONIBLE').distinct().order_by('id').values_list('id', flat=True))
+libros = ids[indice::procesos][:cantidad]
+cliente_socio = Client(HTTP_HOST='localhost')
+cliente_socio.force_login(socio.user)
+cliente_personal = Client(HTTP_HOST='localhost')
+cliente_personal.force_login(User.objects.get(username=f'personal{indice}'))
+resultado = {'ok': 0, 'bloqueos': 0, 'errores': 0, 'latencias': []}
+time.sleep(max(0, inicio - time.time()))
+comienzo = time.perf_counter()
+for libro_id in libros:
+    t = time.perf_counter()
+    errores.ultimo = None
+    try:
+        cliente_socio.post(reverse('socios:solicitar_prestamo', args=[libro_id]))
+        prestamo = Prestamo.objects.filter(socio=socio, ejemplar__libro_id=libro_id, estado='PENDIENTE').first()
+        if prestamo is None:
+            raise RuntimeError('préstamo no registrado')
+        cliente_personal.get(reverse('gestion_prestamos:devolver_prestamo', args=[prestamo.id]))
+        if errores.ultimo is not None:
+            raise errores.ultimo
+        resultado['ok'] += 1
+        resultado['latencias'].append(time.perf_counter() - t)
+    except OperationalError as e:
+        resultado['bloqueos' if 'locked' in str(e) else 'errores'] += 1
+    except Exception:
+        resultado['errores'] += 1
+resultado['segundos'] = time.perf_counter() - comienzo
+print(json.dumps(resultado))
+'''
+
+# Antes de medir: un usuario del personal por proceso y todos los socios activos
+SCRIPT_PREPARAR = r'''
+import os, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'biblioteca.settings')
+import django
+django.setup()
+from django.contrib.auth.models import User
+from gestion_socios.models import Socio
+for indice in range(int(sys.argv[1])):
+    User.objects.create_user(f'personal{indice}', password=None, is_staff=True)
+Socio.objects.update(activo=True)
+'''
+
+# Transacciones largas como las de una importación de Excel (@transaction.atomic)
+SCRIPT_IMPORTACION = _PREAMBULO + r'''
+from django.db import transaction
+from gestion_autores.models import Autor
+
+resultado = {'ok': 0, 'bloqueos': 0, 'errores': 0}
+time.sleep(max(0, inicio - time.time()))
+for numero in range(cantidad):
+    try:
+        with transaction.atomic():
+            for fila in range(20):
+                Autor.objects.create(nombre=f'Importado {numero}-{fila}', apellido='Concurrencia')
+                time.sleep(0.01)
+        resultado['ok'] += 1
+    except OperationalError as e:
+        resultado['bloqueos' if 'locked' in str(e) else 'errores'] += 1
+    time.sleep(0.05)
+print(json.dumps(resultado))
+'''
+
+
+def preparar_base(directorio, socios=50, ejemplares=2000):
+    """
+    Crea una base SQLite poblada con generar_datos, sin los ajustes (modo rollback journal).
+
+    Returns:
+        Path del archivo creado
+    """
+    ruta = Path(directorio) / 'base.sqlite3'
+    entorno = _entorno(ruta, VARIANTES['anterior'])
+    manage = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py')]
+    subprocess.run([*manage, 'migrate', '-v0'], env=entorno, cwd=settings.BASE_DIR, check=True, capture_output=True)
+    subprocess.run(
+        [*manage, 'generar_datos', '--autores', '50', '--libros', str(ejemplares // 2), '--ejemplares', str(ejemplares),
+         '--socios', str(socios), '--prestamos', '0', '--semilla', '1'],
+        env=entorno, cwd=settings.BASE_DIR, check=True, capture_output=True,
+    )
+    subprocess.run(
+        [sys.executable, '-c', SCRIPT_PREPARAR, str(socios)],
+        env=entorno, cwd=settings.BASE_DIR, check=True, capture_output=True,
+    )
+    return ruta
+
+
+def _entorno(ruta, variables):
+    return {
+        **os.environ,
+        **variables,
+        'DATABASE_URL': f'sqlite:///{ruta}',
+        'METRICAS_ACTIVAS': 'False',
+        'MONITOR_CONSULTAS': 'False',
+    }
+
+
+def medir_variante(nombre, base, procesos=4, operaciones=50, importaciones=10):
+    """
+    Ejecuta la carga concurrente sobre una copia de base con la variante dada.
+
+    Args:
+        nombre: Clave de VARIANTES
+        base: Base preparada con preparar_base()
+        procesos: Procesos que prestan y devuelven en paralelo
+        operaciones: Préstamos + devoluciones por proceso (un libro distinto cada vez)
+        importaciones: Transacciones largas que ejecuta el proceso de importación
+
+    Returns:
+        dict con operaciones completadas, bloqueos, operaciones por segundo y p95
+    """
+    ruta = base.with_name(f'{nombre}.sqlite3')
+    shutil.copyfile(base, ruta)
+    entorno = _entorno(ruta, VARIANTES[nombre])
+    # Margen para que todos los procesos terminen de cargar Django antes de empezar
+    inicio = time.time() + 3
+
+    hijos = [
+        subprocess.Popen(
+            [sys.executable, '-c', SCRIPT_PRESTAMOS, str(i), str(procesos), str(operaciones), str(inicio)],
+            cwd=settings.BASE_DIR, env=entorno, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        for i in range(procesos)
+    ]
+    importador = subprocess.Popen(
+        [sys.executable, '-c', SCRIPT_IMPORTACION, '0', '1', str(importaciones), str(inicio)],
+        cwd=settings.BASE_DIR, env=entorno, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+
+    resultados = []
+    for hijo in [*hijos, importador]:
+        salida, _ = hijo.communicate(timeout=600)
+        if hijo.returncode != 0:
+            raise RuntimeError(f'un proceso de la variante "{nombre}" terminó con código {hijo.returncode}')
+        resultados.append(json.loads(salida.strip().splitlines()[-1]))
+    prestamos, importacion = resultados[:-1], resultados[-1]
+
+    latencias = sorted(l * 1000 for r in prestamos for l in r['latencias'])
+    ok = sum(r['ok'] for r in prestamos)
+    return {
+        'operaciones': ok,
+        'bloqueos': sum(r['bloqueos'] for r in prestamos),
+        'errores': sum(r['errores'] for r in prestamos),
+        'operaciones_por_segundo': round(ok / max(r['segundos'] for r in prestamos), 1),
+        'p50_ms': round(statistics.median(latencias), 1) if latencias else None,
+        'p95_ms': round(latencias[max(0, math.ceil(len(latencias) * 0.95) - 1)], 1) if latencias else None,
+        'importaciones_ok': importacion['ok'],
+        'importaciones_bloqueadas': importacion['bloqueos'],
+    }
@@ -0,0 +1,93 @@
+"""
+Registro, medición y comparación de benchmarks.
+"""
+import statistics
+import time
+
+from biblioteca.middleware import ContadorConsultas
+
+# Cantidades que se pasan a generar_datos para cada escala
+ESCALAS = {
+    'chica': {'autores': 50, 'libros': 500, 'ejemplares': 1500, 'socios': 100, 'prestamos': 3000},
+    'media': {'autores': 300, 'libros': 5000, 'ejemplares': 15000, 'socios': 1000, 'prestamos': 30000},
+    'grande': {'autores': 1500, 'libros': 25000, 'ejemplares': 75000, 'socios': 5000, 'prestamos': 150000},
+}
+
+# nombre: función preparar(contexto) -> callable sin argumentos a medir
+BENCHMARKS = {}
+
+# Diferencia mínima en milisegundos para considerar una regresión de tiempo,
+# así el ruido en casos de décimas de milisegundo no hace fallar la suite
+TOLERANCIA_MS = 0.5
+
+
+def benchmark(nombre):
+    """
+    Registra un caso de benchmark.
+
+    La función decorada recibe un dict de contexto (datos elegidos de la base
+    poblada) y retorna la función sin argumentos que se mide.
+    """
+    def decorador(preparar):
+        BENCHMARKS[nombre] = preparar
+        return preparar
+    return decorador
+
+
+def ejecutar_caso(preparar, contexto, repeticiones=20, calentamiento=3):
+    """
+    Mide un caso: tiempos de cada repetición y consultas SQL de una ejecución.
+
+    Returns:
+        dict con mediana_ms, p95_ms, min_ms y consultas
+    """
+    funcion = preparar(contexto)
+    for _ in range(calentamiento):
+        funcion()
+
+    contador = ContadorConsultas()
+    with contador.activar():
+        funcion()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+
+    return {
+        'mediana_ms': round(statistics.median(tiempos), 3),
+        'p95_ms': round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        'min_ms': round(tiempos[0], 3),
+        'consultas': contador.cantidad,
+    }
+
+
+def comparar(resultados, base, umbral):
+    """
+    Compara resultados contra una línea base.
+
+    Hay regresión si la mediana crece más que umbral (proporción, ej. 0.25) y más
+    que TOLERANCIA_MS, o si aumenta la cantidad de consultas.
+
+    Returns:
+        Lista de strings describiendo cada regresión
+    """
+    regresiones = []
+    for escala, casos in resultados.items():
+        for nombre, actual in casos.items():
+            previo = base.get(escala, {}).get(nombre)
+            if not previo:
+                continue
+            limite = previo['mediana_ms'] * (1 + umbral)
+            if actual['mediana_ms'] > limite and actual['mediana_ms'] - previo['mediana_ms'] > TOLERANCIA_MS:
+                regresiones.append(
+                    f'{escala}/{nombre}: {actual["mediana_ms"]:.2f} ms '
+                    f'(base {previo["mediana_ms"]:.2f} ms, +{(actual["mediana_ms"] / previo["mediana_ms"] - 1):.0%})'
+                )
+            if actual['consultas'] > previo['consultas']:
+                regresiones.append(
+                    f'{escala}/{nombre}: {actual["consultas"]} consultas (base {previo["consultas"]})'
+                )
+    return regresiones
@@ -0,0 +1,100 @@
+"""
+Benchmarks de la capa de servicios y helpers que corren en cada request.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from biblioteca import cache
+
+from .nucleo import benchmark
+
+
+def _palabra_frecuente():
+    """Primera palabra del título más repetida, para búsquedas con resultados."""
+    from django.db.models import Count
+    from gestion_libros.models import Libro
+
+    fila = Libro.objects.values('genero').annotate(c=Count('id')).order_by('-c').first()
+    titulo = Libro.objects.filter(genero=fila['genero']).values_list('titulo', flat=True).first()
+    return titulo.split()[0]
+
+
+@benchmark('libros.buscar_libros_optimizado')
+def buscar_libros(contexto):
+    from gestion_libros.services import LibroService
+
+    palabra = _palabra_frecuente()
+
+    def ejecutar():
+        return list(LibroService.buscar_libros_optimizado(titulo=palabra).order_by('titulo'))
+    return ejecutar
+
+
+@benchmark('prestamos.validar_limite_prestamos')
+def validar_limite(contexto):
+    from gestion_prestamos.models import Prestamo
+    from gestion_prestamos.services import PrestamoService
+
+    socio = Prestamo.objects.filter(estado='PENDIENTE').select_related('socio').first().socio
+
+    def ejecutar():
+        return PrestamoService.validar_limite_prestamos(socio)
+    return ejecutar
+
+
+@benchmark('prestamos.crear_prestamo_seguro')
+def crear_prestamo(contexto):
+    from gestion_libros.models import Ejemplar
+    from gestion_prestamos.services import PrestamoService
+    from gestion_socios.models import Socio
+
+    # Socio propio: los generados pueden tener el cupo de préstamos completo
+    socio, _ = Socio.objects.get_or_create(
+        identificacion='BENCH-0001',
+        defaults={'nombre': 'Benchmark', 'apellido': 'Servicios', 'email': 'benchmark@example.com'}
+    )
+    ejemplar = Ejemplar.objects.filter(estado='DISPONIBLE').first()
+    fecha = timezone.now().date() + timedelta(days=14)
+
+    def ejecutar():
+        # Cada repetición se revierte para medir siempre el mismo estado
+        with transaction.atomic():
+            PrestamoService.crear_prestamo_seguro(socio, ejemplar, fecha)
+            transaction.set_rollback(True)
+        ejemplar.estado = 'DISPONIBLE'
+    return ejecutar
+
+
+@benchmark('utils.listar_con_busqueda_paginacion')
+def listar_paginado(contexto):
+    from biblioteca.utils import listar_con_busqueda_paginacion
+    from gestion_prestamos.models import Prestamo
+
+    palabra = _palabra_frecuente()
+    request = contexto['factory'].get('/prestamos/', {'q': palabra, 'page': 2})
+    campos = ['socio__nombre', 'socio__apellido', 'ejemplar__libro__titulo', 'ejemplar__codigo', 'estado']
+
+    def ejecutar():
+        prestamos = Prestamo.objects.select_related(
+            'socio', 'ejemplar', 'ejemplar__libro'
+        ).order_by('-fecha_prestamo')
+        page_obj, _ = listar_con_busqueda_paginacion(request, prestamos, campos, items_por_pagina=10)
+        return list(page_obj)
+    return ejecutar
+
+
+@benchmark('context_processors.user_type')
+def user_type(contexto):
+    from biblioteca.context_processors import user_type as procesador
+    from gestion_socios.models import Socio
+
+    request = contexto['factory'].get('/')
+    request.user = Socio.objects.filter(activo=True, user__isnull=False).select_related('user').first().user
+
+    def ejecutar():
+        # Sin cache: mide el camino que recorre la primera request de cada usuario
+        cache.invalidar(f'usuario:{request.user.id}')
+        return procesador(request)
+    return ejecutar
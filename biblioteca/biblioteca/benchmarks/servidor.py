@@ -0,0 +1,134 @@
+"""
+Benchmark de throughput del servidor: levanta gunicorn con cada perfil, le envía
+requests HTTP concurrentes contra la base configurada y mide requests por segundo
+y latencias.
+"""
+import importlib.util
+import math
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+# 'anterior' reproduce el Procfile original: un worker sync y una conexión nueva por request
+PERFILES = {
+    'anterior': {
+        'argumentos': ['biblioteca.wsgi:application'],
+        'entorno': {'DB_CONN_MAX_AGE': '0'},
+    },
+    'produccion': {
+        'argumentos': ['-c', 'gunicorn.conf.py'],
+        'entorno': {},
+    },
+    # Mismo servidor ASGI con las vistas sync, para comparar contra las async del socio
+    'asgi_sync': {
+        'argumentos': ['-c', 'gunicorn.conf.py'],
+        'entorno': {'SERVIDOR_ASGI': 'True', 'VISTAS_ASYNC': 'False'},
+        'requiere': 'uvicorn_worker',
+    },
+    'asgi': {
+        'argumentos': ['-c', 'gunicorn.conf.py'],
+        'entorno': {'SERVIDOR_ASGI': 'True', 'VISTAS_ASYNC': 'True'},
+        'requiere': 'uvicorn_worker',
+    },
+}
+
+
+def perfil_disponible(nombre):
+    """Indica si están instalados los paquetes que necesita el perfil."""
+    requiere = PERFILES[nombre].get('requiere')
+    return requiere is None or importlib.util.find_spec(requiere) is not None
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _esperar_servidor(proceso, url, espera_maxima=30):
+    """Espera a que el servidor responda; falla si el proceso termina antes."""
+    limite = time.monotonic() + espera_maxima
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f'gunicorn terminó con código {proceso.returncode}')
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn no respondió en {espera_maxima} segundos')
+
+
+def _pedir(base, peticion):
+    """Ejecuta una request (path, cookie) y retorna (segundos, status)."""
+    path, cookie = peticion
+    solicitud = urllib.request.Request(base + path)
+    if cookie:
+        solicitud.add_header('Cookie', cookie)
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(solicitud, timeout=30) as respuesta:
+            respuesta.read()
+            status = respuesta.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    return time.perf_counter() - inicio, status
+
+
+def medir_perfil(nombre, peticiones, concurrencia=8, calentamiento=20):
+    """
+    Levanta gunicorn con el perfil dado y mide el throughput.
+
+    Args:
+        nombre: Clave de PERFILES
+        peticiones: Lista de (path, cookie) a ejecutar en ese orden
+        concurrencia: Clientes simultáneos
+        calentamiento: Requests previas (no medidas) para que arranquen todos los workers
+
+    Returns:
+        dict con requests_por_segundo, p50_ms, p95_ms, errores y configuración usada
+    """
+    perfil = PERFILES[nombre]
+    puerto = _puerto_libre()
+    base = f'http://127.0.0.1:{puerto}'
+    # Todos los perfiles con el DEBUG de este proceso (gunicorn.conf.py lo desactiva
+    # por defecto), para que la comparación sea solo de servidor
+    entorno = {'DEBUG': str(settings.DEBUG), **os.environ, **perfil['entorno']}
+
+    proceso = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *perfil['argumentos'], '--bind', f'127.0.0.1:{puerto}'],
+        cwd=settings.BASE_DIR,
+        env=entorno,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _esperar_servidor(proceso, base + '/')
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            list(pool.map(lambda p: _pedir(base, p), peticiones[:calentamiento]))
+            inicio = time.perf_counter()
+            muestras = list(pool.map(lambda p: _pedir(base, p), peticiones))
+            total = time.perf_counter() - inicio
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=30)
+
+    tiempos = sorted(m[0] * 1000 for m in muestras)
+    return {
+        'requests_por_segundo': round(len(muestras) / total, 1),
+        'p50_ms': round(statistics.median(tiempos), 1),
+        'p95_ms': round(tiempos[max(0, math.ceil(len(tiempos) * 0.95) - 1)], 1),
+        'errores': sum(1 for m in muestras if m[1] is None or m[1] >= 500),
+        'argumentos': ' '.join(perfil['argumentos']),
+        'entorno': perfil['entorno'],
+    }
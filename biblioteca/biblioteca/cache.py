@@ -0,0 +1,187 @@
+"""
+Acceso a la cache compartida (settings.CACHES) con el espacio de nombres de bibliotech.
+
+Todas las claves se guardan bajo "bibliotech:" y pueden llevar etiquetas. Cada etiqueta
+tiene un token propio en la cache que forma parte de la clave final, así que
+invalidar('catalogo') cambia ese token y todo lo guardado con la etiqueta deja de
+leerse de una vez, en todos los workers, sin tener que conocer ni borrar cada clave
+(lo viejo expira solo por su timeout).
+
+Si el backend falla (Redis o Memcached caídos) se registra un warning y se sigue como
+si no hubiera nada cacheado: la cache nunca debe tumbar una request.
+"""
+import hashlib
+import logging
+import re
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+logger = logging.getLogger('biblioteca')
+
+ESPACIO = 'bibliotech'
+
+# Memcached no admite espacios ni caracteres de control y limita la clave a 250 bytes
+_CLAVE_SEGURA = re.compile(r'^[\w.:\-]{1,150}$', re.ASCII)
+
+
+def clave(*partes):
+    """
+    Arma una clave del espacio de nombres a partir de sus partes.
+
+    Las partes con espacios, acentos u otros caracteres se reemplazan por un hash.
+
+    Returns:
+        str del tipo 'bibliotech:parte1:parte2'
+    """
+    textos = []
+    for parte in partes:
+        texto = str(parte)
+        if not _CLAVE_SEGURA.match(texto):
+            texto = hashlib.sha1(texto.encode('utf-8')).hexdigest()
+        textos.append(texto)
+    return ':'.join([ESPACIO, *textos])
+
+
+def _clave_etiqueta(etiqueta):
+    return clave('etiqueta', etiqueta)
+
+
+def versiones(etiquetas):
+    """
+    Obtiene el token actual de cada etiqueta (una sola lectura a la cache).
+
+    Los tokens son el momento de la última invalidación en nanosegundos, así que
+    también sirven como fecha de última modificación.
+
+    Returns:
+        dict {etiqueta: token}
+    """
+    claves = {etiqueta: _clave_etiqueta(etiqueta) for etiqueta in sorted(set(etiquetas))}
+    try:
+        tokens = cache.get_many(claves.values())
+        resultado = {}
+        for etiqueta, clave_etiqueta in claves.items():
+            token = tokens.get(clave_etiqueta)
+            if token is None:
+                # Etiqueta nueva o desalojada: si otro worker la crea primero se usa la suya
+                token = time.time_ns()
+                if not cache.add(clave_etiqueta, token, None):
+                    token = cache.get(clave_etiqueta, token)
+            resultado[etiqueta] = token
+        return resultado
+    except Exception as e:
+        # Tokens nuevos: nada de lo cacheado coincide y los ETag no se repiten
+        logger.warning(f'Cache no disponible al leer etiquetas {", ".join(claves)}: {str(e)}')
+        return {etiqueta: time.time_ns() for etiqueta in claves}
+
+
+def _clave_con_etiquetas(clave_base, etiquetas):
+    """Agrega a clave_base los tokens actuales de sus etiquetas."""
+    if not etiquetas:
+        return clave_base
+    partes = [f'{etiqueta}={token}' for etiqueta, token in versiones(etiquetas).items()]
+    huella = hashlib.sha1(','.join(partes).encode('utf-8')).hexdigest()[:16]
+    return f'{clave_base}:{huella}'
+
+
+def obtener(clave_base, etiquetas=(), default=None):
+    """
+    Lee un valor cacheado.
+
+    Args:
+        clave_base: Clave armada con clave()
+        etiquetas: Etiquetas con las que se guardó
+        default: Valor si no está cacheado, se invalidó o la cache falla
+
+    Returns:
+        El valor guardado o default
+    """
+    try:
+        return cache.get(_clave_con_etiquetas(clave_base, etiquetas), default)
+    except Exception as e:
+        logger.warning(f'Cache no disponible al leer {clave_base}: {str(e)}')
+        return default
+
+
+def guardar(clave_base, valor, etiquetas=(), timeout=DEFAULT_TIMEOUT):
+    """
+    Guarda un valor en la cache.
+
+    Args:
+        clave_base: Clave armada con clave()
+        valor: Valor serializable con pickle
+        etiquetas: Etiquetas que lo invalidan
+        timeout: Segundos de vida (default: TIMEOUT de settings.CACHES)
+    """
+    try:
+        cache.set(_clave_con_etiquetas(clave_base, etiquetas), valor, timeout)
+    except Exception as e:
+        logger.warning(f'Cache no disponible al guardar {clave_base}: {str(e)}')
+
+
+def obtener_o_calcular(clave_base, calcular, etiquetas=(), timeout=DEFAULT_TIMEOUT):
+    """
+    Lee un valor cacheado o lo calcula con calcular() y lo guarda.
+
+    Args:
+        clave_base: Clave armada con clave()
+        calcular: Función sin argumentos que produce el valor (no debe retornar None)
+        etiquetas: Etiquetas que lo invalidan
+        timeout: Segundos de vida (default: TIMEOUT de settings.CACHES)
+
+    Returns:
+        El valor cacheado o el recién calculado
+    """
+    valor = obtener(clave_base, etiquetas)
+    if valor is None:
+        valor = calcular()
+        guardar(clave_base, valor, etiquetas, timeout)
+    return valor
+
+
+def obtener_varios(claves):
+    """
+    Lee varias claves sin etiquetas en una sola operación.
+
+    Returns:
+        dict {clave: valor} solo con las claves encontradas
+    """
+    try:
+        return cache.get_many(claves)
+    except Exception as e:
+        logger.warning(f'Cache no disponible al leer {len(claves)} claves: {str(e)}')
+        return {}
+
+
+def guardar_varios(valores, timeout=DEFAULT_TIMEOUT):
+    """
+    Guarda varias claves sin etiquetas en una sola operación.
+
+    Args:
+        valores: dict {clave: valor}
+        timeout: Segundos de vida (default: TIMEOUT de settings.CACHES)
+    """
+    try:
+        cache.set_many(valores, timeout)
+    except Exception as e:
+        logger.warning(f'Cache no disponible al guardar {len(valores)} claves: {str(e)}')
+
+
+def invalidar(*etiquetas):
+    """
+    Invalida todo lo guardado con alguna de las etiquetas al confirmarse la transacción.
+
+    Se cambia recién en el commit para que ninguna request vuelva a cachear datos de
+    antes del cambio con el token nuevo. Fuera de una transacción es inmediato.
+    """
+    def cambiar_tokens():
+        token = time.time_ns()
+        try:
+            cache.set_many({_clave_etiqueta(etiqueta): token for etiqueta in etiquetas}, None)
+        except Exception as e:
+            logger.warning(f'Cache no disponible al invalidar {", ".join(etiquetas)}: {str(e)}')
+
+    transaction.on_commit(cambiar_tokens)
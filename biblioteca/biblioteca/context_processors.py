@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.core.cache import cache
+from biblioteca import cache
 from gestion_personal.models import Personal
 from gestion_socios.models import Socio
 
@@ -18,23 +18,25 @@ def user_type(request):
     if not request.user.is_authenticated:
         return context
     
-    cache_key = f'user_type_{request.user.id}'
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-    
+    return cache.obtener_o_calcular(
+        cache.clave('user_type', request.user.id),
+        lambda: _calcular_user_type(request.user, context),
+        etiquetas=[f'usuario:{request.user.id}'],
+        timeout=300
+    )
+
+
+def _calcular_user_type(user, context):
     # Usar filter().first() para evitar DoesNotExist
-    personal = Personal.objects.filter(user=request.user).first()
+    personal = Personal.objects.filter(user=user).first()
     if personal and personal.activo:
         context['es_personal'] = True
-    elif request.user.is_staff:
+    elif user.is_staff:
         context['es_personal'] = True
     else:
-        socio = Socio.objects.filter(user=request.user).first()
+        socio = Socio.objects.filter(user=user).first()
         if socio and socio.activo:
             context['es_socio'] = True
-    
-    cache.set(cache_key, context, 300)
     return context
 
 def site_name(request):
@@ -1,7 +1,13 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
 from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.urls import reverse
+from django.views.decorators.http import condition
+from biblioteca import cache
 from gestion_personal.models import Personal
 from gestion_socios.models import Socio
 
@@ -56,40 +62,127 @@ def es_personal_required(view_func):
     return _wrapped_view
 
 
+def _verificar_socio(request):
+    """
+    Verifica que el usuario sea un socio activo.
+    
+    Returns:
+        None si puede continuar, o la redirección con el mensaje de error
+    """
+    if not request.user.is_authenticated:
+        messages.error(request, 'Debes iniciar sesión como socio para acceder a esta sección.')
+        login_url = reverse('login_socio')
+        next_url = request.get_full_path()
+        return redirect(f'{login_url}?next={next_url}')
+    
+    # Usar filter().first() en lugar de get() para evitar DoesNotExist
+    socio = Socio.objects.filter(user=request.user).first()
+    
+    if socio:
+        if not socio.activo:
+            messages.error(request, 'Tu cuenta está inactiva. Contacta al administrador.')
+            return redirect('home')
+        return None
+    
+    # Verificar si es Personal
+    personal = Personal.objects.filter(user=request.user).first()
+    if personal:
+        messages.error(request, 'No tenés permisos para acceder a esta sección.')
+        return redirect('home')
+    
+    # Si no es ni Socio ni Personal
+    messages.error(request, 'No tenés permisos para acceder a esta sección.')
+    login_url = reverse('login_socio')
+    next_url = request.get_full_path()
+    return redirect(f'{login_url}?next={next_url}')
+
+
 def es_socio_required(view_func):
     """
     Decorador para verificar que el usuario es un socio.
     
     Si el usuario no tiene un registro Socio asociado, se verifica si es Personal.
     No se crea automáticamente un Socio para evitar problemas de integridad.
+    Acepta vistas async: la verificación consulta la base, así que corre en un hilo.
     """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_async_view(request, *args, **kwargs):
+            respuesta = await sync_to_async(_verificar_socio)(request)
+            if respuesta is not None:
+                return respuesta
+            return await view_func(request, *args, **kwargs)
+        
+        return _wrapped_async_view
+    
     @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            messages.error(request, 'Debes iniciar sesión como socio para acceder a esta sección.')
-            login_url = reverse('login_socio')
-            next_url = request.get_full_path()
-            return redirect(f'{login_url}?next={next_url}')
-        
-        # Usar filter().first() en lugar de get() para evitar DoesNotExist
-        socio = Socio.objects.filter(user=request.user).first()
-        
-        if socio:
-            if not socio.activo:
-                messages.error(request, 'Tu cuenta está inactiva. Contacta al administrador.')
-                return redirect('home')
-            return view_func(request, *args, **kwargs)
+        respuesta = _verificar_socio(request)
+        if respuesta is not None:
+            return respuesta
+        return view_func(request, *args, **kwargs)
+    
+    return _wrapped_view
+
+
+def condicional(*etiquetas):
+    """
+    Decorador de GET condicional (ETag y Last-Modified) para listados de lectura.
+    
+    Ambos se derivan de los tokens de las etiquetas de cache (biblioteca/cache.py), que
+    cambian en cada invalidación: si ninguna cambió, la página responde 304 sin ejecutar
+    la vista. El ETag incluye usuario y URL completa; el Last-Modified considera el
+    último login para no reutilizar la página de otra sesión en el mismo navegador.
+    Siempre se agrega la etiqueta 'usuario:<id>' (tipo de usuario en el menú). Si hay
+    mensajes pendientes la página se genera normalmente. En vistas async las versiones
+    se calculan en un hilo antes de comparar los headers (leen sesión, base y cache).
+    
+    Va debajo de es_personal_required / es_socio_required.
+    
+    Args:
+        *etiquetas: Etiquetas fijas, o funciones request -> lista de etiquetas
+    """
+    def _versiones(request):
+        if hasattr(request, '_versiones_condicional'):
+            return request._versiones_condicional
+        versiones = None
+        if request.user.is_authenticated and not len(messages.get_messages(request)):
+            nombres = [f'usuario:{request.user.id}']
+            for etiqueta in etiquetas:
+                nombres.extend(etiqueta(request) if callable(etiqueta) else [etiqueta])
+            try:
+                versiones = cache.versiones(nombres)
+            except Exception as e:
+                logging.getLogger('biblioteca').warning(f'Cache no disponible para GET condicional: {str(e)}')
+        request._versiones_condicional = versiones
+        return versiones
+    
+    def etag(request, *args, **kwargs):
+        versiones = _versiones(request)
+        if versiones is None:
+            return None
+        texto = f'{request.user.id}|{request.get_full_path()}|{sorted(versiones.items())}'
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+    
+    def ultima_modificacion(request, *args, **kwargs):
+        versiones = _versiones(request)
+        if versiones is None:
+            return None
+        fecha = datetime.fromtimestamp(max(versiones.values()) / 1e9, tz=timezone.utc)
+        if request.user.last_login:
+            fecha = max(fecha, request.user.last_login)
+        return fecha
+    
+    def decorador(vista):
+        condicionada = condition(etag_func=etag, last_modified_func=ultima_modificacion)(vista)
+        if not iscoroutinefunction(vista):
+            return condicionada
         
-        # Verificar si es Personal
-        personal = Personal.objects.filter(user=request.user).first()
-        if personal:
-            messages.error(request, 'No tenés permisos para acceder a esta sección.')
-            return redirect('home')
+        @wraps(vista)
+        async def _vista_async(request, *args, **kwargs):
+            await sync_to_async(_versiones)(request)
+            return await condicionada(request, *args, **kwargs)
         
-        # Si no es ni Socio ni Personal
-        messages.error(request, 'No tenés permisos para acceder a esta sección.')
-        login_url = reverse('login_socio')
-        next_url = request.get_full_path()
-        return redirect(f'{login_url}?next={next_url}')
+        return _vista_async
     
-    return _wrapped_view
+    return decorador
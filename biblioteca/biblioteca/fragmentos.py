@@ -0,0 +1,96 @@
+"""
+Cache de fragmentos de templates: filas de los listados.
+
+{% filas_cacheadas page_obj 'gestion_libros/fila_libro.html' 'libro' %} renderiza la
+plantilla de fila para cada objeto y reutiliza el HTML cacheado de las filas que no
+cambiaron. La clave de cada fila es la plantilla (con un hash de su código, para que un
+cambio en el template no sirva HTML viejo) y la versión del objeto: un hash de los
+valores ya cargados, id incluido, con sus anotaciones y las relaciones traídas con
+select_related. Todas las filas de la página se leen y se guardan en una sola
+operación contra la cache; solo se renderizan las que cambiaron.
+
+Las plantillas de fila reciben únicamente el objeto, así que no pueden depender del
+usuario ni de la request. Se registra como librería 'fragmentos' en settings.TEMPLATES.
+"""
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.db.models import Model
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from biblioteca import cache
+
+register = template.Library()
+
+_huellas_plantillas = {}
+
+
+def _valores(objeto):
+    """Valores cargados de objeto (modelo, dict o valor simple) en un formato estable."""
+    if isinstance(objeto, Model):
+        campos = sorted(
+            (nombre, valor) for nombre, valor in vars(objeto).items() if not nombre.startswith('_')
+        )
+        relacionados = sorted(
+            (nombre, _valores(relacionado))
+            for nombre, relacionado in objeto._state.fields_cache.items()
+        )
+        return (type(objeto).__name__, campos, relacionados)
+    if isinstance(objeto, dict):
+        return sorted((clave, _valores(valor)) for clave, valor in objeto.items())
+    return objeto
+
+
+def version_fila(objeto):
+    """
+    Versión del contenido de una fila: cambia si cambia cualquier valor cargado.
+
+    Returns:
+        str con el hash
+    """
+    return hashlib.sha1(repr(_valores(objeto)).encode('utf-8')).hexdigest()
+
+
+def _huella_plantilla(nombre):
+    if nombre not in _huellas_plantillas:
+        fuente = get_template(nombre).template.source
+        _huellas_plantillas[nombre] = hashlib.sha1(fuente.encode('utf-8')).hexdigest()[:12]
+    return _huellas_plantillas[nombre]
+
+
+@register.simple_tag
+def filas_cacheadas(objetos, plantilla, variable):
+    """
+    Renderiza plantilla una vez por objeto, reutilizando las filas cacheadas.
+
+    Args:
+        objetos: Iterable de objetos (page_obj, lista, etc.)
+        plantilla: Template de la fila
+        variable: Nombre con el que la fila recibe el objeto
+
+    Returns:
+        HTML de todas las filas
+    """
+    objetos = list(objetos)
+    huella = _huella_plantilla(plantilla)
+    claves = [
+        cache.clave('fila', plantilla, huella, version_fila(objeto))
+        for objeto in objetos
+    ]
+    cacheadas = cache.obtener_varios(claves)
+
+    fila_template = get_template(plantilla)
+    nuevas = {}
+    filas = []
+    for clave, objeto in zip(claves, objetos):
+        html = cacheadas.get(clave)
+        if html is None:
+            html = fila_template.render({variable: objeto})
+            nuevas[clave] = html
+        filas.append(html)
+
+    if nuevas:
+        cache.guardar_varios(nuevas, settings.FRAGMENTOS_CACHE_SEGUNDOS)
+    return mark_safe(''.join(filas))
@@ -0,0 +1,220 @@
+"""
+Métricas de la aplicación en formato de exposición de texto de Prometheus.
+
+Cada proceso acumula las observaciones en memoria y las vuelca periódicamente
+a un archivo SQLite compartido (METRICAS_ARCHIVO), de modo que el endpoint
+/metrics muestra los valores sumados de todos los workers de gunicorn.
+"""
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger('biblioteca')
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200)
+BUCKETS_IMPORTACION = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# nombre: (tipo, descripción, buckets)
+DEFINICIONES = {
+    'bibliotech_request_duracion_segundos': (
+        'histogram', 'Latencia de las requests por vista', BUCKETS_SEGUNDOS
+    ),
+    'bibliotech_request_consultas_sql': (
+        'histogram', 'Consultas SQL ejecutadas por request', BUCKETS_CONSULTAS
+    ),
+    'bibliotech_importacion_duracion_segundos': (
+        'histogram', 'Duración de las importaciones desde Excel', BUCKETS_IMPORTACION
+    ),
+    'bibliotech_importacion_filas_total': (
+        'counter', 'Filas procesadas por los importadores', None
+    ),
+    'bibliotech_importacion_filas_por_segundo': (
+        'gauge', 'Filas por segundo de la última importación', None
+    ),
+    'bibliotech_prestamos_creados_total': ('counter', 'Préstamos registrados', None),
+    'bibliotech_prestamos_devueltos_total': ('counter', 'Préstamos devueltos', None),
+    'bibliotech_reservas_creadas_total': ('counter', 'Reservas creadas', None),
+    'bibliotech_reservas_confirmadas_total': (
+        'counter', 'Reservas confirmadas con un ejemplar apartado', None
+    ),
+}
+
+_lock = threading.Lock()
+_incrementos = defaultdict(float)
+_valores = {}
+_ultimo_volcado = time.monotonic()
+
+
+def _etiquetas(etiquetas):
+    def escapar(valor):
+        return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{clave}="{escapar(valor)}"' for clave, valor in sorted(etiquetas.items()))
+
+
+def _formatear_numero(valor):
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+def incrementar(nombre, valor=1, **etiquetas):
+    """Suma valor al contador nombre con las etiquetas dadas."""
+    if not settings.METRICAS_ACTIVAS:
+        return
+    with _lock:
+        _incrementos[(nombre, nombre, _etiquetas(etiquetas))] += valor
+
+
+def incrementar_al_confirmar(nombre, valor=1, **etiquetas):
+    """Incrementa el contador recién cuando se confirma la transacción en curso."""
+    transaction.on_commit(lambda: incrementar(nombre, valor, **etiquetas))
+
+
+def fijar(nombre, valor, **etiquetas):
+    """Fija el valor de un gauge (gana la última escritura de cualquier worker)."""
+    if not settings.METRICAS_ACTIVAS:
+        return
+    with _lock:
+        _valores[(nombre, nombre, _etiquetas(etiquetas))] = valor
+
+
+def observar(nombre, valor, **etiquetas):
+    """Registra una observación en el histograma nombre."""
+    if not settings.METRICAS_ACTIVAS:
+        return
+    buckets = DEFINICIONES[nombre][2]
+    with _lock:
+        for limite in buckets:
+            # Se suma 0 a los buckets que no corresponden para que la serie exista
+            clave = _etiquetas({**etiquetas, 'le': _formatear_numero(limite)})
+            _incrementos[(nombre, f'{nombre}_bucket', clave)] += 1 if valor <= limite else 0
+        _incrementos[(nombre, f'{nombre}_bucket', _etiquetas({**etiquetas, 'le': '+Inf'}))] += 1
+        _incrementos[(nombre, f'{nombre}_sum', _etiquetas(etiquetas))] += valor
+        _incrementos[(nombre, f'{nombre}_count', _etiquetas(etiquetas))] += 1
+
+
+def _conectar():
+    conexion = sqlite3.connect(settings.METRICAS_ARCHIVO, timeout=5)
+    conexion.execute('PRAGMA journal_mode=WAL')
+    conexion.execute(
+        'CREATE TABLE IF NOT EXISTS metricas ('
+        ' metrica TEXT NOT NULL, serie TEXT NOT NULL, etiquetas TEXT NOT NULL,'
+        ' valor REAL NOT NULL, PRIMARY KEY (serie, etiquetas))'
+    )
+    return conexion
+
+
+def volcar():
+    """Escribe en el archivo compartido lo acumulado por este proceso."""
+    global _ultimo_volcado
+
+    with _lock:
+        incrementos = dict(_incrementos)
+        valores = dict(_valores)
+        _incrementos.clear()
+        _valores.clear()
+        _ultimo_volcado = time.monotonic()
+
+    if not incrementos and not valores:
+        return
+
+    try:
+        conexion = _conectar()
+        try:
+            with conexion:
+                conexion.executemany(
+                    'INSERT INTO metricas (metrica, serie, etiquetas, valor) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (serie, etiquetas) DO UPDATE SET valor = valor + excluded.valor',
+                    [(*clave, valor) for clave, valor in incrementos.items()]
+                )
+                conexion.executemany(
+                    'INSERT INTO metricas (metrica, serie, etiquetas, valor) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (serie, etiquetas) DO UPDATE SET valor = excluded.valor',
+                    [(*clave, valor) for clave, valor in valores.items()]
+                )
+        finally:
+            conexion.close()
+    except sqlite3.Error as e:
+        # Las métricas nunca deben romper una request: se descarta el lote
+        logger.warning(f'No se pudieron guardar las métricas: {str(e)}')
+
+
+def volcado_pendiente():
+    """Indica si pasó METRICAS_INTERVALO_SEGUNDOS desde el último volcado."""
+    return time.monotonic() - _ultimo_volcado >= settings.METRICAS_INTERVALO_SEGUNDOS
+
+
+def volcar_si_corresponde():
+    """Vuelca las métricas si pasó METRICAS_INTERVALO_SEGUNDOS desde el último volcado."""
+    if volcado_pendiente():
+        volcar()
+
+
+def exponer():
+    """
+    Genera el texto de exposición con los valores de todos los workers.
+
+    Returns:
+        String en formato de texto de Prometheus
+    """
+    volcar()
+    try:
+        conexion = _conectar()
+        try:
+            filas = conexion.execute('SELECT metrica, serie, etiquetas, valor FROM metricas').fetchall()
+        finally:
+            conexion.close()
+    except sqlite3.Error as e:
+        logger.warning(f'No se pudieron leer las métricas: {str(e)}')
+        filas = []
+
+    def orden(fila):
+        metrica, serie, etiquetas, _ = fila
+        # Los buckets se ordenan por su límite numérico, no alfabéticamente
+        partes = dict(p.split('=', 1) for p in etiquetas.split(',') if '=' in p)
+        limite = partes.pop('le', None)
+        limite = float('inf') if limite is None else float(limite.strip('"'))
+        return metrica, serie, sorted(partes.items()), limite
+
+    lineas = []
+    actual = None
+    for metrica, serie, etiquetas, valor in sorted(filas, key=orden):
+        if metrica != actual:
+            tipo, descripcion, _ = DEFINICIONES.get(metrica, ('untyped', metrica, None))
+            lineas.append(f'# HELP {metrica} {descripcion}')
+            lineas.append(f'# TYPE {metrica} {tipo}')
+            actual = metrica
+        etiquetas = f'{{{etiquetas}}}' if etiquetas else ''
+        lineas.append(f'{serie}{etiquetas} {_formatear_numero(valor)}')
+    return '\n'.join(lineas) + '\n'
+
+
+def medir_importacion(tipo, importar):
+    """
+    Ejecuta una importación registrando su duración y las filas procesadas.
+
+    Args:
+        tipo: 'autores', 'libros' o 'socios'
+        importar: Función sin argumentos que ejecuta la importación y retorna sus resultados
+
+    Returns:
+        Los resultados de importar()
+    """
+    inicio = time.perf_counter()
+    resultados = importar()
+    duracion = time.perf_counter() - inicio
+    filas = resultados.get('total_filas', 0)
+
+    observar('bibliotech_importacion_duracion_segundos', duracion, tipo=tipo)
+    incrementar('bibliotech_importacion_filas_total', filas, tipo=tipo)
+    if duracion > 0:
+        fijar('bibliotech_importacion_filas_por_segundo', round(filas / duracion, 2), tipo=tipo)
+    return resultados
+
+
+atexit.register(volcar)
@@ -0,0 +1,251 @@
+"""
+Middlewares del proyecto.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, asynccontextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metricas
+
+logger = logging.getLogger('biblioteca.consultas')
+
+_LITERALES = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)'), '(...)'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def huella_sql(sql):
+    """
+    Normaliza una consulta reemplazando literales y parámetros por '?', para
+    agrupar las que solo difieren en sus valores (típico de un N+1).
+    """
+    for patron, reemplazo in _LITERALES:
+        sql = patron.sub(reemplazo, sql)
+    return sql.strip()
+
+
+class ContadorConsultas:
+    """
+    Wrapper para connection.execute_wrapper que cuenta consultas y tiempo de base de datos.
+
+    Uso:
+        contador = ContadorConsultas()
+        with contador.activar():
+            ...
+    """
+
+    def __init__(self):
+        self.cantidad = 0
+        self.duracion = 0.0
+        self.huellas = Counter()
+        self.tiempos = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            huella = huella_sql(sql)
+            self.cantidad += 1
+            self.duracion += duracion
+            self.huellas[huella] += 1
+            self.tiempos[huella] += duracion
+
+    def activar(self):
+        """Instala el wrapper en todas las conexiones configuradas."""
+        pila = ExitStack()
+        for conexion in connections.all():
+            pila.enter_context(conexion.execute_wrapper(self))
+        return pila
+
+    @asynccontextmanager
+    async def aactivar(self):
+        """
+        activar() para requests async: las consultas del ORM se ejecutan en el hilo
+        de sync_to_async de la request, y el wrapper se instala en las conexiones de ese hilo.
+        """
+        pila = await sync_to_async(self.activar)()
+        try:
+            yield
+        finally:
+            await sync_to_async(pila.close)()
+
+    @property
+    def duracion_ms(self):
+        return self.duracion * 1000
+
+    def mas_repetidas(self, cantidad=5):
+        """Retorna las huellas más ejecutadas como (huella, veces, milisegundos)."""
+        return [
+            (huella, veces, self.tiempos[huella] * 1000)
+            for huella, veces in self.huellas.most_common(cantidad)
+        ]
+
+
+class ConsultasSQLMiddleware:
+    """
+    Cuenta las consultas SQL y el tiempo de base de datos de cada request.
+
+    Agrega el header Server-Timing y registra en el log las requests que superan
+    MONITOR_CONSULTAS_MAXIMO consultas o MONITOR_CONSULTAS_MAXIMO_MS milisegundos,
+    junto con las consultas más repetidas. Se activa con MONITOR_CONSULTAS.
+    Sync y async, para no forzar un hilo por request bajo ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'MONITOR_CONSULTAS', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.maximo_consultas = settings.MONITOR_CONSULTAS_MAXIMO
+        self.maximo_ms = settings.MONITOR_CONSULTAS_MAXIMO_MS
+        self.modo_async = iscoroutinefunction(get_response)
+        if self.modo_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.modo_async:
+            return self.__acall__(request)
+        contador = ContadorConsultas()
+        inicio = time.perf_counter()
+        with contador.activar():
+            response = self.get_response(request)
+        return self._registrar(request, response, contador, inicio)
+
+    async def __acall__(self, request):
+        contador = ContadorConsultas()
+        inicio = time.perf_counter()
+        async with contador.aactivar():
+            response = await self.get_response(request)
+        return self._registrar(request, response, contador, inicio)
+
+    def _registrar(self, request, response, contador, inicio):
+        """Agrega Server-Timing y registra la request si es lenta."""
+        total_ms = (time.perf_counter() - inicio) * 1000
+
+        request.consultas_sql = contador
+        response['Server-Timing'] = (
+            f'db;dur={contador.duracion_ms:.1f};desc="{contador.cantidad} consultas", '
+            f'total;dur={total_ms:.1f}'
+        )
+
+        if contador.cantidad > self.maximo_consultas or total_ms > self.maximo_ms:
+            detalle = '\n'.join(
+                f'  {veces}x {ms:.1f}ms {huella}'
+                for huella, veces, ms in contador.mas_repetidas()
+            )
+            logger.warning(
+                f'Request lenta: {request.method} {request.path} -> {response.status_code}, '
+                f'{contador.cantidad} consultas, db {contador.duracion_ms:.1f}ms, '
+                f'total {total_ms:.1f}ms\n{detalle}'
+            )
+
+        return response
+
+
+class MetricasMiddleware:
+    """
+    Registra la latencia y la cantidad de consultas SQL de cada request,
+    agrupadas por nombre de vista, en las métricas expuestas en /metrics.
+
+    Debe ubicarse antes de ConsultasSQLMiddleware para reutilizar su contador;
+    si el monitoreo de consultas está desactivado, usa uno propio. Sync y async.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICAS_ACTIVAS', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.contar_consultas = not getattr(settings, 'MONITOR_CONSULTAS', False)
+        self.modo_async = iscoroutinefunction(get_response)
+        if self.modo_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.modo_async:
+            return self.__acall__(request)
+        inicio = time.perf_counter()
+        if self.contar_consultas:
+            contador = ContadorConsultas()
+            with contador.activar():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+            contador = getattr(request, 'consultas_sql', None)
+        self._registrar(request, response, contador, inicio)
+        metricas.volcar_si_corresponde()
+        return response
+
+    async def __acall__(self, request):
+        inicio = time.perf_counter()
+        if self.contar_consultas:
+            contador = ContadorConsultas()
+            async with contador.aactivar():
+                response = await self.get_response(request)
+        else:
+            response = await self.get_response(request)
+            contador = getattr(request, 'consultas_sql', None)
+        self._registrar(request, response, contador, inicio)
+        # Solo el volcado periódico escribe en el archivo de métricas
+        if metricas.volcado_pendiente():
+            await sync_to_async(metricas.volcar)()
+        return response
+
+    def _registrar(self, request, response, contador, inicio):
+        """Observa latencia y consultas de la request en las métricas."""
+        duracion = time.perf_counter() - inicio
+
+        coincidencia = getattr(request, 'resolver_match', None)
+        vista = coincidencia.view_name if coincidencia else 'sin_ruta'
+        metricas.observar(
+            'bibliotech_request_duracion_segundos', duracion,
+            vista=vista, metodo=request.method, estado=response.status_code
+        )
+        if contador is not None:
+            metricas.observar('bibliotech_request_consultas_sql', contador.cantidad, vista=vista)
+
+
+class ArchivosEstaticosMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware que además acepta requests async. WhiteNoise solo es sync:
+    bajo ASGI obligaba a Django a ejecutar todo el resto de la cadena en un hilo,
+    incluidas las vistas async.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        self.modo_async = iscoroutinefunction(get_response)
+        if self.modo_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.modo_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
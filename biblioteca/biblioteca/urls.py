@@ -16,12 +16,16 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     path('ayuda/personal/', views.ayuda_personal, name='ayuda_personal'),
     path('ayuda/socio/', views.ayuda_socio, name='ayuda_socio'),
+    path('metrics', views.metrics, name='metrics'),
     path("libros/", include("gestion_libros.urls")),
     path("prestamos/", include("gestion_prestamos.urls")),
     path("autores/", include("gestion_autores.urls")),
     path("socios/", include("gestion_socios.urls")),
     path("socio/", include("gestion_libros.urls_socios")),
     path("personal/", include("gestion_personal.urls")),
+    path("exportaciones/", include("gestion_exportaciones.urls")),
+    path("api/", include("gestion_libros.urls_api")),
+    path("api/", include("gestion_prestamos.urls_api")),
 ]
 
 if settings.DEBUG:
@@ -2,8 +2,10 @@
 Utilidades compartidas para el sistema de biblioteca.
 """
 import csv
+import re
 from django.core.mail import send_mail
 from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.models import Q
 from django.http import HttpResponse
 
@@ -26,6 +28,26 @@ def send_notification_email(destinatario, asunto, mensaje):
     )
 
 
+def encolar_notificacion(destinatario, asunto, mensaje):
+    """
+    Registra un email de notificación en la bandeja de salida.
+    
+    El envío lo realiza el comando enviar_notificaciones, por lo que la request
+    no espera al servidor SMTP. Llamar dentro de la transacción del cambio de
+    estado que origina la notificación.
+    
+    Args:
+        destinatario: Email del destinatario (string)
+        asunto: Asunto del email (string)
+        mensaje: Cuerpo del mensaje (string)
+    
+    Returns:
+        Notificacion creada
+    """
+    from gestion_notificaciones.services import NotificacionService
+    return NotificacionService.encolar(destinatario, asunto, mensaje)
+
+
 def exportar_csv_response(filename, headers, data_rows):
     """
     Helper para exportar datos a CSV.
@@ -49,7 +71,71 @@ def exportar_csv_response(filename, headers, data_rows):
     return response
 
 
-def listar_con_busqueda_paginacion(request, queryset, campos_busqueda, items_por_pagina=10):
+# Formas de búsqueda que se resuelven con un índice (ver clasificar_busqueda)
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+# Solo con el largo de un DNI (7 u 8 dígitos), para que un año o un número suelto
+# ("1984", "2") se siga buscando como texto en títulos y nombres
+_NUMERO = re.compile(r'^\d{1,2}\.?\d{3}\.?\d{3}$')
+# Letras y dígitos en un único término (GEN-00000096, G000004321)
+_CODIGO = re.compile(r'^(?=.*\d)(?=.*[A-Za-z])[A-Za-z0-9]+(?:[-/.][A-Za-z0-9]+)*$')
+
+# Orden en que se prueban las formas: la primera que admite el listado gana
+TIPOS_BUSQUEDA = ('estado', 'email', 'isbn', 'numero', 'codigo')
+
+
+def clasificar_busqueda(q, tipos=TIPOS_BUSQUEDA, estados=()):
+    """
+    Reconoce la forma de una búsqueda para resolverla con un índice en lugar de icontains.
+    
+    Args:
+        q: Texto buscado (sin espacios al inicio ni al final)
+        tipos: Formas que admite el listado, de TIPOS_BUSQUEDA
+        estados: choices del campo estado del listado, para el tipo 'estado'
+    
+    Returns:
+        Tuple (tipo, valor) con el valor normalizado:
+        ('estado', 'VENCIDO') si coincide con el valor o la etiqueta de un estado,
+        ('email', q), ('isbn', ISBN-13 canónico), ('numero', DNI de 7 u 8 dígitos sin puntos),
+        ('codigo', q) para un único término con letras y dígitos (ej. GEN-00000096),
+        o ('texto', q) si no tiene ninguna de esas formas
+    """
+    from gestion_libros import isbn
+    
+    canonico = isbn.normalizar(q) if 'isbn' in tipos else None
+    for tipo in TIPOS_BUSQUEDA:
+        if tipo not in tipos:
+            continue
+        if tipo == 'estado':
+            for valor, etiqueta in estados:
+                if q.upper() == valor or q.lower() == str(etiqueta).lower():
+                    return 'estado', valor
+        elif tipo == 'email' and _EMAIL.match(q):
+            return 'email', q
+        elif tipo == 'isbn' and canonico:
+            return 'isbn', canonico
+        elif tipo == 'numero' and _NUMERO.match(q):
+            return 'numero', q.replace('.', '')
+        elif tipo == 'codigo' and _CODIGO.match(q):
+            return 'codigo', q
+    return 'texto', q
+
+
+def filtro_prefijo(campo, valor, using=DEFAULT_DB_ALIAS):
+    """
+    Filtro "empieza con" que puede usar el índice del campo.
+    
+    En PostgreSQL, startswith usa el índice *_like que Django crea para los CharField
+    indexados. SQLite no usa índices con LIKE (no distingue mayúsculas), así que se
+    agrega el rango equivalente, que sí recorre el índice.
+    """
+    filtro = Q(**{f'{campo}__startswith': valor})
+    if connections[using].vendor == 'sqlite':
+        filtro &= Q(**{f'{campo}__gte': valor, f'{campo}__lt': valor + '\U0010ffff'})
+    return filtro
+
+
+def listar_con_busqueda_paginacion(request, queryset, campos_busqueda, items_por_pagina=10,
+                                   busquedas_indexadas=None):
     """
     Helper para listar con búsqueda y paginación.
     
@@ -58,18 +144,45 @@ def listar_con_busqueda_paginacion(request, queryset, campos_busqueda, items_por
         queryset: QuerySet inicial
         campos_busqueda: Lista de campos para buscar (ej: ['nombre', 'apellido'])
         items_por_pagina: Número de items por página (default: 10)
+        busquedas_indexadas: dict {tipo: lookup o lista de lookups} (opcional), con tipos
+            de clasificar_busqueda. Si la búsqueda tiene esa forma se filtra con el lookup
+            (igualdad, o prefijo si termina en __startswith) usando el índice del campo,
+            ej: {'numero': 'identificacion__startswith', 'email': 'email'}. Con una lista
+            se prueban en orden hasta que uno encuentre resultados. Si ninguno encuentra
+            nada, o la búsqueda es texto libre, se usa icontains sobre campos_busqueda
     
     Returns:
         Tuple (page_obj, query_string)
     """
     q = request.GET.get('q', '').strip()
+    paginator = None
     if q:
-        filtros = Q()
-        for campo in campos_busqueda:
-            filtros |= Q(**{f'{campo}__icontains': q})
-        queryset = queryset.filter(filtros)
+        busquedas_indexadas = busquedas_indexadas or {}
+        estados = ()
+        if 'estado' in busquedas_indexadas:
+            estados = queryset.model._meta.get_field(busquedas_indexadas['estado']).choices
+        tipo, valor = clasificar_busqueda(q, tipos=busquedas_indexadas, estados=estados)
+        
+        lookups = busquedas_indexadas.get(tipo, [])
+        for lookup in [lookups] if isinstance(lookups, str) else lookups:
+            if lookup.endswith('__startswith'):
+                filtro = filtro_prefijo(lookup[:-len('__startswith')], valor, using=queryset.db)
+            else:
+                filtro = Q(**{lookup: valor})
+            paginator = Paginator(queryset.filter(filtro), items_por_pagina)
+            if paginator.count:
+                break
+            # Sin resultados se busca como texto (ej. un número que es parte de un título)
+            paginator = None
+        
+        if paginator is None:
+            filtros = Q()
+            for campo in campos_busqueda:
+                filtros |= Q(**{f'{campo}__icontains': q})
+            queryset = queryset.filter(filtros)
     
-    paginator = Paginator(queryset, items_por_pagina)
+    if paginator is None:
+        paginator = Paginator(queryset, items_por_pagina)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
     
@@ -90,3 +203,9 @@ def obtener_socio_desde_user(user):
     """
     from gestion_socios.models import Socio
     return Socio.objects.filter(user=user).first()
+
+
+async def aobtener_socio_desde_user(user):
+    """Versión async de obtener_socio_desde_user para las vistas async."""
+    from gestion_socios.models import Socio
+    return await Socio.objects.filter(user=user).afirst()
@@ -1,10 +1,13 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from gestion_socios.forms_auth import LoginSocioForm, RegistroSocioForm
 from gestion_socios.models import Socio
 from gestion_personal.forms import LoginPersonalForm
 from gestion_personal.models import Personal
+from . import metricas
 
 def home(request):
     """Página principal con opciones de login"""
@@ -131,3 +134,9 @@ def landing(request):
 def presentacion(request):
     """Presentación pitch deck de BiblioTech"""
     return render(request, "presentacion_bibliotech.html")
+
+def metrics(request):
+    """Métricas en formato de texto de Prometheus, solo para las IPs permitidas"""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICAS_IPS_PERMITIDAS:
+        return HttpResponseForbidden('Acceso no permitido')
+    return HttpResponse(metricas.exponer(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,2 +1,13 @@
-# Módulo de importadores para gestión de autores
+"""
+Módulo de importadores para gestión de autores.
 
+autores_importer usa pandas, que tarda en cargarse y ocupa decenas de MB en cada
+worker. Las vistas y comandos importan desde este paquete, que carga el importador
+recién cuando se ejecuta una importación.
+"""
+
+
+def importar_autores_desde_excel(*args, **kwargs):
+    """Ver autores_importer.importar_autores_desde_excel."""
+    from .autores_importer import importar_autores_desde_excel as importar
+    return importar(*args, **kwargs)
@@ -5,6 +5,7 @@ Permite importar grandes volúmenes de autores de forma optimizada.
 import pandas as pd
 from datetime import datetime
 from django.db import transaction
+from biblioteca import cache, metricas
 from django.core.exceptions import ValidationError
 from gestion_autores.models import Autor
 
@@ -169,9 +170,9 @@ class AutoresImporter:
                     continue
                 
                 # Buscar autor existente por nombre y apellido
-                autor_existente = Autor.objects.filter(
-                    nombre__iexact=datos_limpios['nombre'],
-                    apellido__iexact=datos_limpios['apellido']
+                autor_existente = Autor.buscar_por_nombre(
+                    datos_limpios['nombre'],
+                    datos_limpios['apellido']
                 ).first()
                 
                 if autor_existente:
@@ -201,6 +202,8 @@ class AutoresImporter:
                 campos_update = ['nombre', 'apellido', 'nacionalidad', 'fecha_nacimiento', 'biografia']
                 Autor.objects.bulk_update(autores_a_actualizar, campos_update)
             
+            # bulk_create y bulk_update no emiten señales
+            cache.invalidar('autores', 'catalogo', 'libros')
             return self.resultados
             
         except Exception as e:
@@ -220,5 +223,8 @@ def importar_autores_desde_excel(archivo_excel, actualizar_existentes=False):
         dict con resultados de la importación
     """
     importer = AutoresImporter(archivo_excel)
-    return importer.importar(actualizar_existentes=actualizar_existentes)
+    return metricas.medir_importacion(
+        'autores',
+        lambda: importer.importar(actualizar_existentes=actualizar_existentes)
+    )
 
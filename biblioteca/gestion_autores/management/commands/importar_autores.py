@@ -3,7 +3,7 @@ Comando de Django para importar autores desde un archivo Excel.
 Uso: python manage.py importar_autores archivo.xlsx [--actualizar]
 """
 from django.core.management.base import BaseCommand, CommandError
-from gestion_autores.importadores.autores_importer import importar_autores_desde_excel
+from gestion_autores.importadores import importar_autores_desde_excel
 import os
 
 
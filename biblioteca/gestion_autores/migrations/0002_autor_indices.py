@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:36
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Índices trigram para las búsquedas icontains sobre autor__nombre/autor__apellido.
+# Solo existen en PostgreSQL: Django compara UPPER(columna::text) LIKE UPPER('%...%'),
+# así que el índice se arma sobre la misma expresión.
+INDICES_TRIGRAM = {
+    'autor_nombre_trgm': 'nombre',
+    'autor_apellido_trgm': 'apellido',
+}
+
+
+def crear_indices_trigram(apps, schema_editor):
+    """
+    Crea la extensión pg_trgm y los índices GIN sobre UPPER(nombre) y UPPER(apellido).
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for nombre, columna in INDICES_TRIGRAM.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {nombre} ON gestion_autores_autor '
+            f'USING gin (UPPER({columna}::text) gin_trgm_ops)'
+        )
+
+
+def eliminar_indices_trigram(apps, schema_editor):
+    """
+    Función de reversión: elimina los índices trigram (la extensión queda instalada).
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nombre in INDICES_TRIGRAM:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {nombre}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_autores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='autor',
+            index=models.Index(django.db.models.functions.text.Lower('apellido'), django.db.models.functions.text.Lower('nombre'), name='autor_apellido_nombre_lower'),
+        ),
+        migrations.AddIndex(
+            model_name='autor',
+            index=models.Index(fields=['apellido', 'nombre'], name='autor_apellido_nombre_idx'),
+        ),
+        migrations.RunPython(crear_indices_trigram, eliminar_indices_trigram),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Autor(models.Model):
@@ -12,7 +13,33 @@ class Autor(models.Model):
     def __str__(self):
         return f"{self.nombre} {self.apellido}"
 
+    @classmethod
+    def buscar_por_nombre(cls, nombre, apellido):
+        """
+        Autores con ese nombre y apellido, sin distinguir mayúsculas.
+        
+        Compara LOWER(columna) = LOWER(valor) para usar el índice funcional
+        autor_apellido_nombre_lower (__iexact no puede usarlo: en SQLite es un LIKE
+        y en PostgreSQL compara con UPPER).
+        
+        Returns:
+            QuerySet de Autor
+        """
+        return cls.objects.alias(
+            apellido_lower=Lower('apellido'),
+            nombre_lower=Lower('nombre'),
+        ).filter(
+            apellido_lower=Lower(models.Value(apellido)),
+            nombre_lower=Lower(models.Value(nombre)),
+        )
+
     class Meta:
         verbose_name = "Autor"
         verbose_name_plural = "Autores"
-        ordering = ['apellido', 'nombre']
\ No newline at end of file
+        ordering = ['apellido', 'nombre']
+        indexes = [
+            # Búsqueda exacta sin distinguir mayúsculas (importadores)
+            models.Index(Lower('apellido'), Lower('nombre'), name='autor_apellido_nombre_lower'),
+            # Orden de listados y selects de autores
+            models.Index(fields=['apellido', 'nombre'], name='autor_apellido_nombre_idx'),
+        ]
@@ -0,0 +1,15 @@
+"""
+Invalidación de las cache de autores y del catálogo (que muestra y busca por el
+nombre del autor) cuando cambia o se borra un autor.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from biblioteca import cache
+
+from .models import Autor
+
+
+@receiver([post_save, post_delete], sender=Autor, dispatch_uid='gestion_autores.invalidar_autores')
+def invalidar_autores(sender, **kwargs):
+    cache.invalidar('autores', 'catalogo', 'libros')
@@ -1,3 +1,43 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import Q
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Autor
+
+
+class AutorIndicesTest(TestCase):
+    """Verifica con EXPLAIN que las búsquedas de autores usan sus índices."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Autor.objects.bulk_create(
+            Autor(nombre=f'Nombre{i}', apellido=f'Apellido{i % 50}') for i in range(500)
+        )
+        Autor.objects.create(nombre='Jorge Luis', apellido='Borges')
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Con tablas chicas PostgreSQL prefiere recorrerlas enteras
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsaIndice(self, queryset, indice):
+        plan = queryset.explain()
+        self.assertIn(indice, plan, f'El plan no usa {indice}:\n{plan}')
+
+    def test_buscar_por_nombre_sin_distinguir_mayusculas(self):
+        self.assertEqual(Autor.buscar_por_nombre('JORGE LUIS', 'borges').count(), 1)
+
+    def test_buscar_por_nombre_usa_indice_funcional(self):
+        self.assertUsaIndice(Autor.buscar_por_nombre('jorge luis', 'BORGES'), 'autor_apellido_nombre_lower')
+
+    def test_listado_ordenado_usa_indice_compuesto(self):
+        self.assertUsaIndice(Autor.objects.order_by('apellido', 'nombre'), 'autor_apellido_nombre_idx')
+
+    @skipUnless(connection.vendor == 'postgresql', 'Los índices trigram solo existen en PostgreSQL')
+    def test_busqueda_icontains_usa_indices_trigram(self):
+        queryset = Autor.objects.filter(Q(nombre__icontains='org') | Q(apellido__icontains='org'))
+        self.assertUsaIndice(queryset, 'autor_nombre_trgm')
+        self.assertUsaIndice(queryset, 'autor_apellido_trgm')
@@ -1,10 +1,10 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from biblioteca.decorators import es_personal_required
+from biblioteca.decorators import condicional, es_personal_required
 from biblioteca.utils import listar_con_busqueda_paginacion
 from .models import Autor
 from .forms import AutorForm, UploadExcelForm
-from .importadores.autores_importer import importar_autores_desde_excel
+from .importadores import importar_autores_desde_excel
 
 @es_personal_required
 def index_autores(request):
@@ -27,6 +27,7 @@ def crear_autor(request):
     return render(request, "gestion_autores/crear_autor.html", {'form': form})
 
 @es_personal_required
+@condicional('autores')
 def listar_autores(request):
     autores = Autor.objects.all().order_by('apellido', 'nombre')
     
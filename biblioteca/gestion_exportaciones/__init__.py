@@ -0,0 +1 @@
+# App para exportaciones en segundo plano y su historial
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import HistorialExportacion
+
+
+@admin.register(HistorialExportacion)
+class HistorialExportacionAdmin(admin.ModelAdmin):
+    list_display = ['tipo', 'formato', 'estado', 'fecha', 'usuario', 'total_filas', 'tamano_bytes', 'desde_cache']
+    list_filter = ['tipo', 'formato', 'estado', 'fecha']
+    search_fields = ['tipo', 'huella', 'error']
+    readonly_fields = ['fecha', 'fecha_finalizacion', 'huella']
+    date_hierarchy = 'fecha'
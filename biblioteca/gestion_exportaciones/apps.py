@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class GestionExportacionesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'gestion_exportaciones'
+    verbose_name = 'Gestión de Exportaciones'
@@ -0,0 +1,168 @@
+"""
+Módulo de generación de archivos de exportación.
+Define los conjuntos de datos exportables y los escritores por formato.
+Los datos se recorren con iterator() para no cargar la tabla completa en memoria.
+"""
+import csv
+import gzip
+
+TAMANO_LOTE = 2000
+
+
+def _formatear_fecha(valor):
+    return valor.strftime('%d/%m/%Y') if valor else ''
+
+
+def _filas_prestamos():
+    from gestion_prestamos.models import Prestamo
+
+    prestamos = Prestamo.objects.order_by('-fecha_prestamo').values_list(
+        'socio__nombre', 'socio__apellido', 'ejemplar__libro__titulo', 'ejemplar__codigo',
+        'fecha_prestamo', 'fecha_devolucion_esperada', 'fecha_devolucion_real', 'estado'
+    )
+    for nombre, apellido, titulo, codigo, fecha, esperada, real, estado in prestamos.iterator(chunk_size=TAMANO_LOTE):
+        yield [
+            f"{nombre} {apellido}",
+            titulo,
+            codigo,
+            _formatear_fecha(fecha),
+            _formatear_fecha(esperada),
+            _formatear_fecha(real),
+            estado,
+        ]
+
+
+def _filas_libros():
+    from django.db.models import Count
+    from gestion_libros.models import Libro
+
+    libros = Libro.objects.annotate(
+        cantidad_ejemplares=Count('ejemplares')
+    ).order_by('titulo').values_list(
+        'titulo', 'autor__nombre', 'autor__apellido', 'genero', 'isbn',
+        'fecha_registro', 'cantidad_ejemplares'
+    )
+    for titulo, nombre, apellido, genero, isbn, fecha_registro, cantidad in libros.iterator(chunk_size=TAMANO_LOTE):
+        yield [
+            titulo,
+            f"{nombre} {apellido}",
+            genero or '',
+            isbn or '',
+            _formatear_fecha(fecha_registro),
+            cantidad,
+        ]
+
+
+def _filas_socios():
+    from gestion_socios.models import Socio
+
+    socios = Socio.objects.order_by('apellido', 'nombre').values_list(
+        'nombre', 'apellido', 'identificacion', 'email', 'activo', 'fecha_registro'
+    )
+    for nombre, apellido, identificacion, email, activo, fecha_registro in socios.iterator(chunk_size=TAMANO_LOTE):
+        yield [
+            nombre,
+            apellido,
+            identificacion,
+            email or '',
+            'Sí' if activo else 'No',
+            _formatear_fecha(fecha_registro),
+        ]
+
+
+# Mismos encabezados que las exportaciones CSV síncronas de cada módulo
+CONJUNTOS = {
+    'prestamos': {
+        'encabezados': [
+            'socio', 'libro', 'ejemplar_codigo', 'fecha_prestamo',
+            'fecha_devolucion_esperada', 'fecha_devolucion_real', 'estado'
+        ],
+        'filas': _filas_prestamos,
+    },
+    'libros': {
+        'encabezados': ['título', 'autor', 'género', 'isbn', 'fecha_registro', 'cantidad_ejemplares'],
+        'filas': _filas_libros,
+    },
+    'socios': {
+        'encabezados': ['nombre', 'apellido', 'identificacion', 'email', 'activo', 'fecha_registro'],
+        'filas': _filas_socios,
+    },
+}
+
+EXTENSIONES = {
+    'csv_gz': 'csv.gz',
+    'xlsx': 'xlsx',
+    'parquet': 'parquet',
+}
+
+
+def escribir_csv_gz(ruta, encabezados, filas):
+    """Escribe un CSV comprimido con gzip. Retorna la cantidad de filas."""
+    total = 0
+    with gzip.open(ruta, 'wt', encoding='utf-8', newline='') as archivo:
+        writer = csv.writer(archivo)
+        writer.writerow(encabezados)
+        for fila in filas:
+            writer.writerow(fila)
+            total += 1
+    return total
+
+
+def escribir_xlsx(ruta, encabezados, filas):
+    """
+    Escribe un Excel en modo write-only de openpyxl.
+    Las filas se vuelcan al disco a medida que se agregan. Retorna la cantidad de filas.
+    """
+    from openpyxl import Workbook
+
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet(title='Datos')
+    hoja.append(encabezados)
+    total = 0
+    for fila in filas:
+        hoja.append(fila)
+        total += 1
+    libro.save(ruta)
+    return total
+
+
+def escribir_parquet(ruta, encabezados, filas):
+    """
+    Escribe un archivo Parquet por lotes (requiere pyarrow).
+    Todas las columnas se guardan como texto. Retorna la cantidad de filas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError('El formato Parquet requiere tener instalado pyarrow')
+
+    esquema = pa.schema([(nombre, pa.string()) for nombre in encabezados])
+    total = 0
+    lote = []
+    with pq.ParquetWriter(ruta, esquema, compression='snappy') as writer:
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= TAMANO_LOTE:
+                writer.write_table(_tabla_parquet(pa, esquema, encabezados, lote))
+                total += len(lote)
+                lote = []
+        if lote or total == 0:
+            writer.write_table(_tabla_parquet(pa, esquema, encabezados, lote))
+            total += len(lote)
+    return total
+
+
+def _tabla_parquet(pa, esquema, encabezados, lote):
+    columnas = [
+        [None if valor is None else str(valor) for valor in columna]
+        for columna in (zip(*lote) if lote else [[] for _ in encabezados])
+    ]
+    return pa.Table.from_arrays([pa.array(c, type=pa.string()) for c in columnas], schema=esquema)
+
+
+ESCRITORES = {
+    'csv_gz': escribir_csv_gz,
+    'xlsx': escribir_xlsx,
+    'parquet': escribir_parquet,
+}
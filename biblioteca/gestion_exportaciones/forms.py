@@ -0,0 +1,21 @@
+from django import forms
+from .models import HistorialExportacion
+
+
+class SolicitarExportacionForm(forms.Form):
+    """Formulario para solicitar una exportación en segundo plano."""
+    tipo = forms.ChoiceField(
+        choices=HistorialExportacion.TIPO_CHOICES,
+        label='Datos a exportar',
+        widget=forms.Select(attrs={
+            'class': 'select select-bordered w-full rounded-xl'
+        })
+    )
+    formato = forms.ChoiceField(
+        choices=HistorialExportacion.FORMATO_CHOICES,
+        initial='xlsx',
+        label='Formato',
+        widget=forms.Select(attrs={
+            'class': 'select select-bordered w-full rounded-xl'
+        })
+    )
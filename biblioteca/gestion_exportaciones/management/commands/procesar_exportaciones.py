@@ -0,0 +1,26 @@
+"""
+Comando de Django para generar exportaciones pendientes.
+Uso: python manage.py procesar_exportaciones [--limite N]
+
+Normalmente las exportaciones se generan en un hilo al solicitarlas; este comando
+recupera las que quedaron pendientes si el worker se reinició antes de terminar, y las
+que quedaron en PROCESANDO más de EXPORTACIONES_PROCESANDO_MAXIMO_SEGUNDOS.
+"""
+from django.core.management.base import BaseCommand
+from gestion_exportaciones.services import ExportacionService
+
+
+class Command(BaseCommand):
+    help = 'Genera las exportaciones pendientes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=None,
+            help='Cantidad máxima de exportaciones a procesar',
+        )
+
+    def handle(self, *args, **options):
+        generadas = ExportacionService.procesar_pendientes(limite=options.get('limite'))
+        self.stdout.write(self.style.SUCCESS(f'Exportaciones generadas: {generadas}'))
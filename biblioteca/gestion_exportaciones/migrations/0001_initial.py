@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistorialExportacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('prestamos', 'Préstamos'), ('libros', 'Libros'), ('socios', 'Socios')], db_index=True, max_length=20)),
+                ('formato', models.CharField(choices=[('csv_gz', 'CSV comprimido (.csv.gz)'), ('xlsx', 'Excel (.xlsx)'), ('parquet', 'Parquet (.parquet)')], default='xlsx', max_length=10)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('PROCESANDO', 'Procesando'), ('COMPLETADA', 'Completada'), ('ERROR', 'Error')], db_index=True, default='PENDIENTE', max_length=12)),
+                ('archivo', models.FileField(blank=True, help_text='Archivo generado por la exportación', upload_to='exportaciones/%Y/%m/%d/')),
+                ('huella', models.CharField(blank=True, db_index=True, help_text='Huella de los datos exportados, usada para reutilizar archivos', max_length=64)),
+                ('fecha', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('fecha_finalizacion', models.DateTimeField(blank=True, null=True)),
+                ('total_filas', models.IntegerField(default=0, help_text='Cantidad de filas exportadas')),
+                ('tamano_bytes', models.BigIntegerField(default=0, help_text='Tamaño del archivo generado')),
+                ('desde_cache', models.BooleanField(default=False, help_text='Indica si se reutilizó un archivo generado previamente')),
+                ('error', models.TextField(blank=True, help_text='Detalle del error si la exportación falló', null=True)),
+                ('usuario', models.ForeignKey(blank=True, help_text='Usuario que solicitó la exportación', null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Historial de Exportación',
+                'verbose_name_plural': 'Historial de Exportaciones',
+                'ordering': ['-fecha'],
+                'indexes': [models.Index(fields=['tipo', 'formato', 'huella'], name='gestion_exp_tipo_47a076_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_exportaciones', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historialexportacion',
+            name='fecha_inicio',
+            field=models.DateTimeField(blank=True, help_text='Momento en que un proceso tomó la exportación para generarla', null=True),
+        ),
+    ]
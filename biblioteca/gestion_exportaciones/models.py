@@ -0,0 +1,105 @@
+"""
+Modelo para el historial de exportaciones generadas en segundo plano.
+"""
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class HistorialExportacion(models.Model):
+    """
+    Modelo para registrar las exportaciones solicitadas y el archivo generado.
+    """
+    TIPO_CHOICES = [
+        ('prestamos', 'Préstamos'),
+        ('libros', 'Libros'),
+        ('socios', 'Socios'),
+    ]
+
+    FORMATO_CHOICES = [
+        ('csv_gz', 'CSV comprimido (.csv.gz)'),
+        ('xlsx', 'Excel (.xlsx)'),
+        ('parquet', 'Parquet (.parquet)'),
+    ]
+
+    ESTADO_CHOICES = [
+        ('PENDIENTE', 'Pendiente'),
+        ('PROCESANDO', 'Procesando'),
+        ('COMPLETADA', 'Completada'),
+        ('ERROR', 'Error'),
+    ]
+
+    tipo = models.CharField(
+        max_length=20,
+        choices=TIPO_CHOICES,
+        db_index=True
+    )
+    formato = models.CharField(
+        max_length=10,
+        choices=FORMATO_CHOICES,
+        default='xlsx'
+    )
+    estado = models.CharField(
+        max_length=12,
+        choices=ESTADO_CHOICES,
+        default='PENDIENTE',
+        db_index=True
+    )
+    archivo = models.FileField(
+        upload_to='exportaciones/%Y/%m/%d/',
+        blank=True,
+        help_text="Archivo generado por la exportación"
+    )
+    huella = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="Huella de los datos exportados, usada para reutilizar archivos"
+    )
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        help_text="Usuario que solicitó la exportación"
+    )
+    fecha = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True
+    )
+    fecha_inicio = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Momento en que un proceso tomó la exportación para generarla"
+    )
+    fecha_finalizacion = models.DateTimeField(
+        blank=True,
+        null=True
+    )
+    total_filas = models.IntegerField(
+        default=0,
+        help_text="Cantidad de filas exportadas"
+    )
+    tamano_bytes = models.BigIntegerField(
+        default=0,
+        help_text="Tamaño del archivo generado"
+    )
+    desde_cache = models.BooleanField(
+        default=False,
+        help_text="Indica si se reutilizó un archivo generado previamente"
+    )
+    error = models.TextField(
+        blank=True,
+        null=True,
+        help_text="Detalle del error si la exportación falló"
+    )
+
+    class Meta:
+        verbose_name = "Historial de Exportación"
+        verbose_name_plural = "Historial de Exportaciones"
+        ordering = ['-fecha']
+        indexes = [
+            models.Index(fields=['tipo', 'formato', 'huella']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} ({self.get_formato_display()}) - {self.fecha.strftime('%d/%m/%Y %H:%M')} - {self.get_estado_display()}"
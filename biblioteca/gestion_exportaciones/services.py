@@ -0,0 +1,269 @@
+"""
+Servicios de lógica de negocio para exportaciones en segundo plano.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from biblioteca import cache
+
+from .exportadores import CONJUNTOS, ESCRITORES, EXTENSIONES
+from .models import HistorialExportacion
+
+logger = logging.getLogger('gestion_exportaciones')
+
+# Etiquetas de biblioteca.cache que cambian con cualquier edición de los datos de cada
+# exportación (incluidos los de otras tablas que se exportan: título, socio, etc.)
+ETIQUETAS_HUELLA = {
+    'prestamos': ('prestamos', 'libros', 'socios'),
+    'libros': ('libros',),
+    'socios': ('socios',),
+}
+
+
+class ExportacionService:
+    """Servicio para solicitar, generar y reutilizar exportaciones."""
+
+    @staticmethod
+    def calcular_huella(tipo):
+        """
+        Calcula una huella barata de los datos a exportar usando agregados indexados y
+        los tokens de las etiquetas de cache que se invalidan al editar esos datos.
+        Los agregados cubren las altas y bajas en bloque que no pasan por las señales;
+        los tokens, las ediciones (título, email, fecha de devolución...).
+
+        Args:
+            tipo: Tipo de exportación ('prestamos', 'libros' o 'socios')
+
+        Returns:
+            Hash sha256 en hexadecimal
+        """
+        from gestion_libros.models import Libro, Ejemplar
+        from gestion_prestamos.models import Prestamo
+        from gestion_socios.models import Socio
+
+        if tipo == 'prestamos':
+            datos = Prestamo.objects.aggregate(
+                total=Count('id'),
+                ultimo=Max('id'),
+                devueltos=Count('id', filter=Q(estado='DEVUELTO')),
+                vencidos=Count('id', filter=Q(estado='VENCIDO')),
+                ultima_devolucion=Max('fecha_devolucion_real'),
+            )
+        elif tipo == 'libros':
+            datos = Libro.objects.aggregate(total=Count('id'), ultimo=Max('id'))
+            datos.update(Ejemplar.objects.aggregate(ejemplares=Count('id'), ultimo_ejemplar=Max('id')))
+        elif tipo == 'socios':
+            datos = Socio.objects.aggregate(
+                total=Count('id'),
+                ultimo=Max('id'),
+                activos=Count('id', filter=Q(activo=True)),
+            )
+        else:
+            raise ValueError(f'Tipo de exportación desconocido: {tipo}')
+
+        datos['versiones'] = cache.versiones(ETIQUETAS_HUELLA[tipo])
+        contenido = json.dumps({'tipo': tipo, **datos}, sort_keys=True, default=str)
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def buscar_en_cache(tipo, formato, huella):
+        """
+        Busca una exportación completada con la misma huella cuyo archivo siga existiendo.
+
+        Returns:
+            HistorialExportacion o None
+        """
+        antiguedad_maxima = timezone.now() - timedelta(seconds=settings.EXPORTACIONES_CACHE_SEGUNDOS)
+        candidatas = HistorialExportacion.objects.filter(
+            tipo=tipo,
+            formato=formato,
+            huella=huella,
+            estado='COMPLETADA',
+            desde_cache=False,
+            fecha__gte=antiguedad_maxima,
+        ).order_by('-fecha')
+        for candidata in candidatas[:3]:
+            if candidata.archivo and default_storage.exists(candidata.archivo.name):
+                return candidata
+        return None
+
+    @staticmethod
+    def solicitar_exportacion(tipo, formato, usuario=None, en_segundo_plano=True):
+        """
+        Registra una exportación. Si los datos no cambiaron se reutiliza el último archivo;
+        si no, se genera en un hilo aparte una vez confirmada la transacción.
+
+        Args:
+            tipo: Tipo de exportación
+            formato: 'csv_gz', 'xlsx' o 'parquet'
+            usuario: Usuario que la solicita (opcional)
+            en_segundo_plano: Si False, genera el archivo en el hilo actual
+
+        Returns:
+            HistorialExportacion creado
+        """
+        if tipo not in CONJUNTOS:
+            raise ValueError(f'Tipo de exportación desconocido: {tipo}')
+        if formato not in ESCRITORES:
+            raise ValueError(f'Formato de exportación desconocido: {formato}')
+
+        huella = ExportacionService.calcular_huella(tipo)
+        previa = ExportacionService.buscar_en_cache(tipo, formato, huella)
+
+        if previa:
+            exportacion = HistorialExportacion.objects.create(
+                tipo=tipo,
+                formato=formato,
+                estado='COMPLETADA',
+                archivo=previa.archivo.name,
+                huella=huella,
+                usuario=usuario,
+                fecha_finalizacion=timezone.now(),
+                total_filas=previa.total_filas,
+                tamano_bytes=previa.tamano_bytes,
+                desde_cache=True,
+            )
+            logger.info(f'Exportación {exportacion.id} servida desde cache (origen {previa.id})')
+            return exportacion
+
+        exportacion = HistorialExportacion.objects.create(
+            tipo=tipo,
+            formato=formato,
+            huella=huella,
+            usuario=usuario,
+        )
+
+        if en_segundo_plano:
+            transaction.on_commit(lambda: ExportacionService.iniciar_en_segundo_plano(exportacion.id))
+        else:
+            ExportacionService.procesar(exportacion.id)
+            exportacion.refresh_from_db()
+
+        return exportacion
+
+    @staticmethod
+    def iniciar_en_segundo_plano(exportacion_id):
+        """Lanza la generación del archivo en un hilo daemon."""
+        hilo = threading.Thread(
+            target=ExportacionService._procesar_en_hilo,
+            args=(exportacion_id,),
+            name=f'exportacion-{exportacion_id}',
+            daemon=True,
+        )
+        hilo.start()
+        return hilo
+
+    @staticmethod
+    def _procesar_en_hilo(exportacion_id):
+        try:
+            ExportacionService.procesar(exportacion_id)
+        finally:
+            # Cada hilo abre su propia conexión; cerrarla evita dejarla colgada
+            connection.close()
+
+    @staticmethod
+    def procesar(exportacion_id):
+        """
+        Genera el archivo de una exportación pendiente.
+
+        El estado se toma con un UPDATE condicional para que dos procesos no generen
+        la misma exportación. El archivo se escribe en un temporal y luego se renombra.
+
+        Returns:
+            True si la exportación se generó en esta llamada
+        """
+        tomada = HistorialExportacion.objects.filter(
+            id=exportacion_id,
+            estado='PENDIENTE'
+        ).update(estado='PROCESANDO', fecha_inicio=timezone.now())
+        if not tomada:
+            return False
+
+        exportacion = HistorialExportacion.objects.get(id=exportacion_id)
+        conjunto = CONJUNTOS[exportacion.tipo]
+        escritor = ESCRITORES[exportacion.formato]
+
+        fecha_str = timezone.localtime(exportacion.fecha).strftime('%Y%m%d_%H%M%S')
+        nombre = f"{exportacion.tipo}_{fecha_str}_{exportacion.id}.{EXTENSIONES[exportacion.formato]}"
+        ruta_relativa = f'exportaciones/{exportacion.tipo}/{nombre}'
+        ruta_completa = default_storage.path(ruta_relativa)
+        ruta_temporal = f'{ruta_completa}.tmp'
+
+        try:
+            os.makedirs(os.path.dirname(ruta_completa), exist_ok=True)
+            total = escritor(ruta_temporal, conjunto['encabezados'], conjunto['filas']())
+            os.replace(ruta_temporal, ruta_completa)
+
+            exportacion.archivo = ruta_relativa
+            exportacion.total_filas = total
+            exportacion.tamano_bytes = os.path.getsize(ruta_completa)
+            exportacion.estado = 'COMPLETADA'
+            exportacion.fecha_finalizacion = timezone.now()
+            exportacion.save(update_fields=[
+                'archivo', 'total_filas', 'tamano_bytes', 'estado', 'fecha_finalizacion'
+            ])
+            logger.info(
+                f'Exportación {exportacion.id} completada: {exportacion.tipo}/{exportacion.formato}, '
+                f'{total} filas, {exportacion.tamano_bytes} bytes'
+            )
+            return True
+        except Exception as e:
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+            logger.error(f'Error al generar exportación {exportacion.id}: {str(e)}', exc_info=True)
+            exportacion.estado = 'ERROR'
+            exportacion.error = str(e)
+            exportacion.fecha_finalizacion = timezone.now()
+            exportacion.save(update_fields=['estado', 'error', 'fecha_finalizacion'])
+            return False
+
+    @staticmethod
+    def reclamar_abandonadas():
+        """
+        Vuelve a PENDIENTE las exportaciones que siguen en PROCESANDO después de
+        EXPORTACIONES_PROCESANDO_MAXIMO_SEGUNDOS, porque el proceso que las generaba
+        terminó sin marcarlas (worker reiniciado o caído).
+
+        Returns:
+            Cantidad de exportaciones reclamadas
+        """
+        limite = timezone.now() - timedelta(seconds=settings.EXPORTACIONES_PROCESANDO_MAXIMO_SEGUNDOS)
+        reclamadas = HistorialExportacion.objects.filter(
+            Q(fecha_inicio__lt=limite) | Q(fecha_inicio__isnull=True, fecha__lt=limite),
+            estado='PROCESANDO',
+        ).update(estado='PENDIENTE', fecha_inicio=None)
+        if reclamadas:
+            logger.warning(f'{reclamadas} exportaciones abandonadas en PROCESANDO vuelven a PENDIENTE')
+        return reclamadas
+
+    @staticmethod
+    def procesar_pendientes(limite=None):
+        """
+        Procesa las exportaciones pendientes (por ejemplo, las que quedaron sin generar
+        porque el worker se reinició), incluidas las abandonadas en PROCESANDO.
+
+        Returns:
+            Cantidad de exportaciones generadas
+        """
+        ExportacionService.reclamar_abandonadas()
+        pendientes = HistorialExportacion.objects.filter(
+            estado='PENDIENTE'
+        ).order_by('fecha').values_list('id', flat=True)
+        if limite:
+            pendientes = pendientes[:limite]
+
+        generadas = 0
+        for exportacion_id in list(pendientes):
+            if ExportacionService.procesar(exportacion_id):
+                generadas += 1
+        return generadas
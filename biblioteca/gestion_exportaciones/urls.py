@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'gestion_exportaciones'
+
+urlpatterns = [
+    path('descargar/<int:exportacion_id>/', views.descargar_exportacion, name='descargar_exportacion'),
+    path('', views.listar_exportaciones, name='listar_exportaciones'),
+]
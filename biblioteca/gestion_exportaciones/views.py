@@ -0,0 +1,67 @@
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+import logging
+from biblioteca.decorators import es_personal_required
+from .models import HistorialExportacion
+from .forms import SolicitarExportacionForm
+from .services import ExportacionService
+
+logger = logging.getLogger('gestion_exportaciones')
+
+CONTENT_TYPES = {
+    'csv_gz': 'application/gzip',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+@es_personal_required
+def listar_exportaciones(request):
+    """Vista para solicitar exportaciones y ver su historial"""
+    if request.method == 'POST':
+        form = SolicitarExportacionForm(request.POST)
+        if form.is_valid():
+            try:
+                exportacion = ExportacionService.solicitar_exportacion(
+                    tipo=form.cleaned_data['tipo'],
+                    formato=form.cleaned_data['formato'],
+                    usuario=request.user
+                )
+                if exportacion.desde_cache:
+                    messages.success(request, 'Los datos no cambiaron desde la última exportación. El archivo ya está disponible para descargar.')
+                else:
+                    messages.success(request, 'Exportación en proceso. Actualizá la página en unos instantes para descargarla.')
+                return redirect('gestion_exportaciones:listar_exportaciones')
+            except Exception as e:
+                logger.error(f'Error al solicitar exportación: {str(e)}', exc_info=True)
+                messages.error(request, 'Ocurrió un error al solicitar la exportación. Por favor, intentá nuevamente.')
+        else:
+            messages.error(request, 'Por favor, corrija los errores en el formulario.')
+    else:
+        form = SolicitarExportacionForm(initial={'tipo': request.GET.get('tipo', 'prestamos')})
+
+    historial = HistorialExportacion.objects.select_related('usuario').order_by('-fecha')[:20]
+
+    return render(request, 'gestion_exportaciones/listar_exportaciones.html', {
+        'form': form,
+        'historial': historial
+    })
+
+
+@es_personal_required
+def descargar_exportacion(request, exportacion_id):
+    """Descarga el archivo de una exportación completada"""
+    exportacion = get_object_or_404(HistorialExportacion, id=exportacion_id, estado='COMPLETADA')
+
+    if not exportacion.archivo or not default_storage.exists(exportacion.archivo.name):
+        raise Http404('El archivo de la exportación ya no está disponible')
+
+    nombre = exportacion.archivo.name.rsplit('/', 1)[-1]
+    return FileResponse(
+        default_storage.open(exportacion.archivo.name, 'rb'),
+        as_attachment=True,
+        filename=nombre,
+        content_type=CONTENT_TYPES.get(exportacion.formato)
+    )
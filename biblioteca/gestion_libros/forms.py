@@ -1,4 +1,5 @@
 from django import forms
+from . import isbn as isbn_util
 from .models import Libro
 from gestion_autores.models import Autor
 
@@ -91,10 +92,13 @@ class LibroForm(forms.ModelForm):
     def clean_isbn(self):
         isbn = self.cleaned_data.get('isbn')
         if isbn:
-            isbn = isbn.strip().replace('-', '').replace(' ', '')
-            if len(isbn) != 13 and len(isbn) != 10:
+            limpio = isbn_util.limpiar(isbn)
+            if len(limpio) != 13 and len(limpio) != 10:
                 raise forms.ValidationError('El ISBN debe tener 10 o 13 caracteres')
-        return isbn
+            isbn = isbn_util.normalizar(isbn)
+            if not isbn:
+                raise forms.ValidationError('El ISBN no es válido: revisá el dígito de control')
+        return isbn or None
 
 
 class UploadExcelForm(forms.Form):
@@ -1,2 +1,13 @@
-# Módulo de importadores para gestión de libros
+"""
+Módulo de importadores para gestión de libros.
 
+libros_importer usa pandas, que tarda en cargarse y ocupa decenas de MB en cada
+worker. Las vistas y comandos importan desde este paquete, que carga el importador
+recién cuando se ejecuta una importación.
+"""
+
+
+def importar_libros_desde_excel(*args, **kwargs):
+    """Ver libros_importer.importar_libros_desde_excel."""
+    from .libros_importer import importar_libros_desde_excel as importar
+    return importar(*args, **kwargs)
@@ -6,7 +6,10 @@ Crea autores automáticamente si no existen.
 import pandas as pd
 from datetime import datetime
 from django.db import transaction
+from biblioteca import metricas
+from gestion_libros import isbn as isbn_util
 from gestion_libros.models import Libro, Ejemplar
+from gestion_libros.services import LibroService
 from gestion_autores.models import Autor
 
 
@@ -82,11 +85,20 @@ class LibrosImporter:
         return texto if texto else None
     
     def _limpiar_isbn(self, valor):
-        """Limpia y normaliza ISBN."""
-        isbn = self._limpiar_texto(valor)
-        if isbn:
-            isbn = isbn.replace('-', '').replace(' ', '')
-        return isbn
+        """
+        Convierte el ISBN a su forma canónica (ISBN-13 sin guiones).
+        
+        Returns:
+            Tuple (isbn o None, True si la celda tenía un valor que no es un ISBN válido)
+        """
+        if isinstance(valor, float) and valor.is_integer():
+            # Columna numérica en Excel: 9780306406157.0
+            valor = int(valor)
+        texto = self._limpiar_texto(valor)
+        if not texto:
+            return None, False
+        isbn = isbn_util.normalizar(texto)
+        return isbn, isbn is None
     
     def _validar_numero(self, valor, default=None):
         """Convierte valor a número entero."""
@@ -109,10 +121,7 @@ class LibrosImporter:
         Returns:
             Autor instance
         """
-        autor = Autor.objects.filter(
-            nombre__iexact=nombre,
-            apellido__iexact=apellido
-        ).first()
+        autor = Autor.buscar_por_nombre(nombre, apellido).first()
         
         if not autor:
             autor = Autor.objects.create(
@@ -203,7 +212,9 @@ class LibrosImporter:
             return False, None, f"Fila {fila_num + 2}: {', '.join(errores)}"
         
         # Validar ISBN si está presente
-        isbn = self._limpiar_isbn(datos.get('isbn'))
+        isbn, isbn_invalido = self._limpiar_isbn(datos.get('isbn'))
+        if isbn_invalido:
+            return False, None, f"Fila {fila_num + 2}: ISBN '{datos.get('isbn')}' no es válido"
         if isbn:
             # Verificar si el ISBN ya existe
             if Libro.objects.filter(isbn=isbn).exists():
@@ -294,9 +305,9 @@ class LibrosImporter:
                         datos_limpios['autor_apellido']
                     )
                 else:
-                    autor = Autor.objects.filter(
-                        nombre__iexact=datos_limpios['autor_nombre'],
-                        apellido__iexact=datos_limpios['autor_apellido']
+                    autor = Autor.buscar_por_nombre(
+                        datos_limpios['autor_nombre'],
+                        datos_limpios['autor_apellido']
                     ).first()
                     
                     if not autor:
@@ -323,6 +334,13 @@ class LibrosImporter:
                 libro_existente = None
                 if datos_limpios['isbn'] and datos_limpios['isbn'] in isbns_existentes:
                     libro_existente = Libro.objects.filter(isbn=datos_limpios['isbn']).first()
+                    if not libro_existente:
+                        # Ya está en este archivo (por ejemplo, como ISBN-10 y como ISBN-13)
+                        self.resultados['omitidos'] += 1
+                        self.resultados['errores'].append(
+                            f"Fila {idx + 2}: ISBN '{datos_limpios['isbn']}' repetido en el archivo"
+                        )
+                        continue
                 
                 if libro_existente:
                     if actualizar_existentes:
@@ -370,6 +388,8 @@ class LibrosImporter:
                         if cantidad > 0:
                             self._crear_ejemplares(libro_creado, cantidad)
             
+            # bulk_create no emite señales
+            LibroService.invalidar_catalogo()
             return self.resultados
             
         except Exception as e:
@@ -391,9 +411,9 @@ def importar_libros_desde_excel(archivo_excel, actualizar_existentes=False, crea
         dict con resultados de la importación
     """
     importer = LibrosImporter(archivo_excel)
-    return importer.importar(
+    return metricas.medir_importacion('libros', lambda: importer.importar(
         actualizar_existentes=actualizar_existentes,
         crear_autores=crear_autores,
         crear_ejemplares=crear_ejemplares
-    )
+    ))
 
@@ -0,0 +1,73 @@
+"""
+Validación y normalización de ISBN.
+
+Los libros guardan el ISBN en su forma canónica: ISBN-13 sin guiones ni espacios (los
+ISBN-10 se convierten agregando el prefijo 978 y recalculando el dígito de control).
+Así el mismo libro coincide con cualquiera de sus dos formas y las búsquedas por ISBN
+son una comparación exacta sobre el índice único de Libro.isbn.
+"""
+import re
+
+# Forma de un ISBN escrito a mano: dígitos agrupados con guiones o espacios, con X final en ISBN-10
+_FORMA = re.compile(r'^[\d\s-]+[\dXx]$')
+
+
+def limpiar(valor):
+    """
+    Quita guiones y espacios y pasa la X de control a mayúscula.
+
+    Returns:
+        str limpio ('' si valor es None o vacío)
+    """
+    if valor is None:
+        return ''
+    return str(valor).strip().replace('-', '').replace(' ', '').upper()
+
+
+def digito_control_10(primeros):
+    """Dígito de control de un ISBN-10 a partir de sus 9 primeros dígitos ('X' vale 10)."""
+    suma = sum(int(d) * peso for d, peso in zip(primeros, range(10, 1, -1)))
+    control = (11 - suma % 11) % 11
+    return 'X' if control == 10 else str(control)
+
+
+def digito_control_13(primeros):
+    """Dígito de control de un ISBN-13 a partir de sus 12 primeros dígitos."""
+    suma = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(primeros))
+    return str((10 - suma % 10) % 10)
+
+
+def es_valido(valor):
+    """
+    Verifica formato y dígito de control de un ISBN-10 o ISBN-13.
+
+    Args:
+        valor: ISBN con o sin guiones y espacios
+    """
+    isbn = limpiar(valor)
+    if len(isbn) == 10:
+        return isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == 'X') \
+            and digito_control_10(isbn[:9]) == isbn[9]
+    if len(isbn) == 13:
+        return isbn.isdigit() and isbn[:3] in ('978', '979') \
+            and digito_control_13(isbn[:12]) == isbn[12]
+    return False
+
+
+def normalizar(valor):
+    """
+    Convierte un ISBN válido a su forma canónica (ISBN-13 sin separadores).
+
+    Args:
+        valor: ISBN-10 o ISBN-13, con o sin guiones y espacios
+
+    Returns:
+        str de 13 dígitos, o None si valor no es un ISBN válido
+    """
+    if valor is None or not _FORMA.match(str(valor).strip()) or not es_valido(valor):
+        return None
+    isbn = limpiar(valor)
+    if len(isbn) == 10:
+        base = f'978{isbn[:9]}'
+        return f'{base}{digito_control_13(base)}'
+    return isbn
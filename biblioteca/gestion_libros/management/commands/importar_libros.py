@@ -3,7 +3,7 @@ Comando de Django para importar libros desde un archivo Excel.
 Uso: python manage.py importar_libros archivo.xlsx [--actualizar] [--no-crear-autores] [--no-crear-ejemplares]
 """
 from django.core.management.base import BaseCommand, CommandError
-from gestion_libros.importadores.libros_importer import importar_libros_desde_excel
+from gestion_libros.importadores import importar_libros_desde_excel
 import os
 
 
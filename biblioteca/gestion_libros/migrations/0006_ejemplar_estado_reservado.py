@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_libros', '0005_alter_ejemplar_codigo_alter_ejemplar_estado_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ejemplar',
+            name='estado',
+            field=models.CharField(choices=[('DISPONIBLE', 'Disponible'), ('PRESTADO', 'Prestado'), ('RESERVADO', 'Reservado para retiro'), ('REPARACION', 'En reparación'), ('PERDIDO', 'Perdido')], db_index=True, default='DISPONIBLE', max_length=20),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:01
+
+from django.db import migrations, models
+
+from gestion_libros import isbn as isbn_util
+
+
+def normalizar_isbn(apps, schema_editor):
+    """
+    Pasa los ISBN guardados a su forma canónica (ISBN-13 sin guiones).
+    
+    Los que no son válidos solo se limpian. Si la forma canónica ya la tiene otro
+    libro (el mismo libro cargado con ISBN-10 y con ISBN-13) se deja como estaba.
+    """
+    Libro = apps.get_model('gestion_libros', 'Libro')
+    existentes = set(Libro.objects.exclude(isbn__isnull=True).values_list('isbn', flat=True))
+    for libro_id, isbn in Libro.objects.exclude(isbn__isnull=True).values_list('id', 'isbn').iterator():
+        canonico = isbn_util.normalizar(isbn) or isbn_util.limpiar(isbn) or None
+        if canonico == isbn or (canonico is not None and canonico in existentes):
+            continue
+        Libro.objects.filter(id=libro_id).update(isbn=canonico)
+        existentes.discard(isbn)
+        if canonico is not None:
+            existentes.add(canonico)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_libros', '0006_ejemplar_estado_reservado'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='libro',
+            name='isbn',
+            field=models.CharField(blank=True, help_text='ISBN-13 canónico, sin guiones (los ISBN-10 se convierten al guardar)', max_length=13, null=True, unique=True),
+        ),
+        migrations.RunPython(normalizar_isbn, migrations.RunPython.noop),
+    ]
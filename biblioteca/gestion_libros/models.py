@@ -1,11 +1,15 @@
 from django.db import models
 from gestion_autores.models import Autor
+from . import isbn as isbn_util
 
 
 class Libro(models.Model):
     titulo = models.CharField(max_length=200, db_index=True)
     autor = models.ForeignKey(Autor, on_delete=models.CASCADE, related_name='libros', db_index=True)
-    isbn = models.CharField(max_length=13, unique=True, blank=True, null=True, help_text="ISBN-13 (13 caracteres)")
+    isbn = models.CharField(
+        max_length=13, unique=True, blank=True, null=True,
+        help_text="ISBN-13 canónico, sin guiones (los ISBN-10 se convierten al guardar)"
+    )
     editorial = models.CharField(max_length=100, blank=True, null=True)
     fecha_publicacion = models.DateField(blank=True, null=True)
     numero_paginas = models.IntegerField(blank=True, null=True)
@@ -17,6 +21,14 @@ class Libro(models.Model):
         """Verifica si el libro tiene ejemplares disponibles"""
         return self.ejemplares.filter(estado='DISPONIBLE').exists()
 
+    def save(self, *args, **kwargs):
+        # Forma canónica para que ISBN-10 e ISBN-13 del mismo libro coincidan (ver isbn.py)
+        if self.isbn:
+            self.isbn = isbn_util.normalizar(self.isbn) or isbn_util.limpiar(self.isbn)
+        else:
+            self.isbn = None
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.titulo} - {self.autor}"
 
@@ -30,6 +42,7 @@ class Ejemplar(models.Model):
     ESTADO_CHOICES = [
         ("DISPONIBLE", "Disponible"),
         ("PRESTADO", "Prestado"),
+        ("RESERVADO", "Reservado para retiro"),
         ("REPARACION", "En reparación"),
         ("PERDIDO", "Perdido"),
     ]
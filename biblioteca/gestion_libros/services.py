@@ -1,8 +1,19 @@
 """
 Servicios de lógica de negocio para libros.
 """
+import json
+
+from django.conf import settings
 from django.db.models import Count, Q
 
+from biblioteca import cache
+from . import isbn as isbn_util
+
+
+def _normalizar_filtro(valor):
+    """Pasa un filtro de búsqueda a minúsculas y colapsa los espacios repetidos."""
+    return ' '.join((valor or '').split()).lower()
+
 
 class LibroService:
     """Servicio para operaciones de libros."""
@@ -14,7 +25,7 @@ class LibroService:
         
         Args:
             queryset: QuerySet inicial (opcional)
-            titulo: Filtro por título
+            titulo: Filtro por título, o un ISBN (se busca por igualdad en el índice único)
             autor: Filtro por autor (nombre o apellido)
             genero: Filtro por género
         
@@ -29,7 +40,11 @@ class LibroService:
             libros = queryset
         
         if titulo:
-            libros = libros.filter(titulo__icontains=titulo)
+            isbn = isbn_util.normalizar(titulo)
+            if isbn:
+                libros = libros.filter(isbn=isbn)
+            else:
+                libros = libros.filter(titulo__icontains=titulo)
         
         if autor:
             libros = libros.filter(
@@ -50,17 +65,135 @@ class LibroService:
         
         return libros
     
+    @staticmethod
+    def invalidar_catalogo():
+        """
+        Invalida las búsquedas cacheadas del catálogo al confirmarse la transacción.
+        
+        Se llama en cada cambio de libros o ejemplares (préstamos, devoluciones,
+        reservas, importaciones); ver gestion_libros/signals.py.
+        """
+        cache.invalidar('catalogo')
+    
+    @staticmethod
+    def buscar_libros_cacheado(titulo=None, autor=None, genero=None, pagina=1, por_pagina=20):
+        """
+        Busca una página del catálogo para socios pasando por la cache.
+        
+        Se cachean solo los IDs de los libros con su disponibilidad, con la etiqueta
+        'catalogo': el total bajo una clave formada por los filtros normalizados
+        (minúsculas y espacios colapsados) y cada página bajo esa clave más el número
+        de página ya ajustado, para que una página fuera de rango no cree otra entrada.
+        Los libros se leen siempre frescos por clave primaria.
+        
+        Args:
+            titulo: Filtro por título
+            autor: Filtro por autor (nombre o apellido)
+            genero: Filtro por género
+            pagina: Número de página pedido (se ajusta al rango válido)
+            por_pagina: Libros por página (default: 20)
+        
+        Returns:
+            dict con 'total', 'pagina' y 'libros' (lista de dicts con libro,
+            ejemplares_disponibles y total_ejemplares, ordenada por título)
+        """
+        from .models import Libro
+        
+        filtros = {
+            'titulo': _normalizar_filtro(titulo),
+            'autor': _normalizar_filtro(autor),
+            'genero': _normalizar_filtro(genero),
+        }
+        libros = LibroService.buscar_libros_optimizado(**filtros).order_by('titulo', 'id')
+        busqueda = json.dumps(filtros, sort_keys=True)
+        
+        total = cache.obtener_o_calcular(
+            cache.clave('catalogo', 'busqueda', busqueda, 'total'),
+            libros.count,
+            etiquetas=['catalogo'],
+            timeout=settings.CATALOGO_CACHE_SEGUNDOS
+        )
+        paginas = max(1, -(-total // por_pagina))
+        numero = min(max(1, pagina), paginas)
+        desde = (numero - 1) * por_pagina
+        
+        filas = cache.obtener_o_calcular(
+            cache.clave('catalogo', 'busqueda', busqueda, por_pagina, numero),
+            lambda: list(libros[desde:desde + por_pagina].values_list(
+                'id', 'ejemplares_disponibles', 'total_ejemplares'
+            )),
+            etiquetas=['catalogo'],
+            timeout=settings.CATALOGO_CACHE_SEGUNDOS
+        )
+        por_id = Libro.objects.select_related('autor').in_bulk([fila[0] for fila in filas])
+        return {
+            'total': total,
+            'pagina': numero,
+            'libros': [
+                {'libro': por_id[id], 'ejemplares_disponibles': disponibles, 'total_ejemplares': total_libro}
+                for id, disponibles, total_libro in filas
+                if id in por_id
+            ],
+        }
+    
+    @staticmethod
+    def disponibilidad_por_isbn(isbns):
+        """
+        Obtiene en una sola consulta la disponibilidad de varios libros por ISBN.
+        
+        Args:
+            isbns: Lista de ISBN-10 o ISBN-13, con o sin guiones (se comparan en su
+                forma canónica, ver isbn.py)
+        
+        Returns:
+            dict {isbn recibido: Libro con ejemplares_disponibles y total_ejemplares, o None}
+        """
+        from .models import Libro
+        
+        normalizados = {
+            isbn: isbn_util.normalizar(isbn) or isbn_util.limpiar(isbn) for isbn in isbns
+        }
+        libros = {
+            libro.isbn: libro for libro in LibroService.buscar_libros_optimizado(
+                Libro.objects.select_related('autor').filter(isbn__in=set(normalizados.values()))
+            )
+        }
+        return {isbn: libros.get(normalizado) for isbn, normalizado in normalizados.items()}
+    
+    @staticmethod
+    def ejemplares_por_codigo(codigos):
+        """
+        Obtiene en una sola consulta varios ejemplares por código, con su libro.
+        
+        Args:
+            codigos: Lista de Ejemplar.codigo
+        
+        Returns:
+            dict {codigo: Ejemplar o None}
+        """
+        from .models import Ejemplar
+        
+        ejemplares = Ejemplar.objects.select_related('libro').in_bulk(codigos, field_name='codigo')
+        return {codigo: ejemplares.get(codigo) for codigo in codigos}
+    
     @staticmethod
     def obtener_generos_disponibles():
         """
-        Obtiene lista de géneros únicos disponibles.
+        Obtiene lista de géneros únicos disponibles, cacheada con la etiqueta 'catalogo'.
         
         Returns:
-            QuerySet con géneros únicos
+            Lista de géneros únicos
         """
         from .models import Libro
-        return Libro.objects.exclude(
-            genero__isnull=True
-        ).exclude(
-            genero=''
-        ).values_list('genero', flat=True).distinct()
+        return cache.obtener_o_calcular(
+            cache.clave('catalogo', 'generos'),
+            lambda: list(
+                Libro.objects.exclude(
+                    genero__isnull=True
+                ).exclude(
+                    genero=''
+                ).values_list('genero', flat=True).distinct()
+            ),
+            etiquetas=['catalogo'],
+            timeout=settings.CATALOGO_CACHE_SEGUNDOS
+        )
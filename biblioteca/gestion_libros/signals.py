@@ -0,0 +1,30 @@
+"""
+Invalidación de la cache del catálogo cuando cambian libros o ejemplares.
+
+Cubre los guardados y borrados uno a uno (vistas, admin, servicios). Los UPDATE y
+bulk_create en bloque no emiten señales: quien los hace llama directamente a
+LibroService.invalidar_catalogo().
+
+La etiqueta 'libros' cubre los datos que se muestran en los historiales de los socios
+(título, autor, código del ejemplar), por lo que no cambia con el estado del ejemplar.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from biblioteca import cache
+
+from .models import Ejemplar, Libro
+from .services import LibroService
+
+
+@receiver([post_save, post_delete], sender=Libro, dispatch_uid='gestion_libros.invalidar_catalogo_libro')
+def invalidar_catalogo_libro(sender, **kwargs):
+    LibroService.invalidar_catalogo()
+    cache.invalidar('libros')
+
+
+@receiver([post_save, post_delete], sender=Ejemplar, dispatch_uid='gestion_libros.invalidar_catalogo_ejemplar')
+def invalidar_catalogo_ejemplar(sender, update_fields=None, **kwargs):
+    LibroService.invalidar_catalogo()
+    if update_fields is None or set(update_fields) != {'estado'}:
+        cache.invalidar('libros')
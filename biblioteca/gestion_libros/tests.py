@@ -1,3 +1,66 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from gestion_autores.models import Autor
+
+from . import isbn
+from .forms import LibroForm
+from .models import Libro
+from .services import LibroService
+
+
+class IsbnTest(TestCase):
+    """Validación de dígitos de control y conversión a la forma canónica."""
+
+    def test_valida_digito_de_control(self):
+        self.assertTrue(isbn.es_valido('0-306-40615-2'))
+        self.assertTrue(isbn.es_valido('080442957X'))
+        self.assertTrue(isbn.es_valido('978-0-306-40615-7'))
+        self.assertFalse(isbn.es_valido('0306406153'))
+        self.assertFalse(isbn.es_valido('9780306406158'))
+        # ISBN-13 solo con prefijos 978 y 979
+        self.assertFalse(isbn.es_valido('9770306406157'))
+
+    def test_normaliza_a_isbn13(self):
+        self.assertEqual(isbn.normalizar('0-306-40615-2'), '9780306406157')
+        self.assertEqual(isbn.normalizar('080442957x'), '9780804429573')
+        self.assertEqual(isbn.normalizar('978 0 306 40615 7'), '9780306406157')
+        for valor in [None, '', '1984', 'Rayuela', '9780306406158']:
+            self.assertIsNone(isbn.normalizar(valor))
+
+
+class LibroIsbnTest(TestCase):
+    """ISBN canónico al guardar y búsqueda exacta por ISBN."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.autor = Autor.objects.create(nombre='Julio', apellido='Cortázar')
+        cls.libro = Libro.objects.create(titulo='Rayuela', autor=cls.autor, isbn='0-306-40615-2')
+        Libro.objects.create(titulo='Bestiario', autor=cls.autor, isbn='9780804429573')
+
+    def test_guarda_forma_canonica(self):
+        self.assertEqual(self.libro.isbn, '9780306406157')
+        self.assertIsNone(Libro.objects.create(titulo='Final del juego', autor=self.autor, isbn='').isbn)
+
+    def test_formulario_rechaza_invalido_y_duplicado(self):
+        datos = {'titulo': 'Historias de cronopios', 'autor': self.autor.id}
+        form = LibroForm(data={**datos, 'isbn': '0306406153'})
+        self.assertIn('isbn', form.errors)
+        # Mismo libro escrito como ISBN-13
+        form = LibroForm(data={**datos, 'isbn': '978-0-306-40615-7'})
+        self.assertIn('isbn', form.errors)
+
+    def test_busqueda_por_isbn_usa_igualdad(self):
+        libros = LibroService.buscar_libros_optimizado(titulo='0-306-40615-2')
+        self.assertEqual([libro.id for libro in libros], [self.libro.id])
+        self.assertNotIn('LIKE', str(libros.query))
+        self.assertEqual(
+            LibroService.disponibilidad_por_isbn(['0306406152'])['0306406152'].id, self.libro.id
+        )
+
+    def test_listado_del_personal_busca_por_isbn(self):
+        personal = User.objects.create_user('personal', password='clave', is_staff=True)
+        self.client.force_login(personal)
+        respuesta = self.client.get(reverse('gestion_libros:listar_libros'), {'q': '0-306-40615-2'})
+        self.assertEqual([libro.id for libro in respuesta.context['page_obj']], [self.libro.id])
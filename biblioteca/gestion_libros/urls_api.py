@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views_api
+
+app_name = 'api_libros'
+
+urlpatterns = [
+    path('libros/', views_api.libros, name='libros'),
+    path('libros/disponibilidad/', views_api.disponibilidad, name='disponibilidad'),
+    path('libros/<int:libro_id>/', views_api.libro, name='libro'),
+    path('ejemplares/', views_api.ejemplares, name='ejemplares'),
+    path('ejemplares/<str:codigo>/', views_api.ejemplar, name='ejemplar'),
+]
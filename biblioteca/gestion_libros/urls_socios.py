@@ -1,13 +1,15 @@
+from django.conf import settings
 from django.urls import path
-from . import views_socios
+from . import views_async, views_socios
 
 app_name = 'socios'
 
+# Bajo ASGI las vistas de lectura son las async (ver settings.VISTAS_ASYNC)
+lectura = views_async if settings.VISTAS_ASYNC else views_socios
+
 urlpatterns = [
-    path('buscar/', views_socios.buscar_libros, name='buscar_libros'),
+    path('buscar/', lectura.buscar_libros, name='buscar_libros'),
     path('solicitar/<int:libro_id>/', views_socios.solicitar_prestamo, name='solicitar_prestamo'),
-    path('mis-prestamos/', views_socios.mis_prestamos, name='mis_prestamos'),
-    path('mis-reservas/', views_socios.mis_reservas, name='mis_reservas'),
+    path('mis-prestamos/', lectura.mis_prestamos, name='mis_prestamos'),
+    path('mis-reservas/', lectura.mis_reservas, name='mis_reservas'),
 ]
-
-
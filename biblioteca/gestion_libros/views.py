@@ -1,11 +1,11 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.http import HttpResponse
-from biblioteca.decorators import es_personal_required
+from biblioteca.decorators import condicional, es_personal_required
 from biblioteca.utils import listar_con_busqueda_paginacion, exportar_csv_response
 from .models import Libro
 from .forms import LibroForm, UploadExcelForm
-from .importadores.libros_importer import importar_libros_desde_excel
+from .importadores import importar_libros_desde_excel
 
 @es_personal_required
 def index_libros(request):
@@ -28,6 +28,7 @@ def crear_libro(request):
     return render(request, 'gestion_libros/crear_libro.html', {'form': form})
 
 @es_personal_required
+@condicional('catalogo')
 def listar_libros(request):
     from django.db.models import Count, Q
     
@@ -41,7 +42,8 @@ def listar_libros(request):
     
     campos_busqueda = ['titulo', 'autor__nombre', 'autor__apellido', 'genero']
     page_obj, q = listar_con_busqueda_paginacion(
-        request, libros, campos_busqueda, items_por_pagina=10
+        request, libros, campos_busqueda, items_por_pagina=10,
+        busquedas_indexadas={'isbn': 'isbn'}
     )
     
     return render(request, 'gestion_libros/listar_libros.html', {'page_obj': page_obj, 'q': q})
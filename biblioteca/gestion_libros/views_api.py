@@ -0,0 +1,107 @@
+"""
+API JSON del catálogo: libros con disponibilidad y ejemplares por código.
+Ver biblioteca/api.py (autenticación, campos, cursor y cache).
+"""
+from biblioteca.api import ErrorAPI, api_vista, lista_parametro, paginar_por_cursor, recortar, seleccionar_campos
+from .models import Libro
+from .services import LibroService
+
+CAMPOS_LIBRO = (
+    'id', 'titulo', 'autor_id', 'autor', 'isbn', 'editorial', 'genero',
+    'fecha_publicacion', 'numero_paginas', 'ejemplares_disponibles', 'total_ejemplares',
+)
+CAMPOS_EJEMPLAR = ('codigo', 'estado', 'ubicacion', 'libro_id', 'titulo')
+
+
+def _libro(libro, campos):
+    """Serializa un Libro anotado por LibroService.buscar_libros_optimizado."""
+    return recortar({
+        'id': libro.id,
+        'titulo': libro.titulo,
+        'autor_id': libro.autor_id,
+        'autor': f'{libro.autor.nombre} {libro.autor.apellido}',
+        'isbn': libro.isbn,
+        'editorial': libro.editorial,
+        'genero': libro.genero,
+        'fecha_publicacion': libro.fecha_publicacion.isoformat() if libro.fecha_publicacion else None,
+        'numero_paginas': libro.numero_paginas,
+        'ejemplares_disponibles': libro.ejemplares_disponibles,
+        'total_ejemplares': libro.total_ejemplares,
+    }, campos)
+
+
+def _ejemplar(ejemplar, campos):
+    return recortar({
+        'codigo': ejemplar.codigo,
+        'estado': ejemplar.estado,
+        'ubicacion': ejemplar.ubicacion,
+        'libro_id': ejemplar.libro_id,
+        'titulo': ejemplar.libro.titulo,
+    }, campos)
+
+
+@api_vista(etiquetas=['catalogo'])
+def libros(request):
+    """Libros con disponibilidad, filtrables por titulo, autor y genero, paginados por cursor."""
+    campos = seleccionar_campos(request, CAMPOS_LIBRO)
+    queryset = LibroService.buscar_libros_optimizado(
+        titulo=request.GET.get('titulo', '').strip() or None,
+        autor=request.GET.get('autor', '').strip() or None,
+        genero=request.GET.get('genero', '').strip() or None
+    )
+    pagina, siguiente = paginar_por_cursor(request, queryset)
+    return {
+        'resultados': [_libro(libro, campos) for libro in pagina],
+        'siguiente': siguiente,
+    }
+
+
+@api_vista(etiquetas=['catalogo'])
+def libro(request, libro_id):
+    """Un libro con su disponibilidad."""
+    campos = seleccionar_campos(request, CAMPOS_LIBRO)
+    encontrado = LibroService.buscar_libros_optimizado(
+        Libro.objects.select_related('autor').filter(id=libro_id)
+    ).first()
+    if not encontrado:
+        raise ErrorAPI('Libro inexistente.', status=404)
+    return _libro(encontrado, campos)
+
+
+@api_vista(metodos=('GET', 'POST'), etiquetas=['catalogo'])
+def disponibilidad(request):
+    """
+    Disponibilidad de muchos libros por ISBN en una consulta: ?isbn=a,b,c o POST
+    {"isbn": [...]}. Los ISBN sin libro se devuelven con null.
+    """
+    campos = seleccionar_campos(request, CAMPOS_LIBRO)
+    encontrados = LibroService.disponibilidad_por_isbn(lista_parametro(request, 'isbn'))
+    return {
+        'resultados': {
+            isbn: _libro(libro, campos) if libro else None
+            for isbn, libro in encontrados.items()
+        },
+    }
+
+
+@api_vista(metodos=('GET', 'POST'), etiquetas=['catalogo'])
+def ejemplares(request):
+    """Estado de muchos ejemplares por código: ?codigo=a,b,c o POST {"codigo": [...]}."""
+    campos = seleccionar_campos(request, CAMPOS_EJEMPLAR)
+    encontrados = LibroService.ejemplares_por_codigo(lista_parametro(request, 'codigo'))
+    return {
+        'resultados': {
+            codigo: _ejemplar(ejemplar, campos) if ejemplar else None
+            for codigo, ejemplar in encontrados.items()
+        },
+    }
+
+
+@api_vista(etiquetas=['catalogo'])
+def ejemplar(request, codigo):
+    """Un ejemplar por código."""
+    campos = seleccionar_campos(request, CAMPOS_EJEMPLAR)
+    encontrado = LibroService.ejemplares_por_codigo([codigo])[codigo]
+    if not encontrado:
+        raise ErrorAPI('Ejemplar inexistente.', status=404)
+    return _ejemplar(encontrado, campos)
@@ -0,0 +1,113 @@
+"""
+Versiones async de las vistas de lectura del socio (búsqueda, mis préstamos y mis
+reservas), para servirlas bajo ASGI sin ocupar el worker mientras esperan a la base.
+
+Se usan en lugar de las de views_socios cuando settings.VISTAS_ASYNC está activo (por
+defecto con SERVIDOR_ASGI). El ORM async y sync_to_async usan thread_sensitive=True,
+así que las consultas de una request corren una tras otra en un único hilo, no en
+paralelo: lo que se gana es que el event loop atiende otras requests mientras tanto.
+El template también se renderiza en ese hilo, porque los context processors y los tags
+de fragmentos consultan la base y la cache de forma sincrónica.
+"""
+import asyncio
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.shortcuts import redirect, render
+
+from biblioteca.decorators import condicional, es_socio_required
+from biblioteca.utils import aobtener_socio_desde_user
+from gestion_prestamos.models import Reserva
+from gestion_prestamos.services import PrestamoService
+from .services import LibroService
+from .views_socios import _etiquetas_socio
+
+
+@es_socio_required
+@condicional('catalogo')
+async def buscar_libros(request):
+    """Vista para que los socios busquen libros por género, título o autor"""
+    query_titulo = request.GET.get('titulo', '').strip()
+    query_autor = request.GET.get('autor', '').strip()
+    query_genero = request.GET.get('genero', '').strip()
+
+    try:
+        pagina = int(request.GET.get('page', 1))
+    except ValueError:
+        pagina = 1
+
+    # La página y los géneros son independientes, pero se resuelven uno tras otro en el
+    # hilo de sync_to_async (thread_sensitive): gather no los ejecuta en paralelo
+    resultado, generos = await asyncio.gather(
+        sync_to_async(LibroService.buscar_libros_cacheado)(
+            titulo=query_titulo or None,
+            autor=query_autor or None,
+            genero=query_genero or None,
+            pagina=pagina
+        ),
+        sync_to_async(LibroService.obtener_generos_disponibles)(),
+    )
+    page_obj = Paginator(range(resultado['total']), 20).page(resultado['pagina'])
+
+    filtros = urlencode({
+        clave: valor for clave, valor in
+        (('titulo', query_titulo), ('autor', query_autor), ('genero', query_genero)) if valor
+    })
+
+    context = {
+        'libros_con_info': resultado['libros'],
+        'page_obj': page_obj,
+        'filtros': filtros,
+        'query_titulo': query_titulo,
+        'query_autor': query_autor,
+        'query_genero': query_genero,
+        'generos': generos,
+    }
+
+    return await sync_to_async(render)(request, 'socios/buscar_libros.html', context)
+
+
+@es_socio_required
+@condicional('libros', _etiquetas_socio)
+async def mis_prestamos(request):
+    """Vista para que los socios vean sus préstamos"""
+    socio = await aobtener_socio_desde_user(request.user)
+    if not socio:
+        messages.error(request, 'No se encontró tu información de socio.')
+        return redirect('home')
+
+    # Incluye los préstamos antiguos movidos a la tabla de archivo
+    prestamos = await sync_to_async(PrestamoService.historial_socio)(socio)
+
+    context = {
+        'prestamos': prestamos,
+        'socio': socio,
+    }
+
+    return await sync_to_async(render)(request, 'socios/mis_prestamos.html', context)
+
+
+@es_socio_required
+@condicional('libros', _etiquetas_socio)
+async def mis_reservas(request):
+    """Vista para que los socios vean sus reservas"""
+    socio = await aobtener_socio_desde_user(request.user)
+    if not socio:
+        messages.error(request, 'No se encontró tu información de socio.')
+        return redirect('home')
+
+    # Se evalúa acá: el template no puede consultar la base desde el event loop
+    reservas = [
+        reserva async for reserva in Reserva.objects.filter(
+            socio=socio
+        ).select_related('libro', 'libro__autor').order_by('-fecha_reserva')
+    ]
+
+    context = {
+        'reservas': reservas,
+        'socio': socio,
+    }
+
+    return await sync_to_async(render)(request, 'socios/mis_reservas.html', context)
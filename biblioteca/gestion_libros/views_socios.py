@@ -1,42 +1,55 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
-from django.db import transaction
+from django.core.paginator import Paginator
 from django.utils import timezone
 from datetime import timedelta
-from biblioteca.decorators import es_socio_required
+from urllib.parse import urlencode
+from biblioteca.basedatos import transaccion_escritura
+from biblioteca.decorators import condicional, es_socio_required
 from biblioteca.utils import obtener_socio_desde_user
-from gestion_prestamos.models import Prestamo, Reserva
+from gestion_prestamos.models import Reserva
 from gestion_prestamos.services import PrestamoService
 from gestion_socios.models import Socio
 from .models import Libro, Ejemplar
 from .services import LibroService
 
+def _etiquetas_socio(request):
+    """Etiqueta de cache de los préstamos y reservas del socio del usuario."""
+    socio = obtener_socio_desde_user(request.user)
+    return [f'socio:{socio.id}'] if socio else []
+
 @es_socio_required
+@condicional('catalogo')
 def buscar_libros(request):
     """Vista para que los socios busquen libros por género, título o autor"""
     query_titulo = request.GET.get('titulo', '').strip()
     query_autor = request.GET.get('autor', '').strip()
     query_genero = request.GET.get('genero', '').strip()
     
-    libros = LibroService.buscar_libros_optimizado(
+    try:
+        pagina = int(request.GET.get('page', 1))
+    except ValueError:
+        pagina = 1
+    
+    resultado = LibroService.buscar_libros_cacheado(
         titulo=query_titulo or None,
         autor=query_autor or None,
-        genero=query_genero or None
-    ).order_by('titulo')
+        genero=query_genero or None,
+        pagina=pagina
+    )
+    page_obj = Paginator(range(resultado['total']), 20).page(resultado['pagina'])
     
     generos = LibroService.obtener_generos_disponibles()
     
-    libros_con_info = [
-        {
-            'libro': libro,
-            'ejemplares_disponibles': libro.ejemplares_disponibles,
-            'total_ejemplares': libro.total_ejemplares,
-        }
-        for libro in libros
-    ]
+    filtros = urlencode({
+        clave: valor for clave, valor in
+        (('titulo', query_titulo), ('autor', query_autor), ('genero', query_genero)) if valor
+    })
     
     context = {
-        'libros_con_info': libros_con_info,
+        'libros_con_info': resultado['libros'],
+        'page_obj': page_obj,
+        'filtros': filtros,
         'query_titulo': query_titulo,
         'query_autor': query_autor,
         'query_genero': query_genero,
@@ -45,8 +58,27 @@ def buscar_libros(request):
     
     return render(request, 'socios/buscar_libros.html', context)
 
+def _ejemplar_para_socio(socio, libro, bloquear=False):
+    """
+    Ejemplar que se le prestaría al socio: el que tiene apartado por una reserva
+    notificada o, si no, uno disponible del libro.
+    
+    Args:
+        bloquear: Si True lo toma con select_for_update (dentro de una transacción)
+    """
+    ejemplares = Ejemplar.objects.select_for_update() if bloquear else Ejemplar.objects
+    reserva_apartada = Reserva.objects.filter(
+        socio=socio,
+        libro=libro,
+        estado='NOTIFICADA',
+        ejemplar__isnull=False
+    ).first()
+    
+    if reserva_apartada:
+        return ejemplares.filter(id=reserva_apartada.ejemplar_id, estado='RESERVADO').first()
+    return ejemplares.filter(libro=libro, estado='DISPONIBLE').first()
+
 @es_socio_required
-@transaction.atomic
 def solicitar_prestamo(request, libro_id):
     """Vista para que un socio solicite un préstamo de un libro"""
     libro = get_object_or_404(Libro.objects.select_related('autor'), id=libro_id)
@@ -65,31 +97,35 @@ def solicitar_prestamo(request, libro_id):
         messages.error(request, mensaje_error)
         return redirect('socios:buscar_libros')
     
-    ejemplar_disponible = Ejemplar.objects.select_for_update().filter(
-        libro=libro,
-        estado='DISPONIBLE'
-    ).first()
-    
-    if not ejemplar_disponible:
-        messages.error(request, 'No hay ejemplares disponibles de este libro.')
-        return redirect('socios:buscar_libros')
+    fecha_devolucion = timezone.now().date() + timedelta(days=30)
     
     if request.method == 'POST':
-        fecha_devolucion = timezone.now().date() + timedelta(days=30)
-        
         try:
-            prestamo = PrestamoService.crear_prestamo_seguro(
-                socio=socio,
-                ejemplar=ejemplar_disponible,
-                fecha_devolucion_esperada=fecha_devolucion
-            )
+            # Solo el POST escribe: BEGIN IMMEDIATE, se bloquea el ejemplar y se crea el
+            # préstamo en la misma transacción (el límite se vuelve a validar con el lock)
+            with transaccion_escritura():
+                puede_prestar, mensaje_error = PrestamoService.validar_limite_prestamos(socio)
+                if not puede_prestar:
+                    raise ValueError(mensaje_error)
+                ejemplar = _ejemplar_para_socio(socio, libro, bloquear=True)
+                if not ejemplar:
+                    raise ValueError('No hay ejemplares disponibles de este libro.')
+                PrestamoService.crear_prestamo_seguro(
+                    socio=socio,
+                    ejemplar=ejemplar,
+                    fecha_devolucion_esperada=fecha_devolucion
+                )
             messages.success(request, 'Préstamo registrado correctamente.')
-            return redirect('socios:buscar_libros')
         except ValueError as e:
             messages.error(request, str(e))
-            return redirect('socios:buscar_libros')
+        return redirect('socios:buscar_libros')
+    
+    # La página de confirmación solo lee: no toma el lock de escritura de SQLite
+    ejemplar_disponible = _ejemplar_para_socio(socio, libro)
+    if not ejemplar_disponible:
+        messages.error(request, 'No hay ejemplares disponibles de este libro.')
+        return redirect('socios:buscar_libros')
     
-    fecha_devolucion = timezone.now().date() + timedelta(days=30)
     context = {
         'libro': libro,
         'ejemplar': ejemplar_disponible,
@@ -100,6 +136,7 @@ def solicitar_prestamo(request, libro_id):
     return render(request, 'socios/solicitar_prestamo.html', context)
 
 @es_socio_required
+@condicional('libros', _etiquetas_socio)
 def mis_prestamos(request):
     """Vista para que los socios vean sus préstamos"""
     socio = obtener_socio_desde_user(request.user)
@@ -107,9 +144,8 @@ def mis_prestamos(request):
         messages.error(request, 'No se encontró tu información de socio.')
         return redirect('home')
     
-    prestamos = Prestamo.objects.filter(
-        socio=socio
-    ).select_related('ejemplar', 'ejemplar__libro').order_by('-fecha_prestamo')
+    # Incluye los préstamos antiguos movidos a la tabla de archivo
+    prestamos = PrestamoService.historial_socio(socio)
     
     context = {
         'prestamos': prestamos,
@@ -120,6 +156,7 @@ def mis_prestamos(request):
 
 
 @es_socio_required
+@condicional('libros', _etiquetas_socio)
 def mis_reservas(request):
     """Vista para que los socios vean sus reservas"""
     socio = obtener_socio_desde_user(request.user)
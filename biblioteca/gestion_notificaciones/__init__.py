@@ -0,0 +1 @@
+# App para la bandeja de salida de notificaciones por email
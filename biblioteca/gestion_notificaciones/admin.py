@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import Notificacion
+
+
+@admin.register(Notificacion)
+class NotificacionAdmin(admin.ModelAdmin):
+    list_display = ['destinatario', 'asunto', 'estado', 'intentos', 'fecha_creacion', 'fecha_envio', 'proximo_intento']
+    list_filter = ['estado', 'fecha_creacion']
+    search_fields = ['destinatario', 'asunto']
+    readonly_fields = ['fecha_creacion', 'fecha_envio']
+    date_hierarchy = 'fecha_creacion'
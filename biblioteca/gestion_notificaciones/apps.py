@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class GestionNotificacionesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'gestion_notificaciones'
+    verbose_name = 'Gestión de Notificaciones'
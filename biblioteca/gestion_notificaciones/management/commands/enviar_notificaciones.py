@@ -0,0 +1,58 @@
+"""
+Comando de Django para enviar las notificaciones por email pendientes.
+Uso: python manage.py enviar_notificaciones [--lote N] [--intervalo SEG]
+
+Sin --intervalo vacía la bandeja de salida y termina (pensado para cron). Con
+--intervalo queda en un bucle que revisa la bandeja cada SEG segundos.
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from gestion_notificaciones.services import NotificacionService
+
+
+class Command(BaseCommand):
+    help = 'Envía por lotes las notificaciones por email pendientes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=100,
+            help='Cantidad de emails enviados por conexión SMTP (default: 100)',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=None,
+            help='Revisar la bandeja cada N segundos en lugar de terminar al vaciarla',
+        )
+
+    def handle(self, *args, **options):
+        tamano_lote = options['lote']
+        intervalo = options.get('intervalo')
+
+        if tamano_lote <= 0:
+            raise CommandError('El tamaño de lote debe ser mayor a 0.')
+
+        while True:
+            totales = {'enviadas': 0, 'fallidas': 0, 'descartadas': 0}
+            while True:
+                resultados = NotificacionService.enviar_pendientes(tamano_lote=tamano_lote)
+                for clave, valor in resultados.items():
+                    totales[clave] += valor
+                if sum(resultados.values()) < tamano_lote:
+                    break
+
+            if any(totales.values()):
+                self.stdout.write(self.style.SUCCESS(
+                    f"Enviadas: {totales['enviadas']}, "
+                    f"reprogramadas: {totales['fallidas']}, "
+                    f"descartadas: {totales['descartadas']}"
+                ))
+
+            if not intervalo:
+                break
+            try:
+                time.sleep(intervalo)
+            except KeyboardInterrupt:
+                break
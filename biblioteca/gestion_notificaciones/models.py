@@ -0,0 +1,47 @@
+"""
+Modelo de la bandeja de salida (outbox) de notificaciones por email.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class Notificacion(models.Model):
+    """
+    Email pendiente de envío.
+
+    Se crea dentro de la misma transacción que el cambio de estado que lo origina,
+    y lo envía el comando enviar_notificaciones fuera del ciclo de la request.
+    """
+    ESTADO_CHOICES = [
+        ('PENDIENTE', 'Pendiente'),
+        ('ENVIADA', 'Enviada'),
+        ('ERROR', 'Error'),
+    ]
+
+    destinatario = models.EmailField()
+    asunto = models.CharField(max_length=200)
+    mensaje = models.TextField()
+    estado = models.CharField(
+        max_length=10,
+        choices=ESTADO_CHOICES,
+        default='PENDIENTE'
+    )
+    intentos = models.IntegerField(default=0)
+    proximo_intento = models.DateTimeField(
+        default=timezone.now,
+        help_text="No se intenta enviar antes de esta fecha (reintentos con espera creciente)"
+    )
+    ultimo_error = models.TextField(blank=True, null=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True, db_index=True)
+    fecha_envio = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.asunto} -> {self.destinatario} ({self.estado})"
+
+    class Meta:
+        verbose_name = "Notificación"
+        verbose_name_plural = "Notificaciones"
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'proximo_intento']),
+        ]
@@ -0,0 +1,138 @@
+"""
+Servicios para encolar y enviar notificaciones por email.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from biblioteca.basedatos import transaccion_escritura
+
+from .models import Notificacion
+
+logger = logging.getLogger('gestion_notificaciones')
+
+
+class NotificacionService:
+    """Servicio para la bandeja de salida de notificaciones."""
+
+    @staticmethod
+    def encolar(destinatario, asunto, mensaje):
+        """
+        Registra un email para envío diferido.
+
+        Debe llamarse dentro de la transacción del cambio de estado que lo origina:
+        si la transacción se revierte, la notificación tampoco queda registrada.
+
+        Returns:
+            Notificacion creada
+        """
+        return Notificacion.objects.create(
+            destinatario=destinatario,
+            asunto=asunto,
+            mensaje=mensaje
+        )
+
+    @staticmethod
+    def _reservar_lote(tamano_lote):
+        """
+        Toma un lote de notificaciones listas para enviar.
+
+        Corre el próximo intento NOTIFICACIONES_RESERVA_SEGUNDOS hacia adelante dentro
+        de la misma transacción, para que otro worker no tome el mismo lote. En SQLite
+        select_for_update no bloquea nada: es el BEGIN IMMEDIATE de transaccion_escritura
+        el que serializa a los workers. Si el proceso muere antes de enviarlas, vuelven
+        a estar disponibles cuando vence ese plazo.
+        """
+        ahora = timezone.now()
+        with transaccion_escritura():
+            lote = list(
+                Notificacion.objects.select_for_update(skip_locked=True).filter(
+                    estado='PENDIENTE',
+                    proximo_intento__lte=ahora
+                ).order_by('proximo_intento', 'id')[:tamano_lote]
+            )
+            if lote:
+                Notificacion.objects.filter(id__in=[n.id for n in lote]).update(
+                    proximo_intento=ahora + timedelta(seconds=settings.NOTIFICACIONES_RESERVA_SEGUNDOS)
+                )
+        return lote
+
+    @staticmethod
+    def calcular_espera(intentos):
+        """Espera exponencial antes del próximo reintento, con tope."""
+        espera = settings.NOTIFICACIONES_BACKOFF_SEGUNDOS * (2 ** max(intentos - 1, 0))
+        return timedelta(seconds=min(espera, settings.NOTIFICACIONES_BACKOFF_MAXIMO_SEGUNDOS))
+
+    @staticmethod
+    def enviar_pendientes(tamano_lote=100):
+        """
+        Envía un lote de notificaciones pendientes usando una única conexión SMTP.
+
+        Cada mensaje se envía por separado sobre la conexión abierta para saber cuál
+        falló; los fallidos se reprograman con espera exponencial hasta agotar
+        NOTIFICACIONES_MAX_INTENTOS.
+
+        Returns:
+            dict con 'enviadas', 'fallidas' y 'descartadas'
+        """
+        resultados = {'enviadas': 0, 'fallidas': 0, 'descartadas': 0}
+
+        lote = NotificacionService._reservar_lote(tamano_lote)
+        if not lote:
+            return resultados
+
+        enviadas = []
+        conexion = get_connection(fail_silently=False)
+        try:
+            conexion.open()
+            for notificacion in lote:
+                email = EmailMessage(
+                    subject=notificacion.asunto,
+                    body=notificacion.mensaje,
+                    to=[notificacion.destinatario],
+                    connection=conexion
+                )
+                try:
+                    conexion.send_messages([email])
+                    enviadas.append(notificacion.id)
+                except Exception as e:
+                    NotificacionService._registrar_fallo(notificacion, e, resultados)
+        except Exception as e:
+            # No se pudo abrir la conexión: todo el lote se reprograma
+            logger.warning(f'No se pudo conectar con el servidor de email: {str(e)}')
+            for notificacion in lote:
+                if notificacion.id not in enviadas:
+                    NotificacionService._registrar_fallo(notificacion, e, resultados)
+        finally:
+            try:
+                conexion.close()
+            except Exception:
+                pass
+
+        if enviadas:
+            Notificacion.objects.filter(id__in=enviadas).update(
+                estado='ENVIADA',
+                fecha_envio=timezone.now(),
+                ultimo_error=None
+            )
+            resultados['enviadas'] = len(enviadas)
+
+        logger.info(f'Notificaciones procesadas: {resultados}')
+        return resultados
+
+    @staticmethod
+    def _registrar_fallo(notificacion, error, resultados):
+        notificacion.intentos += 1
+        notificacion.ultimo_error = str(error)
+        if notificacion.intentos >= settings.NOTIFICACIONES_MAX_INTENTOS:
+            notificacion.estado = 'ERROR'
+            resultados['descartadas'] += 1
+            logger.error(f'Notificación {notificacion.id} descartada tras {notificacion.intentos} intentos: {str(error)}')
+        else:
+            notificacion.proximo_intento = timezone.now() + NotificacionService.calcular_espera(notificacion.intentos)
+            resultados['fallidas'] += 1
+            logger.warning(f'Error al enviar notificación {notificacion.id} (intento {notificacion.intentos}): {str(error)}')
+        notificacion.save(update_fields=['intentos', 'ultimo_error', 'estado', 'proximo_intento'])
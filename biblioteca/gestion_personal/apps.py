@@ -4,3 +4,5 @@ class GestionPersonalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestion_personal'
 
+    def ready(self):
+        from . import signals  # noqa: F401
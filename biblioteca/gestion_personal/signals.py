@@ -0,0 +1,25 @@
+"""
+Invalidación del tipo de usuario cacheado (context_processors.user_type) cuando
+cambia o se borra un registro de personal, o cambia el usuario (is_staff).
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from biblioteca import cache
+
+from .models import Personal
+
+
+@receiver([post_save, post_delete], sender=Personal, dispatch_uid='gestion_personal.invalidar_user_type')
+def invalidar_user_type(sender, instance, **kwargs):
+    if instance.user_id:
+        cache.invalidar(f'usuario:{instance.user_id}')
+
+
+@receiver(post_save, sender=User, dispatch_uid='gestion_personal.invalidar_user_type_usuario')
+def invalidar_user_type_usuario(sender, instance, update_fields=None, **kwargs):
+    # El login solo actualiza last_login, que no cambia el tipo de usuario
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    cache.invalidar(f'usuario:{instance.id}')
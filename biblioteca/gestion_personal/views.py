@@ -1,5 +1,4 @@
 from django.shortcuts import render
-from django.utils import timezone
 from biblioteca.decorators import es_personal_required
 from gestion_libros.models import Libro, Ejemplar
 from gestion_socios.models import Socio
@@ -13,14 +12,11 @@ def dashboard_personal(request):
     total_ejemplares = Ejemplar.objects.count()
     total_socios = Socio.objects.count()
     
-    # Préstamos activos (estado PENDIENTE)
-    prestamos_activos = Prestamo.objects.filter(estado='PENDIENTE').count()
+    # Préstamos activos (sin devolver, vencidos o no)
+    prestamos_activos = Prestamo.objects.filter(estado__in=Prestamo.ESTADOS_ACTIVOS).count()
     
-    # Préstamos vencidos (estado VENCIDO o pendientes con fecha vencida)
-    prestamos_vencidos = Prestamo.objects.filter(
-        estado='PENDIENTE',
-        fecha_devolucion_esperada__lt=timezone.now().date()
-    ).count()
+    # Préstamos vencidos, marcados por el comando marcar_vencidos
+    prestamos_vencidos = Prestamo.objects.filter(estado='VENCIDO').count()
     
     # Últimos 5 préstamos
     ultimos_prestamos = Prestamo.objects.select_related(
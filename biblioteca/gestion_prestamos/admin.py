@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Prestamo, Reserva
+from .models import Prestamo, PrestamoArchivado, Reserva, ArchivadoPrestamos, BarridoVencidos
 
 
 @admin.register(Prestamo)
@@ -12,10 +12,41 @@ class PrestamoAdmin(admin.ModelAdmin):
     readonly_fields = ('fecha_prestamo',)
 
 
+@admin.register(PrestamoArchivado)
+class PrestamoArchivadoAdmin(admin.ModelAdmin):
+    list_display = ('ejemplar', 'socio', 'fecha_prestamo', 'fecha_devolucion_real', 'fecha_archivado')
+    search_fields = ('ejemplar__libro__titulo', 'ejemplar__codigo', 'socio__nombre', 'socio__apellido', 'socio__identificacion')
+    ordering = ('-fecha_prestamo',)
+    date_hierarchy = 'fecha_prestamo'
+    list_select_related = ('ejemplar__libro', 'socio')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Reserva)
 class ReservaAdmin(admin.ModelAdmin):
-    list_display = ('libro', 'socio', 'fecha_reserva', 'estado')
+    list_display = ('libro', 'socio', 'fecha_reserva', 'estado', 'ejemplar', 'fecha_vencimiento')
     list_filter = ('estado', 'fecha_reserva')
     search_fields = ('libro__titulo', 'socio__nombre', 'socio__apellido')
     ordering = ('-fecha_reserva',)
     date_hierarchy = 'fecha_reserva'
+
+
+@admin.register(BarridoVencidos)
+class BarridoVencidosAdmin(admin.ModelAdmin):
+    list_display = ('fecha_inicio', 'fecha_corte', 'marcados', 'lotes', 'tamano_lote', 'duracion_ms')
+    ordering = ('-fecha_inicio',)
+    date_hierarchy = 'fecha_inicio'
+    readonly_fields = ('fecha_inicio', 'fecha_fin', 'fecha_corte', 'marcados', 'lotes', 'tamano_lote', 'duracion_ms')
+
+
+@admin.register(ArchivadoPrestamos)
+class ArchivadoPrestamosAdmin(admin.ModelAdmin):
+    list_display = ('fecha_inicio', 'fecha_corte', 'archivados', 'lotes', 'tamano_lote', 'duracion_ms')
+    ordering = ('-fecha_inicio',)
+    date_hierarchy = 'fecha_inicio'
+    readonly_fields = ('fecha_inicio', 'fecha_fin', 'fecha_corte', 'archivados', 'lotes', 'tamano_lote', 'duracion_ms')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GestionPrestamosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestion_prestamos'
+
+    def ready(self):
+        from . import signals  # noqa: F401
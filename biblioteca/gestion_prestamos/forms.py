@@ -1,9 +1,27 @@
 from django import forms
-from .models import Prestamo
+from .models import Prestamo, Reserva
 from gestion_socios.models import Socio
 from gestion_libros.models import Ejemplar
 from django.utils import timezone
 from datetime import timedelta
+import re
+
+
+def validar_fecha_devolucion(fecha_devolucion):
+    """Valida que la fecha de devolución esté entre hoy y 90 días en el futuro."""
+    hoy = timezone.now().date()
+    
+    if fecha_devolucion:
+        if fecha_devolucion < hoy:
+            raise forms.ValidationError('La fecha de devolución no puede ser anterior a hoy')
+        
+        # Validar que no sea más de 90 días en el futuro
+        fecha_maxima = hoy + timedelta(days=90)
+        if fecha_devolucion > fecha_maxima:
+            raise forms.ValidationError('La fecha de devolución no puede ser más de 90 días en el futuro')
+    
+    return fecha_devolucion
+
 
 class PrestamoForm(forms.ModelForm):
     class Meta:
@@ -37,8 +55,10 @@ class PrestamoForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Filtrar solo socios activos
         self.fields['socio'].queryset = Socio.objects.filter(activo=True).order_by('apellido', 'nombre')
-        # Filtrar solo ejemplares disponibles
-        self.fields['ejemplar'].queryset = Ejemplar.objects.filter(estado='DISPONIBLE').select_related('libro').order_by('libro__titulo', 'codigo')
+        # Filtrar ejemplares disponibles o apartados por una reserva (se valida el socio en clean)
+        self.fields['ejemplar'].queryset = Ejemplar.objects.filter(
+            estado__in=['DISPONIBLE', 'RESERVADO']
+        ).select_related('libro').order_by('libro__titulo', 'codigo')
         
         # Establecer fecha mínima (hoy)
         hoy = timezone.now().date()
@@ -49,19 +69,19 @@ class PrestamoForm(forms.ModelForm):
             self.fields['socio'].widget.attrs['disabled'] = True
             self.fields['socio'].help_text = 'No hay socios activos disponibles'
         
-        if not Ejemplar.objects.filter(estado='DISPONIBLE').exists():
+        if not Ejemplar.objects.filter(estado__in=['DISPONIBLE', 'RESERVADO']).exists():
             self.fields['ejemplar'].widget.attrs['disabled'] = True
             self.fields['ejemplar'].help_text = 'No hay ejemplares disponibles'
 
     def clean_ejemplar(self):
         ejemplar = self.cleaned_data.get('ejemplar')
         if ejemplar:
-            if ejemplar.estado != 'DISPONIBLE':
+            if ejemplar.estado not in ('DISPONIBLE', 'RESERVADO'):
                 raise forms.ValidationError('Este ejemplar no está disponible para préstamo')
             # Verificar si el ejemplar ya tiene un préstamo pendiente
             prestamo_pendiente = Prestamo.objects.filter(
                 ejemplar=ejemplar,
-                estado='PENDIENTE'
+                estado__in=Prestamo.ESTADOS_ACTIVOS
             ).exists()
             if prestamo_pendiente:
                 raise forms.ValidationError('Este ejemplar ya tiene un préstamo pendiente')
@@ -81,47 +101,74 @@ class PrestamoForm(forms.ModelForm):
         return socio
 
     def clean_fecha_devolucion_esperada(self):
-        fecha_devolucion = self.cleaned_data.get('fecha_devolucion_esperada')
-        hoy = timezone.now().date()
-        
-        if fecha_devolucion:
-            if fecha_devolucion < hoy:
-                raise forms.ValidationError('La fecha de devolución no puede ser anterior a hoy')
-            
-            # Validar que no sea más de 90 días en el futuro
-            fecha_maxima = hoy + timedelta(days=90)
-            if fecha_devolucion > fecha_maxima:
-                raise forms.ValidationError('La fecha de devolución no puede ser más de 90 días en el futuro')
-        
-        return fecha_devolucion
+        return validar_fecha_devolucion(self.cleaned_data.get('fecha_devolucion_esperada'))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        socio = cleaned_data.get('socio')
+        ejemplar = cleaned_data.get('ejemplar')
+        if socio and ejemplar and ejemplar.estado == 'RESERVADO':
+            apartado_para_socio = Reserva.objects.filter(
+                ejemplar=ejemplar,
+                socio=socio,
+                estado='NOTIFICADA'
+            ).exists()
+            if not apartado_para_socio:
+                self.add_error('ejemplar', 'Este ejemplar está apartado para otro socio')
+        return cleaned_data
 
     def save(self, commit=True):
-        from django.db import transaction
-        
         prestamo = super().save(commit=False)
         if commit:
-            with transaction.atomic():
-                # Verificar nuevamente que el ejemplar esté disponible (evitar race condition)
-                ejemplar_actualizado = Ejemplar.objects.select_for_update().filter(
-                    id=prestamo.ejemplar.id,
-                    estado='DISPONIBLE'
-                ).first()
-                
-                if not ejemplar_actualizado:
-                    raise ValueError('El ejemplar ya no está disponible')
-                
-                # Verificar que no haya préstamo pendiente
-                prestamo_pendiente = Prestamo.objects.filter(
-                    ejemplar=ejemplar_actualizado,
-                    estado='PENDIENTE'
-                ).exists()
-                
-                if prestamo_pendiente:
-                    raise ValueError('El ejemplar ya tiene un préstamo pendiente')
-                
-                # Marcar el ejemplar como prestado
-                ejemplar_actualizado.estado = 'PRESTADO'
-                ejemplar_actualizado.save(update_fields=['estado'])
-                prestamo.ejemplar = ejemplar_actualizado
-                prestamo.save()
+            # Verifica nuevamente la disponibilidad bajo bloqueo (evitar race condition)
+            from gestion_prestamos.services import PrestamoService
+            prestamo = PrestamoService.crear_prestamo_seguro(
+                socio=prestamo.socio,
+                ejemplar=prestamo.ejemplar,
+                fecha_devolucion_esperada=prestamo.fecha_devolucion_esperada,
+                observaciones=prestamo.observaciones
+            )
+            self.instance = prestamo
         return prestamo
+
+
+class LoteDevolucionForm(forms.Form):
+    """Formulario para registrar devoluciones en lote a partir de códigos de ejemplar."""
+    MAXIMO_CODIGOS = 200
+
+    codigos = forms.CharField(
+        label='Códigos de ejemplar',
+        help_text='Escaneá o pegá los códigos, uno por línea (también se aceptan comas o espacios)',
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 10,
+            'autofocus': True,
+            'placeholder': 'Un código por línea'
+        })
+    )
+
+    def clean_codigos(self):
+        codigos = [c for c in re.split(r'[\s,;]+', self.cleaned_data.get('codigos', '')) if c]
+        if not codigos:
+            raise forms.ValidationError('Ingresá al menos un código de ejemplar')
+        if len(codigos) > self.MAXIMO_CODIGOS:
+            raise forms.ValidationError(f'No se pueden procesar más de {self.MAXIMO_CODIGOS} códigos a la vez')
+        return codigos
+
+
+class LotePrestamoForm(LoteDevolucionForm):
+    """Formulario para registrar préstamos en lote de varios ejemplares a un socio."""
+    socio = forms.ModelChoiceField(
+        queryset=Socio.objects.filter(activo=True).order_by('apellido', 'nombre'),
+        label='Socio',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    fecha_devolucion_esperada = forms.DateField(
+        label='Fecha de Devolución Esperada',
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
+    )
+
+    field_order = ['socio', 'fecha_devolucion_esperada', 'codigos']
+
+    def clean_fecha_devolucion_esperada(self):
+        return validar_fecha_devolucion(self.cleaned_data.get('fecha_devolucion_esperada'))
@@ -0,0 +1,51 @@
+"""
+Comando de Django para mover los préstamos devueltos antiguos a la tabla de archivo.
+Uso: python manage.py archivar_prestamos [--dias N] [--lote N] [--pausa SEG]
+
+Archiva los préstamos DEVUELTO hace más de --dias (default: PRESTAMOS_ARCHIVO_DIAS).
+Cada lote se mueve en su propia transacción: si se interrumpe, basta con volver a
+ejecutarlo. Pensado para cron (por ejemplo, una vez por semana fuera de horario).
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from gestion_prestamos.services import PrestamoService
+
+
+class Command(BaseCommand):
+    help = 'Mueve a la tabla de archivo los préstamos devueltos hace más de N días'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=settings.PRESTAMOS_ARCHIVO_DIAS,
+            help=f'Antigüedad mínima de la devolución en días (default: {settings.PRESTAMOS_ARCHIVO_DIAS})',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Cantidad de préstamos movidos por transacción (default: 1000)',
+        )
+        parser.add_argument(
+            '--pausa',
+            type=float,
+            default=0,
+            help='Segundos de espera entre lotes para no saturar la base (default: 0)',
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] <= 0:
+            raise CommandError('El tamaño de lote debe ser mayor a 0.')
+        if options['dias'] < 0:
+            raise CommandError('La cantidad de días no puede ser negativa.')
+
+        archivado = PrestamoService.archivar_devueltos(
+            dias=options['dias'],
+            tamano_lote=options['lote'],
+            pausa=options['pausa']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Préstamos archivados: {archivado.archivados} devueltos antes del '
+            f'{archivado.fecha_corte.strftime("%d/%m/%Y")} ({archivado.lotes} lotes, {archivado.duracion_ms} ms)'
+        ))
@@ -0,0 +1,122 @@
+"""
+Comando de Django para ejecutar la suite de micro-benchmarks.
+Uso: python manage.py benchmark [--escalas chica,media] [--casos nombre,...]
+                                [--repeticiones N] [--guardar] [--comparar] [--umbral 0.25]
+
+Crea una base de prueba (nunca toca la base configurada), la puebla con generar_datos
+para cada escala y mide cada caso registrado en biblioteca.benchmarks: mediana, p95 y
+consultas SQL. Con --guardar escribe la línea base JSON; con --comparar termina con
+error si algún caso empeora más que el umbral o ejecuta más consultas que la base.
+"""
+import json
+import logging
+import platform
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from biblioteca.benchmarks import BENCHMARKS, ESCALAS, comparar, ejecutar_caso
+
+BASE_DEFAULT = Path(settings.BASE_DIR) / 'biblioteca' / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta los micro-benchmarks de servicios y los compara contra una línea base'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escalas',
+            type=str,
+            default='chica,media',
+            help=f'Escalas a medir, separadas por coma ({", ".join(ESCALAS)}; default: chica,media)',
+        )
+        parser.add_argument('--casos', type=str, default=None, help='Casos a medir (default: todos)')
+        parser.add_argument('--repeticiones', type=int, default=20, help='Repeticiones por caso (default: 20)')
+        parser.add_argument('--base', type=str, default=str(BASE_DEFAULT), help='Archivo JSON de la línea base')
+        parser.add_argument('--guardar', action='store_true', help='Guardar los resultados como nueva línea base')
+        parser.add_argument('--comparar', action='store_true', help='Fallar si hay regresiones respecto de la base')
+        parser.add_argument(
+            '--umbral',
+            type=float,
+            default=0.25,
+            help='Aumento relativo de la mediana tolerado al comparar (default: 0.25 = 25%%)',
+        )
+
+    def handle(self, *args, **options):
+        escalas = [e.strip() for e in options['escalas'].split(',') if e.strip()]
+        desconocidas = [e for e in escalas if e not in ESCALAS]
+        if desconocidas:
+            raise CommandError(f'Escalas desconocidas: {", ".join(desconocidas)}')
+
+        casos = list(BENCHMARKS)
+        if options['casos']:
+            casos = [c.strip() for c in options['casos'].split(',')]
+            desconocidos = [c for c in casos if c not in BENCHMARKS]
+            if desconocidos:
+                raise CommandError(f'Casos desconocidos: {", ".join(desconocidos)}')
+
+        ruta_base = Path(options['base'])
+        base = None
+        if options['comparar']:
+            if not ruta_base.exists():
+                raise CommandError(f'No existe la línea base {ruta_base}. Generala con --guardar.')
+            base = json.loads(ruta_base.read_text(encoding='utf-8'))['resultados']
+
+        resultados = self._medir(escalas, casos, options['repeticiones'])
+
+        if options['guardar']:
+            ruta_base.parent.mkdir(parents=True, exist_ok=True)
+            ruta_base.write_text(json.dumps({
+                'fecha': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'base_de_datos': connection.vendor,
+                'repeticiones': options['repeticiones'],
+                'resultados': resultados,
+            }, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f'Línea base guardada en {ruta_base}'))
+
+        if base is not None:
+            regresiones = comparar(resultados, base, options['umbral'])
+            if regresiones:
+                for regresion in regresiones:
+                    self.stdout.write(self.style.ERROR(f'  {regresion}'))
+                raise CommandError(f'{len(regresiones)} regresiones respecto de la línea base')
+            self.stdout.write(self.style.SUCCESS('Sin regresiones respecto de la línea base'))
+
+    def _medir(self, escalas, casos, repeticiones):
+        """Crea la base de prueba, la puebla para cada escala y mide los casos."""
+        setup_test_environment()
+        nombre_original = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        nivel_logging = logging.root.manager.disable
+        # Los servicios loguean cada operación; se silencian para no medir el I/O del log
+        logging.disable(logging.WARNING)
+        try:
+            resultados = {}
+            for escala in escalas:
+                self.stdout.write(f'Escala {escala}: generando datos...')
+                call_command('flush', interactive=False, verbosity=0)
+                call_command('generar_datos', semilla=1, stdout=StringIO(), **ESCALAS[escala])
+
+                contexto = {'escala': escala, 'factory': RequestFactory()}
+                resultados[escala] = {}
+                for nombre in casos:
+                    medicion = ejecutar_caso(BENCHMARKS[nombre], contexto, repeticiones=repeticiones)
+                    resultados[escala][nombre] = medicion
+                    self.stdout.write(
+                        f'  {nombre:<40} mediana {medicion["mediana_ms"]:>9.3f} ms  '
+                        f'p95 {medicion["p95_ms"]:>9.3f} ms  {medicion["consultas"]:>3} consultas'
+                    )
+            return resultados
+        finally:
+            logging.disable(nivel_logging)
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+            teardown_test_environment()
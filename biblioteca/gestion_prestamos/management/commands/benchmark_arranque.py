@@ -0,0 +1,55 @@
+"""
+Comando de Django para medir el arranque de un worker.
+Uso: python manage.py benchmark_arranque [--repeticiones N] [--precargar modulo,...]
+
+Lanza procesos nuevos que cargan la aplicación WSGI y atienden GET /, y reporta la
+mediana del tiempo hasta la primera respuesta y de la memoria residente (RSS).
+Se compara contra el mismo arranque con los módulos de --precargar importados de
+antemano (por defecto pandas y openpyxl, como ocurría al importar los importadores
+al cargar las vistas).
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from biblioteca.benchmarks.arranque import medir_arranque
+
+
+class Command(BaseCommand):
+    help = 'Mide el tiempo hasta la primera request y la memoria de un worker nuevo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=5, help='Procesos a lanzar por variante (default: 5)')
+        parser.add_argument(
+            '--precargar',
+            type=str,
+            default='pandas,openpyxl',
+            help='Módulos para la variante de comparación (default: pandas,openpyxl; vacío para omitirla)',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] <= 0:
+            raise CommandError('La cantidad de repeticiones debe ser mayor a 0.')
+
+        variantes = [('actual', [])]
+        precargar = [m.strip() for m in options['precargar'].split(',') if m.strip()]
+        if precargar:
+            variantes.append((f'con {", ".join(precargar)}', precargar))
+
+        resultados = {}
+        for nombre, modulos in variantes:
+            try:
+                resultados[nombre] = medir_arranque(options['repeticiones'], modulos)
+            except Exception as e:
+                raise CommandError(f'No se pudo medir la variante "{nombre}": {str(e)}')
+            r = resultados[nombre]
+            self.stdout.write(
+                f'{nombre:<28} primera request {r["segundos"] * 1000:>8.0f} ms   '
+                f'RSS {r["rss_mb"]:>7.1f} MB   {r["modulos"]:>5} módulos   '
+                f'pandas {"sí" if r["pandas_cargado"] else "no"}   ({r["estado"]})'
+            )
+
+        if len(resultados) == 2:
+            actual, comparacion = resultados.values()
+            self.stdout.write(self.style.SUCCESS(
+                f'Diferencia: {(comparacion["segundos"] - actual["segundos"]) * 1000:.0f} ms y '
+                f'{comparacion["rss_mb"] - actual["rss_mb"]:.1f} MB por worker'
+            ))
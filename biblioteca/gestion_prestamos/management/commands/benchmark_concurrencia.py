@@ -0,0 +1,68 @@
+"""
+Comando de Django para medir escrituras concurrentes sobre SQLite.
+Uso: python manage.py benchmark_concurrencia [--variantes anterior,pragmas,completo]
+                                             [--procesos N] [--operaciones N] [--importaciones N]
+
+Crea una base SQLite temporal (no toca la configurada) y, para cada variante de
+biblioteca.benchmarks.concurrencia, lanza procesos que prestan y devuelven ejemplares
+mientras otro ejecuta transacciones largas de importación. Reporta operaciones por
+segundo, latencias y errores "database is locked".
+"""
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biblioteca.benchmarks.concurrencia import VARIANTES, medir_variante, preparar_base
+
+
+class Command(BaseCommand):
+    help = 'Compara bloqueos y throughput de SQLite con y sin WAL y BEGIN IMMEDIATE'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--variantes',
+            type=str,
+            default=','.join(VARIANTES),
+            help=f'Variantes a medir, separadas por coma (default: {",".join(VARIANTES)})',
+        )
+        parser.add_argument('--procesos', type=int, default=4, help='Procesos que prestan en paralelo (default: 4)')
+        parser.add_argument('--operaciones', type=int, default=50, help='Préstamos por proceso (default: 50)')
+        parser.add_argument(
+            '--importaciones',
+            type=int,
+            default=10,
+            help='Transacciones largas de importación concurrentes (default: 10)',
+        )
+
+    def handle(self, *args, **options):
+        variantes = [v.strip() for v in options['variantes'].split(',') if v.strip()]
+        desconocidas = [v for v in variantes if v not in VARIANTES]
+        if desconocidas:
+            raise CommandError(f'Variantes desconocidas: {", ".join(desconocidas)}')
+        if min(options['procesos'], options['operaciones']) <= 0 or options['importaciones'] < 0:
+            raise CommandError('Procesos y operaciones deben ser mayores a 0.')
+
+        with tempfile.TemporaryDirectory(prefix='bibliotech-concurrencia-') as directorio:
+            self.stdout.write('Preparando base SQLite temporal...')
+            base = preparar_base(
+                directorio,
+                socios=options['procesos'],
+                ejemplares=options['procesos'] * options['operaciones'] * 2,
+            )
+
+            for nombre in variantes:
+                try:
+                    r = medir_variante(
+                        nombre, base,
+                        procesos=options['procesos'],
+                        operaciones=options['operaciones'],
+                        importaciones=options['importaciones'],
+                    )
+                except Exception as e:
+                    raise CommandError(f'No se pudo medir la variante "{nombre}": {str(e)}')
+                self.stdout.write(
+                    f'{nombre:<10} {r["operaciones"]:>5} ok  {r["bloqueos"]:>4} bloqueos  '
+                    f'{r["operaciones_por_segundo"]:>7.1f} op/s  p50 {r["p50_ms"] or 0:>7.1f} ms  '
+                    f'p95 {r["p95_ms"] or 0:>7.1f} ms  importaciones {r["importaciones_ok"]} ok / '
+                    f'{r["importaciones_bloqueadas"]} bloqueadas'
+                )
@@ -0,0 +1,168 @@
+"""
+Comando de Django para comparar el throughput de los perfiles de servidor.
+Uso: python manage.py benchmark_servidor [--perfiles anterior,produccion,asgi_sync,asgi]
+                                         [--mezcla general|socio] [--solicitudes N]
+                                         [--concurrencia N] [--json RUTA]
+
+Levanta gunicorn con cada perfil de biblioteca.benchmarks.servidor (el Procfile original
+y gunicorn.conf.py en modo WSGI y ASGI, este último con las vistas del socio sync o
+async) sobre la base configurada, que debe estar poblada con generar_datos, y le envía
+una mezcla de requests de solo lectura. La mezcla general tiene home, búsqueda de socio
+y listado de préstamos del personal; la mezcla socio tiene las vistas que tienen versión
+async (búsqueda, dashboard, mis préstamos y mis reservas) repartidas entre varios socios.
+"""
+import json
+import random
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from biblioteca.benchmarks.servidor import PERFILES, medir_perfil, perfil_disponible
+from gestion_libros.models import Libro
+from gestion_socios.models import Socio
+
+USUARIO_PERSONAL = 'benchmark_servidor'
+
+
+class Command(BaseCommand):
+    help = 'Compara requests por segundo y latencias de los perfiles de gunicorn'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--perfiles',
+            type=str,
+            default=','.join(PERFILES),
+            help=f'Perfiles a medir, separados por coma (default: {",".join(PERFILES)})',
+        )
+        parser.add_argument(
+            '--mezcla',
+            choices=['general', 'socio'],
+            default='general',
+            help='Requests a enviar (default: general)',
+        )
+        parser.add_argument('--solicitudes', type=int, default=600, help='Requests por perfil (default: 600)')
+        parser.add_argument('--concurrencia', type=int, default=8, help='Clientes simultáneos (default: 8)')
+        parser.add_argument('--semilla', type=int, default=1, help='Semilla de la mezcla de requests (default: 1)')
+        parser.add_argument('--json', type=str, default=None, help='Guardar el reporte en un archivo JSON')
+
+    def handle(self, *args, **options):
+        perfiles = [p.strip() for p in options['perfiles'].split(',') if p.strip()]
+        desconocidos = [p for p in perfiles if p not in PERFILES]
+        if desconocidos:
+            raise CommandError(f'Perfiles desconocidos: {", ".join(desconocidos)}')
+        if options['solicitudes'] <= 0 or options['concurrencia'] <= 0:
+            raise CommandError('La cantidad de solicitudes y la concurrencia deben ser mayores a 0.')
+
+        azar = random.Random(options['semilla'])
+        if options['mezcla'] == 'socio':
+            peticiones = self._armar_peticiones_socio(options['solicitudes'], azar)
+        else:
+            peticiones = self._armar_peticiones(options['solicitudes'], azar)
+
+        reporte = {}
+        for nombre in perfiles:
+            if not perfil_disponible(nombre):
+                self.stdout.write(self.style.WARNING(
+                    f'{nombre:<12} omitido: falta el paquete {PERFILES[nombre]["requiere"]}'
+                ))
+                continue
+            try:
+                resultado = medir_perfil(nombre, peticiones, concurrencia=options['concurrencia'])
+            except Exception as e:
+                raise CommandError(f'No se pudo medir el perfil "{nombre}": {str(e)}')
+            reporte[nombre] = resultado
+            self.stdout.write(
+                f'{nombre:<12} {resultado["requests_por_segundo"]:>8.1f} req/s   '
+                f'p50 {resultado["p50_ms"]:>7.1f} ms   p95 {resultado["p95_ms"]:>7.1f} ms   '
+                f'{resultado["errores"]} errores'
+            )
+
+        if 'anterior' in reporte:
+            base = reporte['anterior']['requests_por_segundo']
+            for nombre, resultado in reporte.items():
+                if nombre != 'anterior':
+                    self.stdout.write(self.style.SUCCESS(
+                        f'{nombre}: {resultado["requests_por_segundo"] / base:.2f}x respecto de anterior'
+                    ))
+
+        if 'asgi' in reporte and 'asgi_sync' in reporte:
+            self.stdout.write(self.style.SUCCESS(
+                f'vistas async: {reporte["asgi"]["requests_por_segundo"] / reporte["asgi_sync"]["requests_por_segundo"]:.2f}x '
+                f'respecto de las sync bajo ASGI'
+            ))
+
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as archivo:
+                json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+            self.stdout.write(f'Reporte guardado en {options["json"]}')
+
+    def _cookie(self, user):
+        """Crea una sesión en la base para user y retorna el header Cookie."""
+        cliente = Client()
+        cliente.force_login(user)
+        return f'{settings.SESSION_COOKIE_NAME}={cliente.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    def _palabras(self):
+        """Primeras palabras de títulos al azar, para las búsquedas."""
+        return [
+            titulo.split()[0] for titulo in
+            Libro.objects.order_by('?').values_list('titulo', flat=True)[:100] if titulo
+        ] or ['a']
+
+    def _armar_peticiones(self, cantidad, azar):
+        """Arma la secuencia de (path, cookie) que se repite igual para cada perfil."""
+        socio = Socio.objects.filter(activo=True, user__isnull=False, user__is_active=True).select_related('user').first()
+        if not socio:
+            raise CommandError('No hay socios activos con usuario. Ejecutá primero generar_datos.')
+        personal, _ = User.objects.get_or_create(
+            username=USUARIO_PERSONAL,
+            defaults={'is_staff': True, 'first_name': 'Benchmark', 'last_name': 'Servidor'}
+        )
+        cookie_socio = self._cookie(socio.user)
+        cookie_personal = self._cookie(personal)
+
+        palabras = self._palabras()
+        buscar = reverse('socios:buscar_libros')
+        listar = reverse('gestion_prestamos:listar_prestamos')
+
+        peticiones = []
+        for _ in range(cantidad):
+            tipo = azar.random()
+            if tipo < 0.2:
+                peticiones.append((reverse('home'), None))
+            elif tipo < 0.6:
+                peticiones.append((f'{buscar}?{urlencode({"titulo": azar.choice(palabras)})}', cookie_socio))
+            else:
+                peticiones.append((f'{listar}?page={azar.randint(1, 20)}', cookie_personal))
+        return peticiones
+
+    def _armar_peticiones_socio(self, cantidad, azar):
+        """Como _armar_peticiones, con las vistas del socio que tienen versión async."""
+        socios = list(
+            Socio.objects.filter(activo=True, user__isnull=False, user__is_active=True)
+            .select_related('user').order_by('id')[:10]
+        )
+        if not socios:
+            raise CommandError('No hay socios activos con usuario. Ejecutá primero generar_datos.')
+        cookies = [self._cookie(socio.user) for socio in socios]
+
+        palabras = self._palabras()
+        buscar = reverse('socios:buscar_libros')
+        vistas = [
+            reverse('gestion_socios:dashboard_socio'),
+            reverse('socios:mis_prestamos'),
+            reverse('socios:mis_reservas'),
+        ]
+
+        peticiones = []
+        for _ in range(cantidad):
+            cookie = azar.choice(cookies)
+            if azar.random() < 0.4:
+                peticiones.append((f'{buscar}?{urlencode({"titulo": azar.choice(palabras)})}', cookie))
+            else:
+                peticiones.append((azar.choice(vistas), cookie))
+        return peticiones
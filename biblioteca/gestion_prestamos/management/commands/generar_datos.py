@@ -0,0 +1,266 @@
+"""
+Comando de Django para poblar la base con datos de prueba realistas usando faker.
+Uso: python manage.py generar_datos [--autores N] [--libros N] [--ejemplares N]
+                                    [--socios N] [--prestamos N] [--lote N] [--semilla N]
+
+Pensado para dimensionar servidores y alimentar el comando prueba_carga. Los datos
+se insertan con bulk_create en lotes, un lote por transacción, y se agregan a los
+existentes (los códigos, ISBN e identificaciones se numeran a partir del último id).
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from gestion_autores.models import Autor
+from gestion_libros import isbn
+from gestion_libros.models import Libro, Ejemplar
+from gestion_libros.services import LibroService
+from gestion_prestamos.models import Prestamo
+from gestion_socios.models import Socio
+
+GENEROS = [
+    'Novela', 'Cuento', 'Poesía', 'Ensayo', 'Ciencia ficción', 'Fantasía', 'Policial',
+    'Historia', 'Biografía', 'Infantil', 'Juvenil', 'Ciencias', 'Filosofía', 'Teatro',
+]
+
+# Distribuciones aproximadas de una biblioteca en funcionamiento
+ESTADOS_EJEMPLAR = [('DISPONIBLE', 90), ('REPARACION', 6), ('PERDIDO', 4)]
+PROPORCION_PRESTAMOS_ACTIVOS = 0.08
+PROPORCION_VENCIDOS = 0.25
+PROPORCION_SOCIOS_INACTIVOS = 0.05
+
+
+def _isbn13(numero):
+    """ISBN-13 válido con prefijo 979 a partir de un número correlativo."""
+    base = f'979{numero % 10 ** 9:09d}'
+    return f'{base}{isbn.digito_control_13(base)}'
+
+
+@contextmanager
+def _sin_auto_now_add(modelo, campo):
+    """Permite fijar a mano un campo auto_now_add durante la carga."""
+    field = modelo._meta.get_field(campo)
+    original = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = original
+
+
+class Command(BaseCommand):
+    help = 'Genera autores, libros, ejemplares, socios y préstamos de prueba con faker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--autores', type=int, default=2000, help='Autores a crear (default: 2000)')
+        parser.add_argument('--libros', type=int, default=10000, help='Libros a crear (default: 10000)')
+        parser.add_argument('--ejemplares', type=int, default=50000, help='Ejemplares a crear (default: 50000)')
+        parser.add_argument('--socios', type=int, default=5000, help='Socios a crear, cada uno con su usuario (default: 5000)')
+        parser.add_argument('--prestamos', type=int, default=200000, help='Préstamos a crear (default: 200000)')
+        parser.add_argument('--lote', type=int, default=5000, help='Filas por bulk_create (default: 5000)')
+        parser.add_argument('--semilla', type=int, default=None, help='Semilla para obtener siempre los mismos datos')
+        parser.add_argument('--locale', type=str, default='es_AR', help='Locale de faker (default: es_AR)')
+
+    def handle(self, *args, **options):
+        try:
+            from faker import Faker
+        except ImportError:
+            raise CommandError('Este comando requiere faker (pip install faker).')
+
+        self.lote = options['lote']
+        if self.lote <= 0:
+            raise CommandError('El tamaño de lote debe ser mayor a 0.')
+        for opcion in ('autores', 'libros', 'ejemplares', 'socios', 'prestamos'):
+            if options[opcion] < 0:
+                raise CommandError(f'--{opcion} no puede ser negativo.')
+
+        self.fake = Faker(options['locale'])
+        self.random = random.Random(options['semilla'])
+        if options['semilla'] is not None:
+            self.fake.seed_instance(options['semilla'])
+
+        inicio = time.perf_counter()
+        self._generar_autores(options['autores'])
+        self._generar_libros(options['libros'])
+        self._generar_ejemplares(options['ejemplares'])
+        self._generar_socios(options['socios'])
+        self._generar_prestamos(options['prestamos'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Datos generados en {time.perf_counter() - inicio:.1f} s'
+        ))
+
+    def _en_lotes(self, nombre, total, construir, modelo):
+        """Crea total objetos en lotes de self.lote, construyendo cada lote con construir(desde, hasta)."""
+        if not total:
+            return
+        inicio = time.perf_counter()
+        for desde in range(0, total, self.lote):
+            hasta = min(desde + self.lote, total)
+            with transaction.atomic():
+                modelo.objects.bulk_create(construir(desde, hasta), batch_size=self.lote)
+        self.stdout.write(f'{nombre}: {total} creados en {time.perf_counter() - inicio:.1f} s')
+
+    def _siguiente_id(self, modelo):
+        return (modelo.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+
+    def _generar_autores(self, total):
+        fake = self.fake
+
+        def construir(desde, hasta):
+            return [
+                Autor(
+                    nombre=fake.first_name()[:50],
+                    apellido=fake.last_name()[:50],
+                    nacionalidad=fake.country()[:50],
+                    fecha_nacimiento=fake.date_of_birth(minimum_age=25, maximum_age=95),
+                )
+                for _ in range(desde, hasta)
+            ]
+        self._en_lotes('Autores', total, construir, Autor)
+
+    def _generar_libros(self, total):
+        if not total:
+            return
+        fake, rnd = self.fake, self.random
+        autores = list(Autor.objects.values_list('id', flat=True))
+        if not autores:
+            raise CommandError('No hay autores: generá autores antes que libros.')
+        # Pocos autores concentran muchos títulos, como en un catálogo real
+        pesos = [1 / (i + 1) for i in range(len(autores))]
+        base = self._siguiente_id(Libro)
+
+        def construir(desde, hasta):
+            elegidos = rnd.choices(autores, weights=pesos, k=hasta - desde)
+            return [
+                Libro(
+                    titulo=fake.sentence(nb_words=rnd.randint(1, 6)).rstrip('.')[:200],
+                    autor_id=autor_id,
+                    isbn=_isbn13(base + n),
+                    editorial=fake.company()[:100],
+                    fecha_publicacion=fake.date_between(start_date='-80y', end_date='today'),
+                    numero_paginas=rnd.randint(60, 900),
+                    genero=rnd.choice(GENEROS),
+                )
+                for n, autor_id in zip(range(desde, hasta), elegidos)
+            ]
+        self._en_lotes('Libros', total, construir, Libro)
+
+    def _generar_ejemplares(self, total):
+        if not total:
+            return
+        rnd = self.random
+        libros = list(Libro.objects.values_list('id', flat=True))
+        if not libros:
+            raise CommandError('No hay libros: generá libros antes que ejemplares.')
+        estados, pesos = zip(*ESTADOS_EJEMPLAR)
+        base = self._siguiente_id(Ejemplar)
+
+        def construir(desde, hasta):
+            return [
+                Ejemplar(
+                    libro_id=rnd.choice(libros),
+                    codigo=f'GEN-{base + n:08d}',
+                    estado=rnd.choices(estados, weights=pesos)[0],
+                    ubicacion=f'Estante {rnd.randint(1, 200)}-{rnd.choice("ABCDEF")}',
+                )
+                for n in range(desde, hasta)
+            ]
+        self._en_lotes('Ejemplares', total, construir, Ejemplar)
+
+    def _generar_socios(self, total):
+        if not total:
+            return
+        fake, rnd = self.fake, self.random
+        base = max(self._siguiente_id(Socio), self._siguiente_id(User))
+        inicio = time.perf_counter()
+        for desde in range(0, total, self.lote):
+            hasta = min(desde + self.lote, total)
+            datos = [(base + n, fake.first_name()[:50], fake.last_name()[:50]) for n in range(desde, hasta)]
+            with transaction.atomic():
+                usuarios = User.objects.bulk_create([
+                    User(
+                        username=f'socio{numero}',
+                        first_name=nombre,
+                        last_name=apellido,
+                        email=f'socio{numero}@example.com',
+                        password='!',  # contraseña inutilizable: solo para pruebas
+                    )
+                    for numero, nombre, apellido in datos
+                ], batch_size=self.lote)
+                Socio.objects.bulk_create([
+                    Socio(
+                        user=usuario,
+                        nombre=nombre,
+                        apellido=apellido,
+                        identificacion=f'G{numero:09d}',
+                        telefono=fake.phone_number()[:20],
+                        email=f'socio{numero}@example.com',
+                        activo=rnd.random() >= PROPORCION_SOCIOS_INACTIVOS,
+                    )
+                    for usuario, (numero, nombre, apellido) in zip(usuarios, datos)
+                ], batch_size=self.lote)
+        self.stdout.write(f'Socios: {total} creados en {time.perf_counter() - inicio:.1f} s')
+
+    def _generar_prestamos(self, total):
+        """
+        Genera el historial de préstamos: la mayoría devueltos y una fracción activa
+        (pendientes o vencidos), con a lo sumo un préstamo activo por ejemplar.
+        """
+        if not total:
+            return
+        rnd = self.random
+        socios = list(Socio.objects.filter(activo=True).values_list('id', flat=True))
+        ejemplares = list(Ejemplar.objects.filter(estado='DISPONIBLE').values_list('id', flat=True))
+        if not socios or not ejemplares:
+            raise CommandError('Se necesitan socios activos y ejemplares disponibles para generar préstamos.')
+
+        hoy = timezone.now().date()
+        rnd.shuffle(ejemplares)
+        activos = min(int(total * PROPORCION_PRESTAMOS_ACTIVOS), len(ejemplares) // 2, len(socios) * 3)
+        ejemplares_activos = ejemplares[:activos]
+        ejemplares_historicos = ejemplares[activos:]
+
+        def construir(desde, hasta):
+            prestamos = []
+            for n in range(desde, hasta):
+                if n < activos:
+                    vencido = rnd.random() < PROPORCION_VENCIDOS
+                    fecha_prestamo = hoy - timedelta(days=rnd.randint(31, 90) if vencido else rnd.randint(0, 29))
+                    prestamos.append(Prestamo(
+                        socio_id=socios[n % len(socios)],
+                        ejemplar_id=ejemplares_activos[n],
+                        fecha_prestamo=fecha_prestamo,
+                        fecha_devolucion_esperada=fecha_prestamo + timedelta(days=30),
+                        estado='VENCIDO' if vencido else 'PENDIENTE',
+                    ))
+                else:
+                    dias = rnd.randint(31, 5 * 365)
+                    fecha_prestamo = hoy - timedelta(days=dias)
+                    prestamos.append(Prestamo(
+                        socio_id=rnd.choice(socios),
+                        ejemplar_id=rnd.choice(ejemplares_historicos),
+                        fecha_prestamo=fecha_prestamo,
+                        fecha_devolucion_esperada=fecha_prestamo + timedelta(days=30),
+                        # Hasta 40 días después del préstamo, sin pasar de hoy
+                        fecha_devolucion_real=fecha_prestamo + timedelta(days=rnd.randint(1, min(40, dias))),
+                        estado='DEVUELTO',
+                    ))
+            return prestamos
+
+        with _sin_auto_now_add(Prestamo, 'fecha_prestamo'):
+            self._en_lotes('Préstamos', total, construir, Prestamo)
+
+        # Lotes chicos para no superar el límite de parámetros de SQLite
+        for desde in range(0, len(ejemplares_activos), 900):
+            Ejemplar.objects.filter(
+                id__in=ejemplares_activos[desde:desde + 900]
+            ).update(estado='PRESTADO')
+        self.stdout.write(f'Préstamos activos: {activos} (ejemplares marcados como prestados)')
+        LibroService.invalidar_catalogo()
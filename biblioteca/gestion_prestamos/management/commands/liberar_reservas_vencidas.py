@@ -0,0 +1,49 @@
+"""
+Comando de Django para liberar los ejemplares apartados cuyo plazo de retiro venció.
+Uso: python manage.py liberar_reservas_vencidas [--lote N] [--intervalo SEG]
+
+Cada reserva vencida pasa a EXPIRADA y su ejemplar se aparta para la siguiente
+reserva de la cola, o vuelve a quedar disponible.
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from gestion_prestamos.services import ReservaService
+
+
+class Command(BaseCommand):
+    help = 'Libera los ejemplares de reservas notificadas que no se retiraron a tiempo'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=200,
+            help='Cantidad de reservas procesadas por transacción (default: 200)',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=None,
+            help='Repetir cada N segundos en lugar de ejecutar una sola vez',
+        )
+
+    def handle(self, *args, **options):
+        tamano_lote = options['lote']
+        intervalo = options.get('intervalo')
+
+        if tamano_lote <= 0:
+            raise CommandError('El tamaño de lote debe ser mayor a 0.')
+
+        while True:
+            resultados = ReservaService.liberar_reservas_vencidas(tamano_lote=tamano_lote)
+            self.stdout.write(self.style.SUCCESS(
+                f"Reservas expiradas: {resultados['expiradas']}, "
+                f"ejemplares reasignados: {resultados['reasignadas']}"
+            ))
+
+            if not intervalo:
+                break
+            try:
+                time.sleep(intervalo)
+            except KeyboardInterrupt:
+                break
@@ -0,0 +1,59 @@
+"""
+Comando de Django para marcar como VENCIDO los préstamos con la devolución atrasada.
+Uso: python manage.py marcar_vencidos [--lote N] [--pausa SEG] [--intervalo SEG]
+
+Sin --intervalo ejecuta un único barrido (pensado para cron). Con --intervalo queda
+en un bucle que repite el barrido cada SEG segundos.
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from gestion_prestamos.services import PrestamoService
+
+
+class Command(BaseCommand):
+    help = 'Marca como vencidos los préstamos pendientes con fecha de devolución pasada'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=500,
+            help='Cantidad de préstamos actualizados por transacción (default: 500)',
+        )
+        parser.add_argument(
+            '--pausa',
+            type=float,
+            default=0,
+            help='Segundos de espera entre lotes para no saturar la base (default: 0)',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=None,
+            help='Repetir el barrido cada N segundos en lugar de ejecutarlo una vez',
+        )
+
+    def handle(self, *args, **options):
+        tamano_lote = options['lote']
+        pausa = options['pausa']
+        intervalo = options.get('intervalo')
+
+        if tamano_lote <= 0:
+            raise CommandError('El tamaño de lote debe ser mayor a 0.')
+
+        while True:
+            barrido = PrestamoService.actualizar_estados_vencidos(
+                tamano_lote=tamano_lote,
+                pausa=pausa
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'Préstamos marcados como vencidos: {barrido.marcados} '
+                f'({barrido.lotes} lotes, {barrido.duracion_ms} ms)'
+            ))
+
+            if not intervalo:
+                break
+            try:
+                time.sleep(intervalo)
+            except KeyboardInterrupt:
+                break
@@ -0,0 +1,233 @@
+"""
+Comando de Django para ejecutar una prueba de carga en proceso con el cliente de pruebas.
+Uso: python manage.py prueba_carga [--solicitudes N] [--mezcla buscar=40,listar=30,...]
+                                   [--usuarios N] [--calentamiento N] [--semilla N] [--json RUTA]
+
+Reproduce una carga mixta de socios y personal sobre la base configurada (usar una base
+de prueba poblada con generar_datos: solicitar y devolver modifican datos) y reporta
+por endpoint la latencia p50/p95/p99 y las consultas SQL por request.
+"""
+import json
+import math
+import random
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.test import Client
+from django.urls import reverse
+
+from biblioteca.middleware import ContadorConsultas
+from gestion_libros.models import Libro
+from gestion_prestamos.models import Prestamo
+from gestion_socios.models import Socio
+
+MEZCLA_DEFAULT = 'buscar=40,solicitar=10,listar=30,devolver=15,exportar=5'
+USUARIO_PERSONAL = 'prueba_carga'
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano sobre una lista ordenada."""
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores) - 1, math.ceil(p / 100 * len(valores)) - 1))
+    return valores[indice]
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta una prueba de carga en proceso y reporta latencias p50/p95/p99 por endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--solicitudes', type=int, default=500, help='Requests a medir (default: 500)')
+        parser.add_argument(
+            '--mezcla',
+            type=str,
+            default=MEZCLA_DEFAULT,
+            help=f'Pesos de cada escenario (default: {MEZCLA_DEFAULT})',
+        )
+        parser.add_argument('--usuarios', type=int, default=20, help='Socios simulados (default: 20)')
+        parser.add_argument(
+            '--calentamiento',
+            type=int,
+            default=2,
+            help='Requests por escenario que se ejecutan antes de medir (default: 2)',
+        )
+        parser.add_argument('--semilla', type=int, default=None, help='Semilla para repetir la misma secuencia')
+        parser.add_argument('--json', type=str, default=None, help='Guardar el reporte en un archivo JSON')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['semilla'])
+        escenarios = self._parsear_mezcla(options['mezcla'])
+        if options['solicitudes'] <= 0:
+            raise CommandError('La cantidad de solicitudes debe ser mayor a 0.')
+
+        self._preparar_clientes(options['usuarios'])
+
+        nombres = list(escenarios)
+        pesos = [escenarios[n] for n in nombres]
+        for nombre in nombres:
+            for _ in range(options['calentamiento']):
+                self._ejecutar(nombre)
+
+        muestras = defaultdict(list)
+        inicio = time.perf_counter()
+        for _ in range(options['solicitudes']):
+            nombre = self.random.choices(nombres, weights=pesos)[0]
+            resultado = self._ejecutar(nombre)
+            if resultado:
+                muestras[nombre].append(resultado)
+        total = time.perf_counter() - inicio
+
+        reporte = self._armar_reporte(muestras, total)
+        self._imprimir(reporte)
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as archivo:
+                json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+            self.stdout.write(f'Reporte guardado en {options["json"]}')
+
+    def _parsear_mezcla(self, texto):
+        escenarios = {}
+        for parte in texto.split(','):
+            nombre, _, peso = parte.partition('=')
+            nombre = nombre.strip()
+            if nombre not in self.ESCENARIOS:
+                raise CommandError(f'Escenario desconocido: {nombre}. Opciones: {", ".join(self.ESCENARIOS)}')
+            try:
+                escenarios[nombre] = float(peso)
+            except ValueError:
+                raise CommandError(f'Peso inválido para {nombre}: {peso!r}')
+        if not any(escenarios.values()):
+            raise CommandError('La mezcla debe tener al menos un escenario con peso mayor a 0.')
+        return escenarios
+
+    def _cliente(self):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and '*' not in h), 'localhost')
+        return Client(HTTP_HOST=host.lstrip('.'))
+
+    def _preparar_clientes(self, cantidad):
+        """Inicia sesión una única vez por usuario simulado."""
+        personal, _ = User.objects.get_or_create(
+            username=USUARIO_PERSONAL,
+            defaults={'is_staff': True, 'first_name': 'Prueba', 'last_name': 'Carga'}
+        )
+        self.personal = self._cliente()
+        self.personal.force_login(personal)
+
+        socios = list(
+            Socio.objects.filter(activo=True, user__isnull=False, user__is_active=True)
+            .select_related('user').order_by('?')[:cantidad]
+        )
+        if not socios:
+            raise CommandError('No hay socios activos con usuario. Ejecutá primero generar_datos.')
+        self.socios = []
+        for socio in socios:
+            cliente = self._cliente()
+            cliente.force_login(socio.user)
+            self.socios.append(cliente)
+
+        self.palabras = [
+            titulo.split()[0] for titulo in
+            Libro.objects.order_by('?').values_list('titulo', flat=True)[:200] if titulo
+        ] or ['a']
+        self.max_libro = Libro.objects.aggregate(m=Max('id'))['m'] or 0
+        self.max_prestamo = Prestamo.objects.aggregate(m=Max('id'))['m'] or 0
+
+    def _al_azar(self, queryset, maximo):
+        """Elige una fila cercana a un id al azar sin usar ORDER BY RANDOM() sobre tablas grandes."""
+        if not maximo:
+            return None
+        desde = self.random.randint(1, maximo)
+        return queryset.filter(id__gte=desde).order_by('id').first() or queryset.order_by('id').first()
+
+    def _ejecutar(self, nombre):
+        """Prepara y ejecuta un escenario. Retorna (segundos, consultas, status) o None si no aplica."""
+        peticion = self.ESCENARIOS[nombre](self)
+        if peticion is None:
+            return None
+        cliente, metodo, url, datos = peticion
+
+        contador = ContadorConsultas()
+        inicio = time.perf_counter()
+        with contador.activar():
+            respuesta = getattr(cliente, metodo)(url, datos or {})
+            if hasattr(respuesta, 'streaming_content'):
+                for _ in respuesta.streaming_content:
+                    pass
+        return (time.perf_counter() - inicio, contador.cantidad, respuesta.status_code)
+
+    def _buscar(self):
+        return (
+            self.random.choice(self.socios), 'get', reverse('socios:buscar_libros'),
+            {'titulo': self.random.choice(self.palabras)}
+        )
+
+    def _solicitar(self):
+        libro = self._al_azar(
+            Libro.objects.filter(ejemplares__estado='DISPONIBLE').distinct(), self.max_libro
+        )
+        if not libro:
+            return None
+        return (self.random.choice(self.socios), 'post', reverse('socios:solicitar_prestamo', args=[libro.id]), None)
+
+    def _listar(self):
+        return (self.personal, 'get', reverse('gestion_prestamos:listar_prestamos'), {'page': self.random.randint(1, 50)})
+
+    def _devolver(self):
+        prestamo = self._al_azar(Prestamo.objects.filter(estado__in=Prestamo.ESTADOS_ACTIVOS), self.max_prestamo)
+        if not prestamo:
+            return None
+        return (self.personal, 'post', reverse('gestion_prestamos:devolver_prestamo', args=[prestamo.id]), None)
+
+    def _exportar(self):
+        return (self.personal, 'get', reverse('gestion_prestamos:exportar_prestamos_csv'), None)
+
+    ESCENARIOS = {
+        'buscar': _buscar,
+        'solicitar': _solicitar,
+        'listar': _listar,
+        'devolver': _devolver,
+        'exportar': _exportar,
+    }
+
+    def _armar_reporte(self, muestras, total):
+        endpoints = {}
+        for nombre, datos in sorted(muestras.items()):
+            tiempos = sorted(d[0] * 1000 for d in datos)
+            consultas = [d[1] for d in datos]
+            endpoints[nombre] = {
+                'solicitudes': len(datos),
+                'errores': sum(1 for d in datos if d[2] >= 500),
+                'p50_ms': round(percentil(tiempos, 50), 2),
+                'p95_ms': round(percentil(tiempos, 95), 2),
+                'p99_ms': round(percentil(tiempos, 99), 2),
+                'max_ms': round(tiempos[-1], 2),
+                'consultas_promedio': round(sum(consultas) / len(consultas), 1),
+                'consultas_max': max(consultas),
+            }
+        realizadas = sum(e['solicitudes'] for e in endpoints.values())
+        return {
+            'duracion_s': round(total, 2),
+            'solicitudes': realizadas,
+            'solicitudes_por_segundo': round(realizadas / total, 1) if total else 0,
+            'endpoints': endpoints,
+        }
+
+    def _imprimir(self, reporte):
+        self.stdout.write('')
+        self.stdout.write(
+            f'{"Endpoint":<12}{"N":>7}{"Err":>6}{"p50 ms":>10}{"p95 ms":>10}'
+            f'{"p99 ms":>10}{"max ms":>10}{"SQL prom":>10}{"SQL max":>9}'
+        )
+        for nombre, e in reporte['endpoints'].items():
+            self.stdout.write(
+                f'{nombre:<12}{e["solicitudes"]:>7}{e["errores"]:>6}{e["p50_ms"]:>10.1f}{e["p95_ms"]:>10.1f}'
+                f'{e["p99_ms"]:>10.1f}{e["max_ms"]:>10.1f}{e["consultas_promedio"]:>10.1f}{e["consultas_max"]:>9}'
+            )
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'{reporte["solicitudes"]} requests en {reporte["duracion_s"]} s '
+            f'({reporte["solicitudes_por_segundo"]} req/s)'
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_prestamos', '0005_reserva_gestion_pre_socio_i_ce530d_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BarridoVencidos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_inicio', models.DateTimeField(db_index=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+                ('fecha_corte', models.DateField(help_text='Se marcan los préstamos con devolución esperada anterior a esta fecha')),
+                ('marcados', models.IntegerField(default=0, help_text='Préstamos marcados como vencidos')),
+                ('lotes', models.IntegerField(default=0, help_text='Cantidad de lotes procesados')),
+                ('tamano_lote', models.IntegerField(default=0)),
+                ('duracion_ms', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Barrido de vencidos',
+                'verbose_name_plural': 'Barridos de vencidos',
+                'ordering': ['-fecha_inicio'],
+            },
+        ),
+    ]
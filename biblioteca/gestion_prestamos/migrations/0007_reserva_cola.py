@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_libros', '0006_ejemplar_estado_reservado'),
+        ('gestion_prestamos', '0006_barridovencidos'),
+        ('gestion_socios', '0003_alter_socio_email_alter_socio_identificacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reserva',
+            name='ejemplar',
+            field=models.ForeignKey(blank=True, help_text='Ejemplar apartado para el socio cuando la reserva es notificada', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reservas', to='gestion_libros.ejemplar'),
+        ),
+        migrations.AddField(
+            model_name='reserva',
+            name='fecha_vencimiento',
+            field=models.DateField(blank=True, help_text='Fecha límite para retirar el ejemplar apartado', null=True),
+        ),
+        migrations.AlterField(
+            model_name='reserva',
+            name='estado',
+            field=models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('NOTIFICADA', 'Notificada'), ('RETIRADA', 'Retirada'), ('EXPIRADA', 'Expirada'), ('CANCELADA', 'Cancelada')], db_index=True, default='PENDIENTE', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['libro', 'estado', 'fecha_reserva'], name='gestion_pre_libro_i_8baa8a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['estado', 'fecha_vencimiento'], name='gestion_pre_estado_834b10_idx'),
+        ),
+    ]
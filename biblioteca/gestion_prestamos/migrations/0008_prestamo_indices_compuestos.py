@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_libros', '0006_ejemplar_estado_reservado'),
+        ('gestion_prestamos', '0007_reserva_cola'),
+        ('gestion_socios', '0003_alter_socio_email_alter_socio_identificacion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='prestamo',
+            name='ejemplar',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='prestamos', to='gestion_libros.ejemplar'),
+        ),
+        migrations.AlterField(
+            model_name='prestamo',
+            name='estado',
+            field=models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('DEVUELTO', 'Devuelto'), ('VENCIDO', 'Vencido')], default='PENDIENTE', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='prestamo',
+            name='fecha_devolucion_esperada',
+            field=models.DateField(),
+        ),
+        migrations.AlterField(
+            model_name='prestamo',
+            name='socio',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='prestamos', to='gestion_socios.socio'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(fields=['socio', 'estado', 'fecha_devolucion_esperada'], name='prestamo_socio_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(fields=['socio', 'fecha_devolucion_real'], name='prestamo_socio_devuelto_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(fields=['ejemplar', 'estado'], name='prestamo_ejemplar_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(fields=['estado', 'fecha_devolucion_esperada'], name='prestamo_estado_vence_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_libros', '0006_ejemplar_estado_reservado'),
+        ('gestion_prestamos', '0008_prestamo_indices_compuestos'),
+        ('gestion_socios', '0003_alter_socio_email_alter_socio_identificacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivadoPrestamos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_inicio', models.DateTimeField(db_index=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+                ('fecha_corte', models.DateField(help_text='Se archivan los préstamos devueltos antes de esta fecha')),
+                ('archivados', models.IntegerField(default=0, help_text='Préstamos movidos a la tabla de archivo')),
+                ('lotes', models.IntegerField(default=0, help_text='Cantidad de lotes procesados')),
+                ('tamano_lote', models.IntegerField(default=0)),
+                ('duracion_ms', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Archivado de préstamos',
+                'verbose_name_plural': 'Archivados de préstamos',
+                'ordering': ['-fecha_inicio'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PrestamoArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('fecha_prestamo', models.DateField()),
+                ('fecha_devolucion_esperada', models.DateField()),
+                ('fecha_devolucion_real', models.DateField()),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('DEVUELTO', 'Devuelto'), ('VENCIDO', 'Vencido')], default='DEVUELTO', max_length=10)),
+                ('observaciones', models.TextField(blank=True, null=True)),
+                ('fecha_archivado', models.DateTimeField(auto_now_add=True)),
+                ('ejemplar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prestamos_archivados', to='gestion_libros.ejemplar')),
+                ('socio', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='prestamos_archivados', to='gestion_socios.socio')),
+            ],
+            options={
+                'verbose_name': 'Préstamo archivado',
+                'verbose_name_plural': 'Préstamos archivados',
+                'ordering': ['-fecha_prestamo'],
+                'indexes': [models.Index(fields=['socio', '-fecha_prestamo'], name='prestamo_arch_socio_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:45
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+def completar_vencimiento(apps, schema_editor):
+    """
+    Da plazo de retiro a las reservas NOTIFICADA anteriores a la cola (0007), que
+    quedaron sin fecha_vencimiento: liberar_reservas_vencidas nunca las expiraba y, como
+    NOTIFICADA es un estado activo, el socio no podía volver a reservar ese libro.
+    
+    El plazo se cuenta desde hoy porque no se guardaba la fecha de la notificación.
+    """
+    Reserva = apps.get_model('gestion_prestamos', 'Reserva')
+    Reserva.objects.filter(estado='NOTIFICADA', fecha_vencimiento__isnull=True).update(
+        fecha_vencimiento=timezone.now().date() + timedelta(days=settings.RESERVAS_DIAS_RETIRO)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion_prestamos', '0009_prestamo_archivado'),
+    ]
+
+    operations = [
+        migrations.RunPython(completar_vencimiento, migrations.RunPython.noop),
+    ]
@@ -7,12 +7,30 @@ class Reserva(models.Model):
     ESTADO_CHOICES = [
         ('PENDIENTE', 'Pendiente'),
         ('NOTIFICADA', 'Notificada'),
+        ('RETIRADA', 'Retirada'),
+        ('EXPIRADA', 'Expirada'),
         ('CANCELADA', 'Cancelada'),
     ]
     
+    # Estados de una reserva que todavía ocupa un lugar en la cola del libro
+    ESTADOS_ACTIVOS = ('PENDIENTE', 'NOTIFICADA')
+    
     socio = models.ForeignKey(Socio, on_delete=models.CASCADE, related_name='reservas', db_index=True)
     libro = models.ForeignKey(Libro, on_delete=models.CASCADE, related_name='reservas', db_index=True)
+    ejemplar = models.ForeignKey(
+        Ejemplar,
+        on_delete=models.SET_NULL,
+        related_name='reservas',
+        blank=True,
+        null=True,
+        help_text="Ejemplar apartado para el socio cuando la reserva es notificada"
+    )
     fecha_reserva = models.DateTimeField(auto_now_add=True, db_index=True)
+    fecha_vencimiento = models.DateField(
+        blank=True,
+        null=True,
+        help_text="Fecha límite para retirar el ejemplar apartado"
+    )
     estado = models.CharField(
         max_length=20,
         choices=ESTADO_CHOICES,
@@ -31,6 +49,8 @@ class Reserva(models.Model):
         indexes = [
             models.Index(fields=['socio', 'estado']),
             models.Index(fields=['libro', 'estado']),
+            models.Index(fields=['libro', 'estado', 'fecha_reserva']),
+            models.Index(fields=['estado', 'fecha_vencimiento']),
         ]
 
 class Prestamo(models.Model):
@@ -40,12 +60,19 @@ class Prestamo(models.Model):
         ('VENCIDO', 'Vencido'),
     ]
     
-    socio = models.ForeignKey(Socio, on_delete=models.CASCADE, related_name='prestamos', db_index=True)
-    ejemplar = models.ForeignKey(Ejemplar, on_delete=models.CASCADE, related_name='prestamos', db_index=True)
+    # Estados de un préstamo cuyo ejemplar todavía no fue devuelto
+    ESTADOS_ACTIVOS = ('PENDIENTE', 'VENCIDO')
+    
+    # Los préstamos devueltos antiguos se mueven a PrestamoArchivado
+    archivado = False
+    
+    # socio, ejemplar, estado y fecha_devolucion_esperada se indexan en los índices compuestos de Meta
+    socio = models.ForeignKey(Socio, on_delete=models.CASCADE, related_name='prestamos', db_index=False)
+    ejemplar = models.ForeignKey(Ejemplar, on_delete=models.CASCADE, related_name='prestamos', db_index=False)
     fecha_prestamo = models.DateField(auto_now_add=True, db_index=True)
-    fecha_devolucion_esperada = models.DateField(db_index=True)
+    fecha_devolucion_esperada = models.DateField()
     fecha_devolucion_real = models.DateField(blank=True, null=True)
-    estado = models.CharField(max_length=10, choices=ESTADO_CHOICES, default='PENDIENTE', db_index=True)
+    estado = models.CharField(max_length=10, choices=ESTADO_CHOICES, default='PENDIENTE')
     observaciones = models.TextField(blank=True, null=True)
 
     def __str__(self):
@@ -53,7 +80,7 @@ class Prestamo(models.Model):
 
     def calcular_dias_atraso(self):
         """Calcula los días de atraso si el préstamo está vencido"""
-        if self.estado == 'PENDIENTE' and self.fecha_devolucion_esperada < timezone.now().date():
+        if self.estado in self.ESTADOS_ACTIVOS and self.fecha_devolucion_esperada < timezone.now().date():
             dias = (timezone.now().date() - self.fecha_devolucion_esperada).days
             return dias
         return 0
@@ -67,27 +94,119 @@ class Prestamo(models.Model):
     def marcar_como_devuelto(self):
         """
         Marca el préstamo como devuelto y actualiza el ejemplar.
-        Usa transacción atómica para garantizar consistencia.
+        Usa una transacción de escritura (BEGIN IMMEDIATE en SQLite) para garantizar consistencia.
+        Si hay reservas pendientes del libro, el ejemplar queda apartado para la más antigua.
         """
-        from django.db import transaction
-        with transaction.atomic():
+        from biblioteca import metricas
+        from biblioteca.basedatos import transaccion_escritura
+        from .services import ReservaService
+        with transaccion_escritura():
             self.estado = 'DEVUELTO'
             self.fecha_devolucion_real = timezone.now().date()
-            self.ejemplar.estado = 'DISPONIBLE'
-            self.ejemplar.save(update_fields=['estado'])
             self.save(update_fields=['estado', 'fecha_devolucion_real'])
+            ReservaService.asignar_ejemplar_liberado(self.ejemplar)
+            metricas.incrementar_al_confirmar('bibliotech_prestamos_devueltos_total', modo='individual')
     
     @classmethod
     def actualizar_estados_vencidos(cls):
-        """Actualiza todos los préstamos vencidos a estado VENCIDO"""
-        vencidos = cls.objects.filter(
-            estado='PENDIENTE',
-            fecha_devolucion_esperada__lt=timezone.now().date()
-        )
-        count = vencidos.update(estado='VENCIDO')
-        return count
+        """
+        Actualiza todos los préstamos vencidos a estado VENCIDO.
+        Delegado a PrestamoService, que procesa por lotes.
+        
+        Returns:
+            Número de préstamos actualizados
+        """
+        from .services import PrestamoService
+        return PrestamoService.actualizar_estados_vencidos().marcados
 
     class Meta:
         verbose_name = "Préstamo"
         verbose_name_plural = "Préstamos"
-        ordering = ['-fecha_prestamo']
\ No newline at end of file
+        ordering = ['-fecha_prestamo']
+        indexes = [
+            # Límite y vencidos del socio (validar_limite_prestamos, prestar_lote, dashboard_socio)
+            models.Index(fields=['socio', 'estado', 'fecha_devolucion_esperada'], name='prestamo_socio_estado_idx'),
+            # Activos e historial del socio por fecha de devolución (dashboard_socio)
+            models.Index(fields=['socio', 'fecha_devolucion_real'], name='prestamo_socio_devuelto_idx'),
+            # Préstamo activo de un ejemplar (crear_prestamo_seguro, devoluciones)
+            models.Index(fields=['ejemplar', 'estado'], name='prestamo_ejemplar_estado_idx'),
+            # Totales del tablero del personal, barrido de vencidos y búsqueda por estado.
+            # No es parcial (WHERE estado IN ESTADOS_ACTIVOS): SQLite solo usa un índice
+            # parcial si la consulta repite su condición, así que estado='VENCIDO' o
+            # estado='PENDIENTE' no lo usarían; con estado primero este índice ya descarta
+            # los DEVUELTO, que son la mayoría
+            models.Index(fields=['estado', 'fecha_devolucion_esperada'], name='prestamo_estado_vence_idx'),
+        ]
+
+
+class PrestamoArchivado(models.Model):
+    """
+    Préstamo devuelto hace más de PRESTAMOS_ARCHIVO_DIAS, movido fuera de la tabla de
+    préstamos por PrestamoService.archivar_devueltos. Conserva el id original.
+    """
+    # Se muestra en el historial junto a los préstamos vigentes (PrestamoService.historial_socio)
+    archivado = True
+    
+    id = models.BigIntegerField(primary_key=True)
+    socio = models.ForeignKey(Socio, on_delete=models.CASCADE, related_name='prestamos_archivados', db_index=False)
+    ejemplar = models.ForeignKey(Ejemplar, on_delete=models.CASCADE, related_name='prestamos_archivados')
+    fecha_prestamo = models.DateField()
+    fecha_devolucion_esperada = models.DateField()
+    fecha_devolucion_real = models.DateField()
+    estado = models.CharField(max_length=10, choices=Prestamo.ESTADO_CHOICES, default='DEVUELTO')
+    observaciones = models.TextField(blank=True, null=True)
+    fecha_archivado = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.ejemplar.libro.titulo} - {self.socio.nombre} {self.socio.apellido} (archivado)"
+
+    class Meta:
+        verbose_name = "Préstamo archivado"
+        verbose_name_plural = "Préstamos archivados"
+        ordering = ['-fecha_prestamo']
+        indexes = [
+            # Historial del socio
+            models.Index(fields=['socio', '-fecha_prestamo'], name='prestamo_arch_socio_idx'),
+        ]
+
+
+class ArchivadoPrestamos(models.Model):
+    """
+    Registro de cada ejecución del archivado de préstamos devueltos.
+    """
+    fecha_inicio = models.DateTimeField(db_index=True)
+    fecha_fin = models.DateTimeField(blank=True, null=True)
+    fecha_corte = models.DateField(help_text="Se archivan los préstamos devueltos antes de esta fecha")
+    archivados = models.IntegerField(default=0, help_text="Préstamos movidos a la tabla de archivo")
+    lotes = models.IntegerField(default=0, help_text="Cantidad de lotes procesados")
+    tamano_lote = models.IntegerField(default=0)
+    duracion_ms = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Archivado {self.fecha_inicio.strftime('%d/%m/%Y %H:%M')} - {self.archivados} préstamos"
+
+    class Meta:
+        verbose_name = "Archivado de préstamos"
+        verbose_name_plural = "Archivados de préstamos"
+        ordering = ['-fecha_inicio']
+
+
+class BarridoVencidos(models.Model):
+    """
+    Registro de cada ejecución del barrido de préstamos vencidos.
+    """
+    fecha_inicio = models.DateTimeField(db_index=True)
+    fecha_fin = models.DateTimeField(blank=True, null=True)
+    fecha_corte = models.DateField(help_text="Se marcan los préstamos con devolución esperada anterior a esta fecha")
+    marcados = models.IntegerField(default=0, help_text="Préstamos marcados como vencidos")
+    lotes = models.IntegerField(default=0, help_text="Cantidad de lotes procesados")
+    tamano_lote = models.IntegerField(default=0)
+    duracion_ms = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Barrido {self.fecha_inicio.strftime('%d/%m/%Y %H:%M')} - {self.marcados} marcados"
+
+    class Meta:
+        verbose_name = "Barrido de vencidos"
+        verbose_name_plural = "Barridos de vencidos"
+        ordering = ['-fecha_inicio']
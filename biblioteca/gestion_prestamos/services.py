@@ -1,14 +1,32 @@
 """
 Servicios de lógica de negocio para préstamos.
 """
+import logging
+from datetime import timedelta
+from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
-from .models import Prestamo
+from django.db.models import Q
+from biblioteca import cache, metricas
+from biblioteca.basedatos import transaccion_escritura
+from gestion_libros.services import LibroService
+from .models import Prestamo, Reserva
 
 
 class PrestamoService:
     """Servicio para operaciones de préstamos."""
     
+    @staticmethod
+    def invalidar_historial(socio_ids):
+        """
+        Invalida las páginas de préstamos y reservas de los socios dados y la huella de
+        las exportaciones de préstamos al confirmarse la transacción en curso (ver
+        gestion_prestamos/signals.py).
+        
+        Args:
+            socio_ids: IDs de los socios afectados
+        """
+        cache.invalidar('prestamos', *{f'socio:{socio_id}' for socio_id in socio_ids})
+    
     @staticmethod
     def validar_limite_prestamos(socio, limite=3):
         """
@@ -23,16 +41,17 @@ class PrestamoService:
         """
         prestamos_activos = Prestamo.objects.filter(
             socio=socio,
-            estado='PENDIENTE'
+            estado__in=Prestamo.ESTADOS_ACTIVOS
         ).count()
         
         if prestamos_activos >= limite:
             return False, f'Has alcanzado el límite de préstamos simultáneos ({limite})'
         
+        # Incluye pendientes ya vencidos que el barrido todavía no marcó
         prestamos_vencidos = Prestamo.objects.filter(
-            socio=socio,
-            estado='PENDIENTE',
-            fecha_devolucion_esperada__lt=timezone.now().date()
+            Q(estado='VENCIDO') |
+            Q(estado='PENDIENTE', fecha_devolucion_esperada__lt=timezone.now().date()),
+            socio=socio
         ).exists()
         
         if prestamos_vencidos:
@@ -41,15 +60,19 @@ class PrestamoService:
         return True, None
     
     @staticmethod
-    @transaction.atomic
-    def crear_prestamo_seguro(socio, ejemplar, fecha_devolucion_esperada):
+    @transaccion_escritura()
+    def crear_prestamo_seguro(socio, ejemplar, fecha_devolucion_esperada, observaciones=None):
         """
         Crea un préstamo de forma segura con transacción atómica.
         
+        Un ejemplar RESERVADO solo puede prestarse al socio cuya reserva lo tiene
+        apartado; en ese caso la reserva pasa a RETIRADA.
+        
         Args:
             socio: Instancia de Socio
             ejemplar: Instancia de Ejemplar
             fecha_devolucion_esperada: Fecha de devolución esperada
+            observaciones: Observaciones del préstamo (opcional)
         
         Returns:
             Prestamo creado
@@ -64,16 +87,27 @@ class PrestamoService:
         
         ejemplar_disponible = ejemplar.__class__.objects.select_for_update().filter(
             id=ejemplar.id,
-            estado='DISPONIBLE'
+            estado__in=['DISPONIBLE', 'RESERVADO']
         ).first()
         
         if not ejemplar_disponible:
             logger.warning(f'Intento de préstamo de ejemplar no disponible: {ejemplar.id}')
             raise ValueError('El ejemplar no está disponible')
         
+        reserva = None
+        if ejemplar_disponible.estado == 'RESERVADO':
+            reserva = Reserva.objects.select_for_update().filter(
+                ejemplar=ejemplar_disponible,
+                socio=socio,
+                estado='NOTIFICADA'
+            ).first()
+            if not reserva:
+                logger.warning(f'Intento de préstamo de ejemplar apartado para otro socio: {ejemplar.id}')
+                raise ValueError('El ejemplar está apartado para otro socio')
+        
         prestamo_pendiente = Prestamo.objects.filter(
             ejemplar=ejemplar_disponible,
-            estado='PENDIENTE'
+            estado__in=Prestamo.ESTADOS_ACTIVOS
         ).exists()
         
         if prestamo_pendiente:
@@ -84,27 +118,565 @@ class PrestamoService:
             socio=socio,
             ejemplar=ejemplar_disponible,
             fecha_devolucion_esperada=fecha_devolucion_esperada,
-            estado='PENDIENTE'
+            estado='PENDIENTE',
+            observaciones=observaciones
         )
         
         ejemplar_disponible.estado = 'PRESTADO'
         ejemplar_disponible.save(update_fields=['estado'])
         
+        if reserva:
+            reserva.estado = 'RETIRADA'
+            reserva.save(update_fields=['estado'])
+        
         logger.info(f'Préstamo creado: ID={prestamo.id}, Socio={socio.id}, Ejemplar={ejemplar_disponible.id}')
+        metricas.incrementar_al_confirmar('bibliotech_prestamos_creados_total', modo='individual')
         
         return prestamo
     
     @staticmethod
-    def actualizar_estados_vencidos():
+    def actualizar_estados_vencidos(tamano_lote=500, pausa=0, fecha_corte=None):
         """
-        Actualiza todos los préstamos vencidos a estado VENCIDO.
+        Marca como VENCIDO los préstamos pendientes con devolución esperada anterior a hoy.
+        
+        Procesa por lotes de IDs, cada uno en su propia transacción corta, para no
+        retener bloqueos sobre la tabla. Es idempotente: el UPDATE vuelve a filtrar
+        por estado PENDIENTE, así que una segunda ejecución no marca nada.
+        
+        Args:
+            tamano_lote: Cantidad de préstamos por lote (default: 500)
+            pausa: Segundos de espera entre lotes (default: 0)
+            fecha_corte: Fecha de referencia (default: hoy)
         
         Returns:
-            Número de préstamos actualizados
+            BarridoVencidos con las estadísticas de la ejecución
         """
-        vencidos = Prestamo.objects.filter(
-            estado='PENDIENTE',
-            fecha_devolucion_esperada__lt=timezone.now().date()
+        import time
+        from .models import BarridoVencidos
+        
+        logger = logging.getLogger('gestion_prestamos')
+        
+        inicio = time.monotonic()
+        fecha_corte = fecha_corte or timezone.now().date()
+        barrido = BarridoVencidos(
+            fecha_inicio=timezone.now(),
+            fecha_corte=fecha_corte,
+            tamano_lote=tamano_lote
+        )
+        
+        ultimo_id = 0
+        while True:
+            filas = list(
+                Prestamo.objects.filter(
+                    estado='PENDIENTE',
+                    fecha_devolucion_esperada__lt=fecha_corte,
+                    id__gt=ultimo_id
+                ).order_by('id').values_list('id', 'socio_id')[:tamano_lote]
+            )
+            if not filas:
+                break
+            ids = [id for id, _ in filas]
+            
+            with transaccion_escritura():
+                marcados = Prestamo.objects.filter(
+                    id__in=ids,
+                    estado='PENDIENTE'
+                ).update(estado='VENCIDO')
+                PrestamoService.invalidar_historial(socio_id for _, socio_id in filas)
+            
+            barrido.marcados += marcados
+            barrido.lotes += 1
+            ultimo_id = ids[-1]
+            
+            if len(ids) < tamano_lote:
+                break
+            if pausa:
+                time.sleep(pausa)
+        
+        barrido.fecha_fin = timezone.now()
+        barrido.duracion_ms = int((time.monotonic() - inicio) * 1000)
+        barrido.save()
+        
+        logger.info(
+            f'Barrido de vencidos: {barrido.marcados} préstamos marcados en '
+            f'{barrido.lotes} lotes ({barrido.duracion_ms} ms)'
         )
-        count = vencidos.update(estado='VENCIDO')
-        return count
+        
+        return barrido
+    
+    @staticmethod
+    def archivar_devueltos(dias=None, tamano_lote=1000, pausa=0, fecha_corte=None):
+        """
+        Mueve a PrestamoArchivado los préstamos DEVUELTO antes de la fecha de corte.
+        
+        Procesa por lotes de IDs; cada lote copia y borra sus préstamos en una misma
+        transacción, así que una ejecución interrumpida no deja duplicados y basta con
+        volver a ejecutarla para continuar.
+        
+        Args:
+            dias: Antigüedad mínima de la devolución (default: settings.PRESTAMOS_ARCHIVO_DIAS)
+            tamano_lote: Cantidad de préstamos por lote (default: 1000)
+            pausa: Segundos de espera entre lotes (default: 0)
+            fecha_corte: Fecha de referencia (default: hoy - dias)
+        
+        Returns:
+            ArchivadoPrestamos con las estadísticas de la ejecución
+        """
+        import time
+        from .models import ArchivadoPrestamos, PrestamoArchivado
+        
+        logger = logging.getLogger('gestion_prestamos')
+        
+        if dias is None:
+            dias = settings.PRESTAMOS_ARCHIVO_DIAS
+        inicio = time.monotonic()
+        fecha_corte = fecha_corte or timezone.now().date() - timedelta(days=dias)
+        archivado = ArchivadoPrestamos(
+            fecha_inicio=timezone.now(),
+            fecha_corte=fecha_corte,
+            tamano_lote=tamano_lote
+        )
+        campos = [
+            'id', 'socio_id', 'ejemplar_id', 'fecha_prestamo', 'fecha_devolucion_esperada',
+            'fecha_devolucion_real', 'estado', 'observaciones'
+        ]
+        
+        ultimo_id = 0
+        while True:
+            ids = list(
+                Prestamo.objects.filter(
+                    estado='DEVUELTO',
+                    fecha_devolucion_real__lt=fecha_corte,
+                    id__gt=ultimo_id
+                ).order_by('id').values_list('id', flat=True)[:tamano_lote]
+            )
+            if not ids:
+                break
+            
+            with transaccion_escritura():
+                # Se vuelve a filtrar por si algún préstamo cambió desde la lectura de IDs
+                filas = list(
+                    Prestamo.objects.filter(id__in=ids, estado='DEVUELTO').values(*campos)
+                )
+                PrestamoArchivado.objects.bulk_create([PrestamoArchivado(**fila) for fila in filas])
+                Prestamo.objects.filter(id__in=[fila['id'] for fila in filas]).delete()
+            
+            archivado.archivados += len(filas)
+            archivado.lotes += 1
+            ultimo_id = ids[-1]
+            
+            if len(ids) < tamano_lote:
+                break
+            if pausa:
+                time.sleep(pausa)
+        
+        archivado.fecha_fin = timezone.now()
+        archivado.duracion_ms = int((time.monotonic() - inicio) * 1000)
+        archivado.save()
+        
+        logger.info(
+            f'Archivado de préstamos: {archivado.archivados} préstamos devueltos antes del '
+            f'{fecha_corte} en {archivado.lotes} lotes ({archivado.duracion_ms} ms)'
+        )
+        
+        return archivado
+    
+    @staticmethod
+    def historial_socio(socio, solo_devueltos=False, limite=None):
+        """
+        Préstamos de un socio, vigentes y archivados, del más reciente al más antiguo.
+        
+        Combina las dos tablas ordenadas con un merge, sin UNION: cada consulta usa el
+        índice del socio en su tabla y trae ejemplar, libro y autor con select_related.
+        Cada elemento tiene el atributo archivado.
+        
+        Args:
+            socio: Instancia de Socio
+            solo_devueltos: Solo préstamos con devolución registrada, ordenados por
+                fecha de devolución (default: False, ordenados por fecha de préstamo)
+            limite: Cantidad máxima de préstamos (default: todos)
+        
+        Returns:
+            Lista de Prestamo y PrestamoArchivado
+        """
+        import heapq
+        from itertools import islice
+        from .models import PrestamoArchivado
+        
+        orden = 'fecha_devolucion_real' if solo_devueltos else 'fecha_prestamo'
+        consultas = []
+        for modelo in (Prestamo, PrestamoArchivado):
+            queryset = modelo.objects.filter(socio=socio).select_related(
+                'ejemplar', 'ejemplar__libro', 'ejemplar__libro__autor'
+            ).order_by(f'-{orden}', '-id')
+            if solo_devueltos:
+                queryset = queryset.filter(fecha_devolucion_real__isnull=False)
+            if limite is not None:
+                queryset = queryset[:limite]
+            consultas.append(queryset)
+        
+        combinados = heapq.merge(
+            *consultas, key=lambda p: (getattr(p, orden), p.id), reverse=True
+        )
+        return list(islice(combinados, limite))
+    
+    @staticmethod
+    def escanear_ejemplar(codigo):
+        """
+        Resuelve un código de ejemplar leído en el mostrador, en una sola consulta.
+        
+        Busca por igualdad sobre el índice único de Ejemplar.codigo y trae con LEFT JOIN
+        el libro y su autor, el préstamo activo (con el socio) y la reserva notificada
+        que tiene apartado el ejemplar, más la cantidad de reservas pendientes del libro
+        en una subconsulta.
+        
+        Args:
+            codigo: Ejemplar.codigo exacto
+        
+        Returns:
+            dict con los valores de la fila (claves de values()), o None si no existe
+        """
+        from django.db.models import Count, FilteredRelation, IntegerField, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce
+        from gestion_libros.models import Ejemplar
+        
+        reservas_pendientes = Reserva.objects.filter(
+            libro=OuterRef('libro_id'),
+            estado='PENDIENTE'
+        ).order_by().values('libro').annotate(cantidad=Count('id')).values('cantidad')
+        
+        filas = Ejemplar.objects.filter(codigo=codigo).annotate(
+            prestamo_activo=FilteredRelation(
+                'prestamos', condition=Q(prestamos__estado__in=Prestamo.ESTADOS_ACTIVOS)
+            ),
+            reserva_apartada=FilteredRelation(
+                'reservas', condition=Q(reservas__estado='NOTIFICADA')
+            ),
+            reservas_pendientes=Coalesce(
+                Subquery(reservas_pendientes, output_field=IntegerField()), Value(0)
+            ),
+        ).values(
+            'codigo', 'estado', 'ubicacion',
+            'libro_id', 'libro__titulo', 'libro__isbn', 'libro__autor__nombre', 'libro__autor__apellido',
+            'prestamo_activo__id', 'prestamo_activo__estado', 'prestamo_activo__fecha_prestamo',
+            'prestamo_activo__fecha_devolucion_esperada', 'prestamo_activo__socio_id',
+            'prestamo_activo__socio__nombre', 'prestamo_activo__socio__apellido',
+            'prestamo_activo__socio__identificacion',
+            'reserva_apartada__id', 'reserva_apartada__fecha_vencimiento', 'reserva_apartada__socio_id',
+            'reserva_apartada__socio__nombre', 'reserva_apartada__socio__apellido',
+            'reservas_pendientes',
+        ).order_by()[:1]
+        # Sin ORDER BY: el código es único y ordenar solo agrega trabajo al compilar la consulta
+        return next(iter(filas), None)
+    
+    @staticmethod
+    @transaccion_escritura()
+    def prestar_lote(socio, codigos, fecha_devolucion_esperada, limite=3):
+        """
+        Registra en una sola transacción los préstamos de varios ejemplares a un socio.
+        
+        Bloquea todos los ejemplares con un único select_for_update, valida el lote
+        completo y crea los préstamos con bulk_create.
+        
+        Args:
+            socio: Instancia de Socio
+            codigos: Lista de Ejemplar.codigo (se ignoran repetidos)
+            fecha_devolucion_esperada: Fecha de devolución esperada
+            limite: Límite máximo de préstamos simultáneos (default: 3)
+        
+        Returns:
+            Lista de dicts {'codigo', 'ok', 'mensaje'} en el orden recibido
+        """
+        from gestion_libros.models import Ejemplar
+        
+        logger = logging.getLogger('gestion_prestamos')
+        codigos = list(dict.fromkeys(codigos))
+        
+        if not socio.activo:
+            return [{'codigo': c, 'ok': False, 'mensaje': 'El socio no está activo'} for c in codigos]
+        
+        activos = Prestamo.objects.filter(socio=socio, estado__in=Prestamo.ESTADOS_ACTIVOS)
+        tiene_vencidos = activos.filter(
+            Q(estado='VENCIDO') | Q(fecha_devolucion_esperada__lt=timezone.now().date())
+        ).exists()
+        if tiene_vencidos:
+            mensaje = 'El socio tiene préstamos vencidos'
+            return [{'codigo': c, 'ok': False, 'mensaje': mensaje} for c in codigos]
+        cupo = limite - activos.count()
+        
+        ejemplares = {
+            e.codigo: e for e in Ejemplar.objects.select_for_update().filter(codigo__in=codigos)
+        }
+        con_prestamo = set(
+            Prestamo.objects.filter(
+                ejemplar__in=ejemplares.values(),
+                estado__in=Prestamo.ESTADOS_ACTIVOS
+            ).values_list('ejemplar_id', flat=True)
+        )
+        reservas = {
+            r.ejemplar_id: r.id for r in Reserva.objects.filter(
+                ejemplar__in=ejemplares.values(),
+                socio=socio,
+                estado='NOTIFICADA'
+            ).only('id', 'ejemplar_id', 'socio_id')
+        }
+        
+        resultados = []
+        a_prestar = []
+        for codigo in codigos:
+            ejemplar = ejemplares.get(codigo)
+            if not ejemplar:
+                mensaje = 'Código inexistente'
+            elif ejemplar.id in con_prestamo:
+                mensaje = 'El ejemplar ya tiene un préstamo pendiente'
+            elif ejemplar.estado == 'RESERVADO' and ejemplar.id not in reservas:
+                mensaje = 'El ejemplar está apartado para otro socio'
+            elif ejemplar.estado not in ('DISPONIBLE', 'RESERVADO'):
+                mensaje = f'El ejemplar no está disponible ({ejemplar.get_estado_display()})'
+            elif len(a_prestar) >= cupo:
+                mensaje = f'Se alcanzó el límite de préstamos simultáneos ({limite})'
+            else:
+                a_prestar.append(ejemplar)
+                resultados.append({'codigo': codigo, 'ok': True, 'mensaje': 'Prestado'})
+                continue
+            resultados.append({'codigo': codigo, 'ok': False, 'mensaje': mensaje})
+        
+        if a_prestar:
+            Prestamo.objects.bulk_create([
+                Prestamo(
+                    socio=socio,
+                    ejemplar=ejemplar,
+                    fecha_devolucion_esperada=fecha_devolucion_esperada,
+                    estado='PENDIENTE'
+                )
+                for ejemplar in a_prestar
+            ])
+            ids = [e.id for e in a_prestar]
+            Ejemplar.objects.filter(id__in=ids).update(estado='PRESTADO')
+            LibroService.invalidar_catalogo()
+            Reserva.objects.filter(
+                id__in=[reservas[i] for i in ids if i in reservas]
+            ).update(estado='RETIRADA')
+            PrestamoService.invalidar_historial([socio.id])
+            logger.info(f'Préstamos en lote: Socio={socio.id}, Ejemplares={ids}')
+            metricas.incrementar_al_confirmar('bibliotech_prestamos_creados_total', len(ids), modo='lote')
+        
+        return resultados
+    
+    @staticmethod
+    @transaccion_escritura()
+    def devolver_lote(codigos):
+        """
+        Registra en una sola transacción la devolución de varios ejemplares.
+        
+        Bloquea ejemplares y préstamos activos con select_for_update, marca los
+        préstamos con un único UPDATE y libera los ejemplares en bloque. Solo los
+        ejemplares de libros con reservas pendientes pasan por la cola de reservas.
+        
+        Args:
+            codigos: Lista de Ejemplar.codigo (se ignoran repetidos)
+        
+        Returns:
+            Lista de dicts {'codigo', 'ok', 'mensaje'} en el orden recibido
+        """
+        from gestion_libros.models import Ejemplar
+        
+        logger = logging.getLogger('gestion_prestamos')
+        codigos = list(dict.fromkeys(codigos))
+        
+        ejemplares = {
+            e.codigo: e for e in Ejemplar.objects.select_for_update().filter(codigo__in=codigos)
+        }
+        prestamos = {
+            p.ejemplar_id: p for p in Prestamo.objects.select_for_update().filter(
+                ejemplar__in=ejemplares.values(),
+                estado__in=Prestamo.ESTADOS_ACTIVOS
+            ).only('id', 'ejemplar_id', 'socio_id')
+        }
+        
+        resultados = []
+        devueltos = []
+        for codigo in codigos:
+            ejemplar = ejemplares.get(codigo)
+            if not ejemplar:
+                resultados.append({'codigo': codigo, 'ok': False, 'mensaje': 'Código inexistente'})
+            elif ejemplar.id not in prestamos:
+                resultados.append({'codigo': codigo, 'ok': False, 'mensaje': 'El ejemplar no tiene un préstamo activo'})
+            else:
+                devueltos.append(ejemplar)
+                resultados.append({'codigo': codigo, 'ok': True, 'mensaje': 'Devuelto'})
+        
+        if devueltos:
+            Prestamo.objects.filter(
+                id__in=[prestamos[e.id].id for e in devueltos]
+            ).update(estado='DEVUELTO', fecha_devolucion_real=timezone.now().date())
+            PrestamoService.invalidar_historial(prestamos[e.id].socio_id for e in devueltos)
+            
+            libros_con_cola = set(
+                Reserva.objects.filter(
+                    libro_id__in={e.libro_id for e in devueltos},
+                    estado='PENDIENTE'
+                ).values_list('libro_id', flat=True)
+            )
+            Ejemplar.objects.filter(
+                id__in=[e.id for e in devueltos if e.libro_id not in libros_con_cola]
+            ).update(estado='DISPONIBLE')
+            LibroService.invalidar_catalogo()
+            
+            por_codigo = {r['codigo']: r for r in resultados}
+            for ejemplar in devueltos:
+                if ejemplar.libro_id in libros_con_cola and ReservaService.asignar_ejemplar_liberado(ejemplar):
+                    por_codigo[ejemplar.codigo]['mensaje'] = 'Devuelto y apartado para una reserva'
+            
+            logger.info(f'Devoluciones en lote: Ejemplares={[e.id for e in devueltos]}')
+            metricas.incrementar_al_confirmar('bibliotech_prestamos_devueltos_total', len(devueltos), modo='lote')
+        
+        return resultados
+
+
+class ReservaService:
+    """Servicio para la cola de reservas (primero en reservar, primero en retirar)."""
+    
+    @staticmethod
+    def _apartar_ejemplar(reserva, ejemplar):
+        """Aparta el ejemplar para la reserva y encola el aviso al socio."""
+        from biblioteca.utils import encolar_notificacion
+        
+        reserva.estado = 'NOTIFICADA'
+        reserva.ejemplar = ejemplar
+        reserva.fecha_vencimiento = timezone.now().date() + timedelta(days=settings.RESERVAS_DIAS_RETIRO)
+        reserva.save(update_fields=['estado', 'ejemplar', 'fecha_vencimiento'])
+        
+        ejemplar.estado = 'RESERVADO'
+        ejemplar.save(update_fields=['estado'])
+        metricas.incrementar_al_confirmar('bibliotech_reservas_confirmadas_total')
+        
+        if reserva.socio.user and reserva.socio.user.email:
+            encolar_notificacion(
+                destinatario=reserva.socio.user.email,
+                asunto="Reserva lista para retirar",
+                mensaje=(
+                    f"Tu reserva del libro '{reserva.libro.titulo}' está confirmada. "
+                    f"Tenés tiempo de retirarla hasta el {reserva.fecha_vencimiento.strftime('%d/%m/%Y')}. "
+                    "Recordá presentar tu DNI o ID de socio al momento del retiro."
+                )
+            )
+    
+    @staticmethod
+    @transaccion_escritura()
+    def asignar_ejemplar_liberado(ejemplar):
+        """
+        Asigna un ejemplar que vuelve a estar libre a la reserva pendiente más antigua
+        de su libro. Si no hay reservas, el ejemplar queda DISPONIBLE.
+        
+        Bloquea el ejemplar y la reserva elegida con select_for_update para que dos
+        devoluciones simultáneas no atiendan a la misma reserva.
+        
+        Args:
+            ejemplar: Instancia de Ejemplar liberado
+        
+        Returns:
+            Reserva notificada o None
+        """
+        logger = logging.getLogger('gestion_prestamos')
+        
+        ejemplar_bloqueado = ejemplar.__class__.objects.select_for_update().get(id=ejemplar.id)
+        
+        reserva = Reserva.objects.select_for_update(of=('self',)).select_related(
+            'socio__user', 'libro'
+        ).filter(
+            libro_id=ejemplar_bloqueado.libro_id,
+            estado='PENDIENTE',
+            socio__activo=True
+        ).order_by('fecha_reserva', 'id').first()
+        
+        if reserva:
+            ReservaService._apartar_ejemplar(reserva, ejemplar_bloqueado)
+            logger.info(f'Ejemplar {ejemplar_bloqueado.id} apartado para la reserva {reserva.id}')
+        else:
+            ejemplar_bloqueado.estado = 'DISPONIBLE'
+            ejemplar_bloqueado.save(update_fields=['estado'])
+        
+        # Mantener sincronizada la instancia recibida
+        ejemplar.estado = ejemplar_bloqueado.estado
+        return reserva
+    
+    @staticmethod
+    @transaccion_escritura()
+    def confirmar_reserva(reserva_id):
+        """
+        Confirma manualmente una reserva pendiente apartando un ejemplar disponible.
+        
+        Returns:
+            Reserva notificada
+        
+        Raises:
+            ValueError: Si la reserva no está pendiente o no hay ejemplares disponibles
+        """
+        from gestion_libros.models import Ejemplar
+        
+        reserva = Reserva.objects.select_for_update(of=('self',)).select_related(
+            'socio__user', 'libro'
+        ).get(id=reserva_id)
+        
+        if reserva.estado != 'PENDIENTE':
+            raise ValueError('Solo podés confirmar reservas pendientes.')
+        
+        ejemplar = Ejemplar.objects.select_for_update().filter(
+            libro_id=reserva.libro_id,
+            estado='DISPONIBLE'
+        ).order_by('codigo').first()
+        
+        if not ejemplar:
+            raise ValueError('No hay ejemplares disponibles para apartar. La reserva se asignará automáticamente cuando se devuelva uno.')
+        
+        ReservaService._apartar_ejemplar(reserva, ejemplar)
+        return reserva
+    
+    @staticmethod
+    def liberar_reservas_vencidas(tamano_lote=200, fecha_corte=None):
+        """
+        Marca como EXPIRADA las reservas notificadas cuyo plazo de retiro venció y
+        pasa cada ejemplar apartado a la siguiente reserva de la cola.
+        
+        Procesa por lotes, cada uno en su propia transacción.
+        
+        Args:
+            tamano_lote: Cantidad de reservas por lote (default: 200)
+            fecha_corte: Fecha de referencia (default: hoy)
+        
+        Returns:
+            dict con 'expiradas' y 'reasignadas'
+        """
+        logger = logging.getLogger('gestion_prestamos')
+        
+        fecha_corte = fecha_corte or timezone.now().date()
+        resultados = {'expiradas': 0, 'reasignadas': 0}
+        
+        while True:
+            with transaccion_escritura():
+                vencidas = list(
+                    Reserva.objects.select_for_update(skip_locked=True, of=('self',)).select_related(
+                        'ejemplar'
+                    ).filter(
+                        estado='NOTIFICADA',
+                        fecha_vencimiento__lt=fecha_corte
+                    ).order_by('fecha_vencimiento', 'id')[:tamano_lote]
+                )
+                if not vencidas:
+                    break
+                
+                Reserva.objects.filter(id__in=[r.id for r in vencidas]).update(estado='EXPIRADA')
+                PrestamoService.invalidar_historial(r.socio_id for r in vencidas)
+                resultados['expiradas'] += len(vencidas)
+                
+                for reserva in vencidas:
+                    if reserva.ejemplar and reserva.ejemplar.estado == 'RESERVADO':
+                        if ReservaService.asignar_ejemplar_liberado(reserva.ejemplar):
+                            resultados['reasignadas'] += 1
+            
+            if len(vencidas) < tamano_lote:
+                break
+        
+        logger.info(f'Reservas vencidas liberadas: {resultados}')
+        return resultados
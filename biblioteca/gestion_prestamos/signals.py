@@ -0,0 +1,18 @@
+"""
+Invalidación de las páginas de préstamos y reservas de un socio (GET condicional de
+mis_prestamos y mis_reservas) cuando cambia alguno de sus préstamos o reservas.
+
+Los UPDATE y bulk_create en bloque de los servicios llaman directamente a
+PrestamoService.invalidar_historial().
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Prestamo, Reserva
+from .services import PrestamoService
+
+
+@receiver([post_save, post_delete], sender=Prestamo, dispatch_uid='gestion_prestamos.invalidar_prestamo')
+@receiver([post_save, post_delete], sender=Reserva, dispatch_uid='gestion_prestamos.invalidar_reserva')
+def invalidar_historial(sender, instance, **kwargs):
+    PrestamoService.invalidar_historial([instance.socio_id])
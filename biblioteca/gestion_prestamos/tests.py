@@ -1,3 +1,226 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from biblioteca.utils import clasificar_busqueda
+
+from gestion_autores.models import Autor
+from gestion_libros.models import Ejemplar, Libro
+from gestion_socios.models import Socio
+
+from .models import Prestamo, Reserva
+from .services import PrestamoService
+
+
+class PrestamoIndicesTest(TestCase):
+    """
+    Fija con EXPLAIN los índices que usan las consultas frecuentes de préstamos,
+    con la misma forma que en los servicios y vistas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        autor = Autor.objects.create(nombre='Julio', apellido='Cortázar')
+        libro = Libro.objects.create(titulo='Rayuela', autor=autor)
+        ejemplares = Ejemplar.objects.bulk_create(
+            Ejemplar(libro=libro, codigo=f'IDX-{i:04d}') for i in range(200)
+        )
+        socios = Socio.objects.bulk_create(
+            Socio(nombre=f'Socio{i}', apellido='Prueba', identificacion=f'IDX{i}', email=f'socio{i}@example.com')
+            for i in range(20)
+        )
+        hoy = timezone.now().date()
+        estados = ['DEVUELTO'] * 8 + ['PENDIENTE', 'VENCIDO']
+        Prestamo.objects.bulk_create(
+            Prestamo(
+                socio=socios[i % len(socios)],
+                ejemplar=ejemplares[i],
+                fecha_devolucion_esperada=hoy + timedelta(days=i % 30 - 15),
+                fecha_devolucion_real=hoy if estados[i % 10] == 'DEVUELTO' else None,
+                estado=estados[i % 10],
+            )
+            for i in range(200)
+        )
+        cls.socio = socios[0]
+        cls.ejemplar = ejemplares[0]
+        cls.hoy = hoy
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Con tablas chicas PostgreSQL prefiere recorrerlas enteras
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsaIndice(self, queryset, *indices):
+        """Verifica que el plan use alguno de los índices dados y lo retorna."""
+        plan = queryset.explain()
+        self.assertTrue(
+            any(indice in plan for indice in indices),
+            f'El plan no usa {" ni ".join(indices)}:\n{plan}'
+        )
+        return plan
+
+    def test_validar_limite_prestamos(self):
+        activos = Prestamo.objects.filter(socio=self.socio, estado__in=Prestamo.ESTADOS_ACTIVOS)
+        self.assertUsaIndice(activos, 'prestamo_socio_estado_idx')
+
+        vencidos = Prestamo.objects.filter(
+            Q(estado='VENCIDO') | Q(estado='PENDIENTE', fecha_devolucion_esperada__lt=self.hoy),
+            socio=self.socio
+        )
+        # Con el OR el planificador puede buscar por socio en cualquiera de sus dos índices
+        self.assertUsaIndice(vencidos, 'prestamo_socio_estado_idx', 'prestamo_socio_devuelto_idx')
+
+    def test_dashboard_socio(self):
+        activos = Prestamo.objects.filter(socio=self.socio, fecha_devolucion_real__isnull=True)
+        self.assertUsaIndice(activos, 'prestamo_socio_devuelto_idx')
+
+        historicos = Prestamo.objects.filter(
+            socio=self.socio,
+            fecha_devolucion_real__isnull=False
+        ).order_by('-fecha_devolucion_real')[:5]
+        plan = self.assertUsaIndice(historicos, 'prestamo_socio_devuelto_idx')
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_dashboard_personal(self):
+        self.assertUsaIndice(
+            Prestamo.objects.filter(estado__in=Prestamo.ESTADOS_ACTIVOS), 'prestamo_estado_vence_idx'
+        )
+        self.assertUsaIndice(Prestamo.objects.filter(estado='VENCIDO'), 'prestamo_estado_vence_idx')
+
+    def test_crear_prestamo_seguro(self):
+        pendiente = Prestamo.objects.filter(ejemplar=self.ejemplar, estado__in=Prestamo.ESTADOS_ACTIVOS)
+        self.assertUsaIndice(pendiente, 'prestamo_ejemplar_estado_idx')
+
+    def test_listar_prestamos_ordena_por_indice(self):
+        prestamos = Prestamo.objects.select_related(
+            'socio', 'ejemplar', 'ejemplar__libro'
+        ).order_by('-fecha_prestamo')[:10]
+        plan = self.assertUsaIndice(prestamos, 'fecha_prestamo')
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class EscanearEjemplarTest(TestCase):
+    """El escaneo de un código resuelve ejemplar, préstamo y reserva en una consulta."""
+
+    @classmethod
+    def setUpTestData(cls):
+        autor = Autor.objects.create(nombre='Julio', apellido='Cortázar')
+        libro = Libro.objects.create(titulo='Rayuela', autor=autor)
+        cls.prestado = Ejemplar.objects.create(libro=libro, codigo='ESC-0001', estado='PRESTADO')
+        cls.disponible = Ejemplar.objects.create(libro=libro, codigo='ESC-0002')
+        cls.socio = Socio.objects.create(
+            nombre='Lucía', apellido='Prueba', identificacion='ESC1', email='lucia@example.com'
+        )
+        cls.prestamo = Prestamo.objects.create(
+            socio=cls.socio,
+            ejemplar=cls.prestado,
+            fecha_devolucion_esperada=timezone.now().date() + timedelta(days=7)
+        )
+        Reserva.objects.create(socio=cls.socio, libro=libro)
+
+    def test_una_consulta(self):
+        with self.assertNumQueries(1):
+            fila = PrestamoService.escanear_ejemplar('ESC-0001')
+        self.assertEqual(fila['prestamo_activo__id'], self.prestamo.id)
+        self.assertEqual(fila['prestamo_activo__socio__identificacion'], 'ESC1')
+        self.assertEqual(fila['reservas_pendientes'], 1)
+
+        fila = PrestamoService.escanear_ejemplar('ESC-0002')
+        self.assertIsNone(fila['prestamo_activo__id'])
+        self.assertIsNone(PrestamoService.escanear_ejemplar('ESC-9999'))
+
+    @override_settings(API_TOKENS=['lector'])
+    def test_endpoint(self):
+        url = reverse('api_prestamos:escanear', args=['ESC-0001'])
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+        respuesta = self.client.get(url, HTTP_AUTHORIZATION='Bearer lector').json()
+        self.assertEqual(respuesta['accion'], 'devolver')
+        self.assertEqual(respuesta['prestamo']['id'], self.prestamo.id)
+
+        url = reverse('api_prestamos:escanear', args=['ESC-0002'])
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer lector').json()['accion'], 'prestar')
+
+
+class BusquedaIndexadaTest(TestCase):
+    """Los listados resuelven las búsquedas con forma reconocible sin icontains."""
+
+    @classmethod
+    def setUpTestData(cls):
+        autor = Autor.objects.create(nombre='Julio', apellido='Cortázar')
+        libro = Libro.objects.create(titulo='Rayuela 62', autor=autor)
+        otro_libro = Libro.objects.create(titulo='3012', autor=autor)
+        ejemplares = Ejemplar.objects.bulk_create(
+            Ejemplar(libro=libro if i < 3 else otro_libro, codigo=f'BUS-{i:04d}') for i in range(4)
+        )
+        cls.socio = Socio.objects.create(
+            nombre='Lucía', apellido='Prueba', identificacion='30123456', email='lucia@example.com'
+        )
+        otro = Socio.objects.create(
+            nombre='Mario', apellido='Prueba', identificacion='G0000062', email='mario@example.com'
+        )
+        tercero = Socio.objects.create(
+            nombre='Ana', apellido='Prueba', identificacion='A1', email='ana@example.com'
+        )
+        hoy = timezone.now().date()
+        cls.prestamos = Prestamo.objects.bulk_create(
+            Prestamo(
+                socio=socio,
+                ejemplar=ejemplar,
+                fecha_devolucion_esperada=hoy + timedelta(days=7),
+                estado=estado,
+            )
+            for socio, ejemplar, estado in [
+                (cls.socio, ejemplares[0], 'PENDIENTE'),
+                (cls.socio, ejemplares[1], 'VENCIDO'),
+                (otro, ejemplares[2], 'PENDIENTE'),
+                (tercero, ejemplares[3], 'PENDIENTE'),
+            ]
+        )
+        cls.personal = User.objects.create_user('personal', password='clave', is_staff=True)
+
+    def setUp(self):
+        self.client.force_login(self.personal)
+
+    def buscar(self, url, q):
+        respuesta = self.client.get(reverse(url), {'q': q})
+        return sorted(objeto.id for objeto in respuesta.context['page_obj'])
+
+    def test_clasificar_busqueda(self):
+        estados = Prestamo._meta.get_field('estado').choices
+        self.assertEqual(clasificar_busqueda('vencido', estados=estados), ('estado', 'VENCIDO'))
+        self.assertEqual(clasificar_busqueda('vencido'), ('texto', 'vencido'))
+        self.assertEqual(clasificar_busqueda('lucia@example.com'), ('email', 'lucia@example.com'))
+        self.assertEqual(clasificar_busqueda('0-306-40615-2'), ('isbn', '9780306406157'))
+        self.assertEqual(clasificar_busqueda('30.123.456'), ('numero', '30123456'))
+        self.assertEqual(clasificar_busqueda('GEN-00000096'), ('codigo', 'GEN-00000096'))
+        self.assertEqual(clasificar_busqueda('Rayuela'), ('texto', 'Rayuela'))
+        # Un año o un número suelto no es un DNI ni un código
+        self.assertEqual(clasificar_busqueda('1984'), ('texto', '1984'))
+        self.assertEqual(clasificar_busqueda('2'), ('texto', '2'))
+
+    def test_listar_prestamos(self):
+        url = 'gestion_prestamos:listar_prestamos'
+        primero, segundo, tercero, cuarto = (prestamo.id for prestamo in self.prestamos)
+        self.assertEqual(self.buscar(url, 'Vencido'), [segundo])
+        self.assertEqual(self.buscar(url, 'lucia@example.com'), [primero, segundo])
+        self.assertEqual(self.buscar(url, '30.123.456'), [primero, segundo])
+        self.assertEqual(self.buscar(url, 'BUS-0002'), [tercero])
+        # Tiene forma de código pero es la identificación de un socio
+        self.assertEqual(self.buscar(url, 'G0000062'), [tercero])
+        # Sin resultados por índice se busca como texto
+        self.assertEqual(self.buscar(url, '62'), [primero, segundo, tercero])
+        # Un número corto busca el título, no el prefijo del DNI 30123456
+        self.assertEqual(self.buscar(url, '3012'), [cuarto])
+
+    def test_listar_socios(self):
+        url = 'gestion_socios:listar_socios'
+        self.assertEqual(self.buscar(url, '30123456'), [self.socio.id])
+        self.assertEqual(self.buscar(url, '3012'), [self.socio.id])
+        self.assertEqual(self.buscar(url, 'lucia@example.com'), [self.socio.id])
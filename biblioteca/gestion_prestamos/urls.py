@@ -7,6 +7,8 @@ urlpatterns = [
     path('index/', views.index_prestamos, name='index_prestamos'),
     path('crear/', views.crear_prestamo, name='crear_prestamo'),
     path('devolver/<int:prestamo_id>/', views.devolver_prestamo, name='devolver_prestamo'),
+    path('lote/prestar/', views.prestar_lote, name='prestar_lote'),
+    path('lote/devolver/', views.devolver_lote, name='devolver_lote'),
     path('reservas/crear/<int:libro_id>/', views.crear_reserva, name='crear_reserva'),
     path('reservas/listar/', views.listar_reservas, name='listar_reservas'),
     path('reservas/confirmar/<int:reserva_id>/', views.confirmar_reserva, name='confirmar_reserva'),
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views_api
+
+app_name = 'api_prestamos'
+
+urlpatterns = [
+    path('socios/<int:socio_id>/prestamos/', views_api.prestamos_socio, name='prestamos_socio'),
+    path('socios/<int:socio_id>/reservas/', views_api.reservas_socio, name='reservas_socio'),
+    path('escanear/<str:codigo>/', views_api.escanear, name='escanear'),
+]
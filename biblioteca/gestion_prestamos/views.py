@@ -1,12 +1,13 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils import timezone
-from django.http import HttpResponse
-from django.db import transaction
+from django.http import HttpResponse, JsonResponse
 import logging
+from biblioteca import metricas
+from biblioteca.basedatos import transaccion_escritura
 from biblioteca.decorators import es_personal_required, es_socio_required
 from biblioteca.utils import (
-    send_notification_email,
+    encolar_notificacion,
     listar_con_busqueda_paginacion,
     exportar_csv_response,
     obtener_socio_desde_user
@@ -14,8 +15,8 @@ from biblioteca.utils import (
 from gestion_socios.models import Socio
 from gestion_libros.models import Libro, Ejemplar
 from .models import Prestamo, Reserva
-from .forms import PrestamoForm
-from .services import PrestamoService
+from .forms import PrestamoForm, LotePrestamoForm, LoteDevolucionForm
+from .services import PrestamoService, ReservaService
 
 logger = logging.getLogger('gestion_prestamos')
 
@@ -30,7 +31,7 @@ def crear_prestamo(request):
         form = PrestamoForm(request.POST)
         if form.is_valid():
             try:
-                with transaction.atomic():
+                with transaccion_escritura():
                     prestamo = form.save()
                 messages.success(request, 'Préstamo registrado correctamente.')
                 return redirect('gestion_prestamos:listar_prestamos')
@@ -57,7 +58,13 @@ def listar_prestamos(request):
         'ejemplar__codigo', 'estado'
     ]
     page_obj, q = listar_con_busqueda_paginacion(
-        request, prestamos, campos_busqueda, items_por_pagina=10
+        request, prestamos, campos_busqueda, items_por_pagina=10,
+        busquedas_indexadas={
+            'estado': 'estado',
+            'email': 'socio__email',
+            'numero': 'socio__identificacion__startswith',
+            'codigo': ['ejemplar__codigo__startswith', 'socio__identificacion__startswith'],
+        }
     )
     
     return render(request, "gestion_prestamos/listar_prestamos.html", {'page_obj': page_obj, 'q': q})
@@ -79,13 +86,74 @@ def devolver_prestamo(request, prestamo_id):
     try:
         # Marcar como devuelto usando el método del modelo (actualiza ejemplar.estado a 'DISPONIBLE')
         prestamo.marcar_como_devuelto()
-        messages.success(request, 'Préstamo devuelto correctamente.')
+        if prestamo.ejemplar.estado == 'RESERVADO':
+            messages.success(request, 'Préstamo devuelto correctamente. El ejemplar quedó apartado para la siguiente reserva.')
+        else:
+            messages.success(request, 'Préstamo devuelto correctamente.')
     except Exception as e:
         logger.error(f'Error al devolver préstamo {prestamo_id}: {str(e)}', exc_info=True)
         messages.error(request, 'Ocurrió un error al devolver el préstamo. Por favor, intentá nuevamente.')
     
     return redirect('gestion_prestamos:listar_prestamos')
 
+def _respuesta_lote(request, template, form, resultados):
+    """Renderiza el reporte de una operación en lote, o lo devuelve como JSON si se pide"""
+    if resultados is not None and 'application/json' in request.headers.get('Accept', ''):
+        return JsonResponse({
+            'procesados': sum(1 for r in resultados if r['ok']),
+            'errores': sum(1 for r in resultados if not r['ok']),
+            'resultados': resultados,
+        })
+    return render(request, template, {'form': form, 'resultados': resultados})
+
+@es_personal_required
+def prestar_lote(request):
+    """
+    Vista para registrar préstamos de varios ejemplares a un socio en una sola operación.
+    Recibe los códigos escaneados y devuelve un reporte por ejemplar.
+    """
+    resultados = None
+    if request.method == 'POST':
+        form = LotePrestamoForm(request.POST)
+        if form.is_valid():
+            try:
+                resultados = PrestamoService.prestar_lote(
+                    socio=form.cleaned_data['socio'],
+                    codigos=form.cleaned_data['codigos'],
+                    fecha_devolucion_esperada=form.cleaned_data['fecha_devolucion_esperada']
+                )
+            except Exception as e:
+                logger.error(f'Error al registrar préstamos en lote: {str(e)}', exc_info=True)
+                messages.error(request, 'Ocurrió un error al registrar los préstamos. Por favor, intentá nuevamente.')
+        else:
+            messages.error(request, 'Por favor, corrija los errores en el formulario.')
+    else:
+        form = LotePrestamoForm()
+    
+    return _respuesta_lote(request, 'gestion_prestamos/prestar_lote.html', form, resultados)
+
+@es_personal_required
+def devolver_lote(request):
+    """
+    Vista para registrar la devolución de varios ejemplares en una sola operación.
+    Recibe los códigos escaneados y devuelve un reporte por ejemplar.
+    """
+    resultados = None
+    if request.method == 'POST':
+        form = LoteDevolucionForm(request.POST)
+        if form.is_valid():
+            try:
+                resultados = PrestamoService.devolver_lote(form.cleaned_data['codigos'])
+            except Exception as e:
+                logger.error(f'Error al registrar devoluciones en lote: {str(e)}', exc_info=True)
+                messages.error(request, 'Ocurrió un error al registrar las devoluciones. Por favor, intentá nuevamente.')
+        else:
+            messages.error(request, 'Por favor, corrija los errores en el formulario.')
+    else:
+        form = LoteDevolucionForm()
+    
+    return _respuesta_lote(request, 'gestion_prestamos/devolver_lote.html', form, resultados)
+
 @es_socio_required
 def crear_reserva(request, libro_id):
     """Vista para que un socio cree una reserva de un libro"""
@@ -114,24 +182,24 @@ def crear_reserva(request, libro_id):
     reserva_existente = Reserva.objects.filter(
         socio=socio,
         libro=libro,
-        estado='PENDIENTE'
+        estado__in=Reserva.ESTADOS_ACTIVOS
     ).exists()
     
     if reserva_existente:
-        messages.warning(request, 'Ya tenés una reserva pendiente para este libro.')
+        messages.warning(request, 'Ya tenés una reserva activa para este libro.')
         return redirect('socios:buscar_libros')
     
     if request.method == 'POST':
-        with transaction.atomic():
+        with transaccion_escritura():
             reserva = Reserva.objects.create(
                 socio=socio,
                 libro=libro,
                 estado='PENDIENTE'
             )
-        
-        if socio.user and socio.user.email:
-            try:
-                send_notification_email(
+            metricas.incrementar_al_confirmar('bibliotech_reservas_creadas_total')
+            
+            if socio.user and socio.user.email:
+                encolar_notificacion(
                     destinatario=socio.user.email,
                     asunto="Reserva registrada",
                     mensaje=(
@@ -140,8 +208,6 @@ def crear_reserva(request, libro_id):
                         "Recordá presentar tu DNI o ID de socio al momento del retiro."
                     )
                 )
-            except Exception as e:
-                logger.warning(f'Error al enviar email de notificación de reserva: {str(e)}')
         
         messages.success(
             request,
@@ -163,12 +229,17 @@ def crear_reserva(request, libro_id):
 def listar_reservas(request):
     """Vista para listar todas las reservas (solo personal)"""
     reservas = Reserva.objects.select_related(
-        'socio', 'libro', 'libro__autor'
+        'socio', 'libro', 'libro__autor', 'ejemplar'
     ).all().order_by('-fecha_reserva')
     
     campos_busqueda = ['socio__nombre', 'socio__apellido', 'libro__titulo', 'estado']
     page_obj, q = listar_con_busqueda_paginacion(
-        request, reservas, campos_busqueda, items_por_pagina=10
+        request, reservas, campos_busqueda, items_por_pagina=10,
+        busquedas_indexadas={
+            'estado': 'estado',
+            'email': 'socio__email',
+            'numero': 'socio__identificacion__startswith',
+        }
     )
     
     return render(request, 'reservas/listar_reservas.html', {'page_obj': page_obj, 'q': q})
@@ -176,33 +247,14 @@ def listar_reservas(request):
 
 @es_personal_required
 def confirmar_reserva(request, reserva_id):
-    """Confirma una reserva y notifica al socio"""
-    reserva = get_object_or_404(Reserva.objects.select_related('socio__user', 'libro', 'libro__autor'), id=reserva_id)
-    
-    if reserva.estado != 'PENDIENTE':
-        messages.warning(request, 'Solo podés confirmar reservas pendientes.')
-        return redirect('gestion_prestamos:listar_reservas')
+    """Confirma una reserva apartando un ejemplar disponible y notifica al socio"""
+    get_object_or_404(Reserva, id=reserva_id)
     
     try:
-        with transaction.atomic():
-            reserva.estado = 'NOTIFICADA'
-            reserva.save(update_fields=['estado'])
-            
-            if reserva.socio.user and reserva.socio.user.email:
-                try:
-                    send_notification_email(
-                        destinatario=reserva.socio.user.email,
-                        asunto="Reserva lista para retirar",
-                        mensaje=(
-                            f"Tu reserva del libro '{reserva.libro.titulo}' está confirmada. "
-                            "Tenés 5 días para retirarla. "
-                            "Recordá presentar tu DNI o ID de socio al momento del retiro."
-                        )
-                    )
-                    messages.success(request, 'Reserva confirmada y socio notificado.')
-                except Exception as e:
-                    logger.warning(f'Error al enviar email de notificación: {str(e)}')
-                    messages.success(request, 'Reserva confirmada, pero hubo un problema al enviar la notificación por email.')
+        ReservaService.confirmar_reserva(reserva_id)
+        messages.success(request, 'Reserva confirmada. El socio será notificado por email.')
+    except ValueError as e:
+        messages.warning(request, str(e))
     except Exception as e:
         logger.error(f'Error al confirmar reserva {reserva_id}: {str(e)}', exc_info=True)
         messages.error(request, 'Ocurrió un error al confirmar la reserva. Por favor, intentá nuevamente.')
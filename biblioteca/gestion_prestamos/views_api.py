@@ -0,0 +1,151 @@
+"""
+API JSON de préstamos y reservas de un socio y escaneo de ejemplares en el mostrador.
+Ver biblioteca/api.py (autenticación, campos, cursor y cache).
+"""
+from django.utils import timezone
+
+from biblioteca.api import ErrorAPI, api_vista, paginar_por_cursor, recortar, seleccionar_campos
+from gestion_socios.models import Socio
+from .models import Prestamo, Reserva
+from .services import PrestamoService
+
+CAMPOS_PRESTAMO = (
+    'id', 'codigo', 'libro_id', 'titulo', 'fecha_prestamo',
+    'fecha_devolucion_esperada', 'estado', 'vencido',
+)
+CAMPOS_RESERVA = ('id', 'libro_id', 'titulo', 'estado', 'fecha_reserva', 'fecha_vencimiento', 'codigo')
+
+
+def _etiquetas_socio(socio_id):
+    return ['libros', f'socio:{socio_id}']
+
+
+def _obtener_socio(socio_id):
+    socio = Socio.objects.filter(id=socio_id).first()
+    if not socio:
+        raise ErrorAPI('Socio inexistente.', status=404)
+    return socio
+
+
+@api_vista(etiquetas=[_etiquetas_socio])
+def prestamos_socio(request, socio_id):
+    """
+    Estado de préstamos de un socio: si puede pedir otro (mismas reglas que
+    PrestamoService.validar_limite_prestamos) y sus préstamos sin devolver.
+    """
+    campos = seleccionar_campos(request, CAMPOS_PRESTAMO)
+    socio = _obtener_socio(socio_id)
+    puede_prestar, motivo = PrestamoService.validar_limite_prestamos(socio)
+    hoy = timezone.now().date()
+    activos = Prestamo.objects.filter(
+        socio=socio,
+        estado__in=Prestamo.ESTADOS_ACTIVOS
+    ).select_related('ejemplar', 'ejemplar__libro').order_by('fecha_devolucion_esperada')
+    return {
+        'socio_id': socio.id,
+        'activo': socio.activo,
+        'puede_prestar': socio.activo and puede_prestar,
+        'motivo': motivo if socio.activo else 'El socio está inactivo.',
+        'prestamos': [
+            recortar({
+                'id': prestamo.id,
+                'codigo': prestamo.ejemplar.codigo,
+                'libro_id': prestamo.ejemplar.libro_id,
+                'titulo': prestamo.ejemplar.libro.titulo,
+                'fecha_prestamo': prestamo.fecha_prestamo.isoformat(),
+                'fecha_devolucion_esperada': prestamo.fecha_devolucion_esperada.isoformat(),
+                'estado': prestamo.estado,
+                'vencido': prestamo.estado == 'VENCIDO' or prestamo.fecha_devolucion_esperada < hoy,
+            }, campos)
+            for prestamo in activos
+        ],
+    }
+
+
+@api_vista(etiquetas=[_etiquetas_socio])
+def reservas_socio(request, socio_id):
+    """Reservas de un socio, filtrables por estado (separados por coma), paginadas por cursor."""
+    campos = seleccionar_campos(request, CAMPOS_RESERVA)
+    socio = _obtener_socio(socio_id)
+    reservas = Reserva.objects.filter(socio=socio).select_related('libro', 'ejemplar')
+    estados = [e.strip().upper() for e in request.GET.get('estado', '').split(',') if e.strip()]
+    if estados:
+        reservas = reservas.filter(estado__in=estados)
+    pagina, siguiente = paginar_por_cursor(request, reservas)
+    return {
+        'resultados': [
+            recortar({
+                'id': reserva.id,
+                'libro_id': reserva.libro_id,
+                'titulo': reserva.libro.titulo,
+                'estado': reserva.estado,
+                'fecha_reserva': reserva.fecha_reserva.isoformat(),
+                'fecha_vencimiento': reserva.fecha_vencimiento.isoformat() if reserva.fecha_vencimiento else None,
+                'codigo': reserva.ejemplar.codigo if reserva.ejemplar else None,
+            }, campos)
+            for reserva in pagina
+        ],
+        'siguiente': siguiente,
+    }
+
+
+def _accion_escaneo(fila):
+    """Qué corresponde hacer con el ejemplar escaneado en el mostrador."""
+    if fila['prestamo_activo__id']:
+        return 'devolver'
+    if fila['estado'] == 'RESERVADO' and fila['reserva_apartada__id']:
+        return 'entregar_reserva'
+    if fila['estado'] == 'DISPONIBLE':
+        return 'prestar'
+    return None
+
+
+@api_vista(cachear=False)
+def escanear(request, codigo):
+    """
+    Resuelve el código leído por un lector de barras: ejemplar, libro, préstamo activo
+    y reserva que lo tiene apartado, con la acción que corresponde (devolver, prestar,
+    entregar_reserva o null). Una sola consulta y sin cache, para reflejar el momento.
+    """
+    fila = PrestamoService.escanear_ejemplar(codigo.strip())
+    if not fila:
+        raise ErrorAPI('Ejemplar inexistente.', status=404)
+
+    prestamo = None
+    if fila['prestamo_activo__id']:
+        vence = fila['prestamo_activo__fecha_devolucion_esperada']
+        prestamo = {
+            'id': fila['prestamo_activo__id'],
+            'socio_id': fila['prestamo_activo__socio_id'],
+            'socio': f"{fila['prestamo_activo__socio__nombre']} {fila['prestamo_activo__socio__apellido']}",
+            'identificacion': fila['prestamo_activo__socio__identificacion'],
+            'fecha_prestamo': fila['prestamo_activo__fecha_prestamo'].isoformat(),
+            'fecha_devolucion_esperada': vence.isoformat(),
+            'vencido': fila['prestamo_activo__estado'] == 'VENCIDO' or vence < timezone.now().date(),
+        }
+
+    reserva = None
+    if fila['reserva_apartada__id']:
+        vencimiento = fila['reserva_apartada__fecha_vencimiento']
+        reserva = {
+            'id': fila['reserva_apartada__id'],
+            'socio_id': fila['reserva_apartada__socio_id'],
+            'socio': f"{fila['reserva_apartada__socio__nombre']} {fila['reserva_apartada__socio__apellido']}",
+            'fecha_vencimiento': vencimiento.isoformat() if vencimiento else None,
+        }
+
+    return {
+        'codigo': fila['codigo'],
+        'estado': fila['estado'],
+        'ubicacion': fila['ubicacion'],
+        'accion': _accion_escaneo(fila),
+        'libro': {
+            'id': fila['libro_id'],
+            'titulo': fila['libro__titulo'],
+            'autor': f"{fila['libro__autor__nombre']} {fila['libro__autor__apellido']}",
+            'isbn': fila['libro__isbn'],
+        },
+        'prestamo': prestamo,
+        'reserva': reserva,
+        'reservas_pendientes': fila['reservas_pendientes'],
+    }
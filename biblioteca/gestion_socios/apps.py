@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GestionSociosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestion_socios'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,2 +1,13 @@
-# Módulo de importadores para gestión de socios
+"""
+Módulo de importadores para gestión de socios.
 
+socios_importer usa pandas, que tarda en cargarse y ocupa decenas de MB en cada
+worker. Las vistas y comandos importan desde este paquete, que carga el importador
+recién cuando se ejecuta una importación.
+"""
+
+
+def importar_socios_desde_excel(*args, **kwargs):
+    """Ver socios_importer.importar_socios_desde_excel."""
+    from .socios_importer import importar_socios_desde_excel as importar
+    return importar(*args, **kwargs)
@@ -5,6 +5,7 @@ Permite importar grandes volúmenes de socios de forma optimizada.
 import pandas as pd
 from datetime import datetime
 from django.db import transaction
+from biblioteca import cache, metricas
 from django.contrib.auth.models import User
 from gestion_socios.models import Socio
 
@@ -247,6 +248,9 @@ class SociosImporter:
             if socios_a_actualizar:
                 campos_update = ['nombre', 'apellido', 'email', 'telefono', 'activo']
                 Socio.objects.bulk_update(socios_a_actualizar, campos_update)
+                # bulk_update no emite señales: el tipo de usuario cacheado depende de activo
+                cache.invalidar(*[f'usuario:{s.user_id}' for s in socios_a_actualizar if s.user_id])
+                cache.invalidar('socios', *[f'socio:{s.id}' for s in socios_a_actualizar])
             
             return self.resultados
             
@@ -268,5 +272,8 @@ def importar_socios_desde_excel(archivo_excel, actualizar_existentes=False, crea
         dict con resultados de la importación
     """
     importer = SociosImporter(archivo_excel)
-    return importer.importar(actualizar_existentes=actualizar_existentes, crear_usuarios=crear_usuarios)
+    return metricas.medir_importacion(
+        'socios',
+        lambda: importer.importar(actualizar_existentes=actualizar_existentes, crear_usuarios=crear_usuarios)
+    )
 
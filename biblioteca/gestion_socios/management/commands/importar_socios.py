@@ -3,7 +3,7 @@ Comando de Django para importar socios desde un archivo Excel.
 Uso: python manage.py importar_socios archivo.xlsx [--actualizar] [--crear-usuarios]
 """
 from django.core.management.base import BaseCommand, CommandError
-from gestion_socios.importadores.socios_importer import importar_socios_desde_excel
+from gestion_socios.importadores import importar_socios_desde_excel
 import os
 
 
@@ -0,0 +1,18 @@
+"""
+Invalidación del tipo de usuario cacheado (context_processors.user_type) y de las
+páginas del socio (GET condicional) cuando cambia o se borra un registro de socios.
+La etiqueta 'socios' cambia con cualquier socio (huella de las exportaciones).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from biblioteca import cache
+
+from .models import Socio
+
+
+@receiver([post_save, post_delete], sender=Socio, dispatch_uid='gestion_socios.invalidar_user_type')
+def invalidar_user_type(sender, instance, **kwargs):
+    cache.invalidar('socios', f'socio:{instance.id}')
+    if instance.user_id:
+        cache.invalidar(f'usuario:{instance.user_id}')
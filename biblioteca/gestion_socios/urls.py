@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, views_async
 
 app_name = "gestion_socios"
 
+# Bajo ASGI el dashboard es la versión async (ver settings.VISTAS_ASYNC)
+lectura = views_async if settings.VISTAS_ASYNC else views
+
 urlpatterns = [
     path('index/', views.index_socios, name='index_socios'),
     path('crear/', views.crear_socio, name='crear_socio'),
-    path('dashboard/', views.dashboard_socio, name='dashboard_socio'),
+    path('dashboard/', lectura.dashboard_socio, name='dashboard_socio'),
     path('exportar/', views.exportar_socios_csv, name='exportar_socios_csv'),
     path('importar/', views.importar_socios, name='importar_socios'),
     path('', views.listar_socios, name='listar_socios'),
@@ -1,13 +1,13 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.utils import timezone
 from django.http import HttpResponse
 from biblioteca.decorators import es_personal_required, es_socio_required
 from biblioteca.utils import listar_con_busqueda_paginacion, exportar_csv_response
 from gestion_prestamos.models import Prestamo, Reserva
+from gestion_prestamos.services import PrestamoService
 from .models import Socio
 from .forms import SocioForm, UploadExcelForm
-from .importadores.socios_importer import importar_socios_desde_excel
+from .importadores import importar_socios_desde_excel
 
 @es_personal_required
 def index_socios(request):
@@ -35,7 +35,12 @@ def listar_socios(request):
     
     campos_busqueda = ['nombre', 'apellido', 'identificacion', 'email']
     page_obj, q = listar_con_busqueda_paginacion(
-        request, socios, campos_busqueda, items_por_pagina=10
+        request, socios, campos_busqueda, items_por_pagina=10,
+        busquedas_indexadas={
+            'email': 'email',
+            'numero': 'identificacion__startswith',
+            'codigo': 'identificacion__startswith',
+        }
     )
     
     return render(request, 'gestion_socios/listar_socios.html', {'page_obj': page_obj, 'q': q})
@@ -56,11 +61,10 @@ def dashboard_socio(request):
         fecha_devolucion_real__isnull=True
     ).count()
     
-    # Préstamos vencidos (sin fecha de devolución real y fecha esperada pasada)
+    # Préstamos vencidos, marcados por el comando marcar_vencidos
     prestamos_vencidos = Prestamo.objects.filter(
         socio=socio,
-        fecha_devolucion_real__isnull=True,
-        fecha_devolucion_esperada__lt=timezone.now().date()
+        estado='VENCIDO'
     ).count()
     
     # Reservas pendientes
@@ -70,10 +74,7 @@ def dashboard_socio(request):
     ).count()
     
     # Últimos préstamos devueltos (con fecha de devolución real)
-    prestamos_historicos = Prestamo.objects.filter(
-        socio=socio,
-        fecha_devolucion_real__isnull=False
-    ).select_related('ejemplar', 'ejemplar__libro').order_by('-fecha_devolucion_real')[:5]
+    prestamos_historicos = PrestamoService.historial_socio(socio, solo_devueltos=True, limite=5)
     
     context = {
         'socio': socio,
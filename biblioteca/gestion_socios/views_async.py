@@ -0,0 +1,45 @@
+"""
+Versión async del dashboard del socio, para servirla bajo ASGI (ver settings.VISTAS_ASYNC
+y gestion_libros/views_async.py).
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.shortcuts import redirect, render
+
+from biblioteca.decorators import es_socio_required
+from biblioteca.utils import aobtener_socio_desde_user
+from gestion_prestamos.models import Prestamo, Reserva
+from gestion_prestamos.services import PrestamoService
+
+
+@es_socio_required
+async def dashboard_socio(request):
+    """Dashboard para socios con información personalizada"""
+    socio = await aobtener_socio_desde_user(request.user)
+    if not socio:
+        messages.error(request, 'No se encontró tu información de socio.')
+        return redirect('home')
+
+    # Los tres contadores y el historial no dependen entre sí, pero acount() y
+    # sync_to_async son thread_sensitive: corren uno tras otro en el mismo hilo
+    prestamos_activos, prestamos_vencidos, reservas_pendientes, prestamos_historicos = await asyncio.gather(
+        # Préstamos activos (sin fecha de devolución real)
+        Prestamo.objects.filter(socio=socio, fecha_devolucion_real__isnull=True).acount(),
+        # Préstamos vencidos, marcados por el comando marcar_vencidos
+        Prestamo.objects.filter(socio=socio, estado='VENCIDO').acount(),
+        Reserva.objects.filter(socio=socio, estado='PENDIENTE').acount(),
+        # Últimos préstamos devueltos (con fecha de devolución real)
+        sync_to_async(PrestamoService.historial_socio)(socio, solo_devueltos=True, limite=5),
+    )
+
+    context = {
+        'socio': socio,
+        'prestamos_activos': prestamos_activos,
+        'prestamos_vencidos': prestamos_vencidos,
+        'reservas_pendientes': reservas_pendientes,
+        'prestamos_historicos': prestamos_historicos,
+    }
+
+    return await sync_to_async(render)(request, 'gestion_socios/dashboard_socio.html', context)
@@ -0,0 +1,59 @@
+"""
+Configuración de gunicorn para producción.
+Uso: gunicorn -c biblioteca/gunicorn.conf.py   (desde la raíz del repositorio, ver Procfile)
+
+Variables de entorno:
+    PORT / GUNICORN_BIND     Dirección de escucha (default: 0.0.0.0:$PORT o 0.0.0.0:8000)
+    GUNICORN_WORKERS         Procesos (default: 2 x CPUs + 1)
+    GUNICORN_THREADS         Hilos por proceso en modo WSGI (default: 2; 1 = workers sync)
+    GUNICORN_TIMEOUT         Segundos antes de reiniciar un worker colgado (default: 30)
+    GUNICORN_MAX_REQUESTS    Requests antes de reciclar un worker (default: 1000; 0 = nunca)
+    GUNICORN_PRELOAD         Cargar la aplicación antes de crear los workers (default: False)
+    SERVIDOR_ASGI            Servir biblioteca.asgi con workers de uvicorn (default: False)
+    DEBUG                    Modo de desarrollo de Django (default: False con este archivo)
+
+Cada hilo mantiene su propia conexión a la base (DB_CONN_MAX_AGE en settings), así que
+la cantidad máxima de conexiones es workers x threads.
+"""
+import multiprocessing
+import os
+from pathlib import Path
+
+# manage.py y el paquete biblioteca están junto a este archivo
+chdir = str(Path(__file__).resolve().parent)
+
+# settings.py deja DEBUG activo por defecto para desarrollo local; en producción no
+# (también apaga MONITOR_CONSULTAS). Los workers heredan el entorno del master
+os.environ.setdefault('DEBUG', 'False')
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '2'))
+
+if os.getenv('SERVIDOR_ASGI', 'False') == 'True':
+    # Requiere el paquete uvicorn-worker; las vistas async no bloquean el worker
+    wsgi_app = 'biblioteca.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    # Con hilos, una request lenta (exportación, importación) no bloquea todo el proceso
+    wsgi_app = 'biblioteca.wsgi:application'
+    worker_class = 'gthread' if threads > 1 else 'sync'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = 30
+keepalive = 5
+
+# Reciclar workers periódicamente acota el crecimiento de memoria (pandas en importaciones);
+# el jitter evita que todos se reinicien a la vez
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = max_requests // 10
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'False') == 'True'
+
+# El heartbeat de los workers en memoria evita bloqueos en discos lentos de contenedores
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
@@ -22,6 +22,9 @@ import subprocess
 import platform
 from pathlib import Path
 import argparse
+import hashlib
+import json
+from functools import lru_cache
 
 # ============================================================================
 # CONFIGURACIÓN
@@ -35,39 +38,119 @@ PROJECT_ROOT = SCRIPT_PATH.parent
 VENV_NAME = "venv"
 VENV_PATH = PROJECT_ROOT / VENV_NAME
 
-# Detectar manage.py automáticamente (buscar recursivamente desde la raíz)
-def find_manage_py(start_path):
-    """Busca manage.py recursivamente desde un directorio"""
-    for root, dirs, files in os.walk(start_path):
-        # Ignorar venv y otros directorios comunes
-        dirs[:] = [d for d in dirs if d not in ['.git', 'venv', '__pycache__', '.venv', 'node_modules']]
-        if 'manage.py' in files:
-            return Path(root) / 'manage.py'
-    return None
+# Directorios que nunca contienen manage.py ni requirements.txt. media/ y
+# staticfiles/ pueden tener miles de archivos subidos o generados.
+SKIP_DIRS = {
+    '.git', 'venv', '.venv', '__pycache__', 'node_modules', 'static_src',
+    'media', 'staticfiles', 'static', 'logs', 'templates', 'migrations',
+}
 
-# Detectar requirements.txt (primero en la raíz, luego buscar)
-def find_requirements_txt(start_path):
-    """Busca requirements.txt desde la raíz hacia abajo"""
-    # Primero buscar en la raíz
-    root_req = start_path / "requirements.txt"
-    if root_req.exists():
-        return root_req
-    
-    # Buscar recursivamente
+# Cache de rutas detectadas y hashes de la última instalación
+CACHE_DIR = PROJECT_ROOT / ".bibliotech"
+MANIFEST_PATH = CACHE_DIR / "manifest.json"
+
+
+def load_manifest():
+    """Lee el manifiesto cacheado del proyecto (dict vacío si no existe o está corrupto)"""
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(**values):
+    """Actualiza el manifiesto cacheado con los valores dados"""
+    manifest = load_manifest()
+    manifest.update(values)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    except OSError:
+        pass  # El cache es opcional: sin él solo se vuelve a buscar
+
+
+def _walk_for(filename, start_path):
+    """Busca filename recursivamente ignorando SKIP_DIRS"""
     for root, dirs, files in os.walk(start_path):
-        dirs[:] = [d for d in dirs if d not in ['.git', 'venv', '__pycache__', '.venv', 'node_modules']]
-        if 'requirements.txt' in files:
-            return Path(root) / 'requirements.txt'
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        if filename in files:
+            return Path(root) / filename
     return None
 
-# Detectar archivos del proyecto
-MANAGE_PY_PATH = find_manage_py(PROJECT_ROOT)
-REQUIREMENTS_PATH = find_requirements_txt(PROJECT_ROOT)
 
-if MANAGE_PY_PATH:
-    DJANGO_PROJECT_DIR = MANAGE_PY_PATH.parent
-else:
-    DJANGO_PROJECT_DIR = None
+def _find_project_file(key, filename, known_locations):
+    """
+    Busca un archivo del proyecto: primero la ruta cacheada, después las ubicaciones
+    conocidas y recién al final recorre el árbol. Guarda el resultado en el manifiesto.
+    """
+    cached = load_manifest().get(key)
+    if cached and (PROJECT_ROOT / cached).is_file():
+        return PROJECT_ROOT / cached
+
+    found = next((path for path in known_locations if path.is_file()), None)
+    if found is None:
+        found = _walk_for(filename, PROJECT_ROOT)
+    if found is not None:
+        save_manifest(**{key: str(found.relative_to(PROJECT_ROOT))})
+    return found
+
+
+# Detectar manage.py (se resuelve recién cuando se necesita)
+@lru_cache(maxsize=None)
+def find_manage_py():
+    """Busca manage.py, empezando por las ubicaciones conocidas"""
+    known = [PROJECT_ROOT / "manage.py", PROJECT_ROOT / "biblioteca" / "manage.py"]
+    return _find_project_file("manage_py", "manage.py", known)
+
+# Detectar requirements.txt (primero en la raíz y junto a manage.py, luego buscar)
+@lru_cache(maxsize=None)
+def find_requirements_txt():
+    """Busca requirements.txt, empezando por las ubicaciones conocidas"""
+    known = [PROJECT_ROOT / "requirements.txt", PROJECT_ROOT / "biblioteca" / "requirements.txt"]
+    return _find_project_file("requirements_txt", "requirements.txt", known)
+
+
+def get_django_project_dir():
+    """Directorio que contiene manage.py, o None si no se encontró"""
+    manage_py = find_manage_py()
+    return manage_py.parent if manage_py else None
+
+
+# ============================================================================
+# DETECCIÓN DE CAMBIOS
+# ============================================================================
+
+def hash_requirements():
+    """Hash de requirements.txt y del Python del venv: si no cambian, no hace falta reinstalar"""
+    requirements = find_requirements_txt()
+    digest = hashlib.sha256()
+    digest.update(requirements.read_bytes())
+    digest.update(str(find_venv_python()).encode())
+    return digest.hexdigest()
+
+
+def hash_static_sources():
+    """
+    Hash de los archivos estáticos de origen (static/ del proyecto y de cada app),
+    usando ruta, tamaño y fecha de modificación para no leer el contenido.
+    Incluye hash_requirements(): si se reinstalan las dependencias (Django, whitenoise)
+    cambian los estáticos del admin y hay que regenerar el manifest.
+    """
+    project_dir = get_django_project_dir()
+    digest = hashlib.sha256()
+    digest.update(hash_requirements().encode())
+    static_dirs = [project_dir / "static"] + sorted(project_dir.glob("*/static"))
+    for static_dir in static_dirs:
+        for root, dirs, files in os.walk(static_dir):
+            dirs.sort()
+            for name in sorted(files):
+                path = Path(root) / name
+                stat = path.stat()
+                digest.update(f"{path.relative_to(project_dir)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
 
 # ============================================================================
 # UTILIDADES
@@ -248,9 +331,13 @@ def ensure_pip():
         return False
 
 
-def install_dependencies():
-    """Instala o actualiza las dependencias desde requirements.txt usando python -m pip"""
-    if not REQUIREMENTS_PATH or not REQUIREMENTS_PATH.exists():
+def install_dependencies(force=False):
+    """
+    Instala o actualiza las dependencias desde requirements.txt usando python -m pip.
+    Se omite si requirements.txt no cambió desde la última instalación exitosa.
+    """
+    requirements_path = find_requirements_txt()
+    if not requirements_path or not requirements_path.exists():
         print_error(f"Archivo requirements.txt no encontrado")
         print_info(f"Buscado en: {PROJECT_ROOT}")
         return False
@@ -267,8 +354,13 @@ def install_dependencies():
         print_info(f"Buscado en: {VENV_PATH}")
         return False
     
+    requirements_hash = hash_requirements()
+    if not force and load_manifest().get("requirements_hash") == requirements_hash:
+        print_success("Dependencias al día (requirements.txt sin cambios)")
+        return True
+    
     print_info("Instalando/actualizando dependencias...")
-    print_info(f"Usando: {REQUIREMENTS_PATH}")
+    print_info(f"Usando: {requirements_path}")
     
     # Actualizar pip primero
     print_info("Actualizando pip...")
@@ -283,11 +375,12 @@ def install_dependencies():
     # Instalar dependencias
     print_info("Instalando dependencias desde requirements.txt...")
     result = run_command(
-        [python_cmd, "-m", "pip", "install", "-r", str(REQUIREMENTS_PATH)],
+        [python_cmd, "-m", "pip", "install", "-r", str(requirements_path)],
         check=False
     )
     
     if result.returncode == 0:
+        save_manifest(requirements_hash=requirements_hash)
         print_success("Dependencias instaladas correctamente")
         return True
     else:
@@ -297,7 +390,8 @@ def install_dependencies():
 
 def run_migrations():
     """Ejecuta las migraciones de Django"""
-    if not MANAGE_PY_PATH or not MANAGE_PY_PATH.exists():
+    manage_py = find_manage_py()
+    if not manage_py or not manage_py.exists():
         print_error(f"manage.py no encontrado")
         print_info(f"Buscado desde: {PROJECT_ROOT}")
         return False
@@ -316,7 +410,7 @@ def run_migrations():
     print_info("Ejecutando migraciones...")
     
     # Cambiar al directorio del proyecto Django
-    os.chdir(DJANGO_PROJECT_DIR)
+    os.chdir(get_django_project_dir())
     
     result = run_command(
         [python_cmd, "manage.py", "migrate"],
@@ -325,15 +419,21 @@ def run_migrations():
     
     if result.returncode == 0:
         print_success("Migraciones ejecutadas correctamente")
+        # Tabla de la cache si CACHE_URL=db://...; con otros backends no hace nada
+        run_command([python_cmd, "manage.py", "createcachetable"], check=False)
         return True
     else:
         print_warning("Algunas migraciones pueden haber fallado")
         return False
 
 
-def collect_static():
-    """Recolecta archivos estáticos"""
-    if not MANAGE_PY_PATH or not MANAGE_PY_PATH.exists():
+def collect_static(force=False):
+    """
+    Recolecta archivos estáticos.
+    Se omite si los estáticos de origen no cambiaron desde la última recolección.
+    """
+    manage_py = find_manage_py()
+    if not manage_py or not manage_py.exists():
         return False
     
     if not venv_exists():
@@ -345,10 +445,16 @@ def collect_static():
     if not python_cmd:
         return False
     
+    static_hash = hash_static_sources()
+    staticfiles_dir = get_django_project_dir() / "staticfiles"
+    if not force and staticfiles_dir.is_dir() and load_manifest().get("static_hash") == static_hash:
+        print_success("Archivos estáticos al día (sin cambios en los estáticos de origen)")
+        return True
+    
     print_info("Recolectando archivos estáticos...")
     
     # Cambiar al directorio del proyecto Django
-    os.chdir(DJANGO_PROJECT_DIR)
+    os.chdir(get_django_project_dir())
     
     result = run_command(
         [python_cmd, "manage.py", "collectstatic", "--noinput"],
@@ -356,6 +462,7 @@ def collect_static():
     )
     
     if result.returncode == 0:
+        save_manifest(static_hash=static_hash)
         print_success("Archivos estáticos recolectados")
         return True
     else:
@@ -374,8 +481,8 @@ def verify_setup():
     
     checks = [
         (VENV_PATH, "Entorno virtual"),
-        (MANAGE_PY_PATH, "manage.py"),
-        (REQUIREMENTS_PATH, "requirements.txt"),
+        (find_manage_py(), "manage.py"),
+        (find_requirements_txt(), "requirements.txt"),
     ]
     
     for path, name in checks:
@@ -394,7 +501,8 @@ def verify_setup():
 
 def run_server():
     """Levanta el servidor de desarrollo de Django"""
-    if not MANAGE_PY_PATH or not MANAGE_PY_PATH.exists():
+    manage_py = find_manage_py()
+    if not manage_py or not manage_py.exists():
         print_error(f"manage.py no encontrado")
         print_info(f"Buscado desde: {PROJECT_ROOT}")
         return False
@@ -416,7 +524,7 @@ def run_server():
     print_info("Servidor disponible en: http://127.0.0.1:8000")
     
     # Cambiar al directorio del proyecto Django
-    os.chdir(DJANGO_PROJECT_DIR)
+    os.chdir(get_django_project_dir())
     
     try:
         # Ejecutar servidor (bloqueante)
@@ -436,7 +544,7 @@ def run_server():
 # FUNCIONES PRINCIPALES
 # ============================================================================
 
-def setup():
+def setup(force=False):
     """Prepara el entorno completo"""
     print_info("=" * 60)
     print_info("BiblioTech - Setup del Proyecto")
@@ -451,19 +559,19 @@ def setup():
     if not ensure_pip():
         return False
     
-    if not install_dependencies():
+    if not install_dependencies(force):
         return False
     
     if not run_migrations():
         return False
     
-    collect_static()  # No crítico si falla
+    collect_static(force)  # No crítico si falla
     
     print_success("Setup completado correctamente")
     return True
 
 
-def update():
+def update(force=False):
     """Actualiza dependencias y migraciones"""
     print_info("=" * 60)
     print_info("BiblioTech - Actualización")
@@ -476,13 +584,13 @@ def update():
     if not ensure_pip():
         return False
     
-    if not install_dependencies():
+    if not install_dependencies(force):
         return False
     
     if not run_migrations():
         return False
     
-    collect_static()  # No crítico si falla
+    collect_static(force)  # No crítico si falla
     
     print_success("Actualización completada")
     return True
@@ -499,6 +607,7 @@ Ejemplos de uso:
   python bibliotech.py --setup       # Solo preparar entorno
   python bibliotech.py --update      # Actualizar dependencias y migraciones
   python bibliotech.py --run         # Solo levantar servidor
+  python bibliotech.py --update --force  # Reinstalar aunque nada haya cambiado
         """
     )
     
@@ -520,23 +629,29 @@ Ejemplos de uso:
         help="Solo levantar el servidor (asume que el entorno ya está configurado)"
     )
     
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reinstalar dependencias y recolectar estáticos aunque no hayan cambiado"
+    )
+    
     args = parser.parse_args()
     
     # Volver al directorio raíz del proyecto
     os.chdir(PROJECT_ROOT)
     
     if args.setup:
-        success = setup()
+        success = setup(args.force)
         sys.exit(0 if success else 1)
     elif args.update:
-        success = update()
+        success = update(args.force)
         sys.exit(0 if success else 1)
     elif args.run:
         success = run_server()
         sys.exit(0 if success else 1)
     else:
         # Modo por defecto: setup completo + ejecutar servidor
-        if setup():
+        if setup(args.force):
             print_info("=" * 60)
             run_server()
         else: